@@ -12,6 +12,9 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 
 from pathlib import Path
 
+import django
+from decouple import config
+
 # This is needed Don't remove it
 from .template import THEME_LAYOUT_DIR, THEME_VARIABLES
 
@@ -40,7 +43,6 @@ CLOUDINARY_STORAGE = {
     'API_SECRET': 'LCfhjus6h6ctwGx8BX5z57qh8nQ',
 }
 
-DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 
 
 # Application definition
@@ -56,7 +58,6 @@ INSTALLED_APPS = [
     'cloudinary',
     'cloudinary_storage',
     'corsheaders',
-    'import_export',
     'django_filters',
     'inventory_app',
     'nested_admin',
@@ -66,11 +67,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'inventory_app.middleware.PrecompressedStaticMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'inventory_app.middleware.ReadYourWritesMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -83,18 +86,36 @@ LOGIN_URL = '/auth/login/'
 
 ROOT_URLCONF = 'Radhe.urls'
 
+# Compiled templates are kept in memory per process by the cached loader
+# (TEMPLATE_CACHE); `manage.py warm_templates` compiles all of them at deploy
+# and TEMPLATE_WARMUP_ON_START does the same in each WSGI worker. Setting
+# 'loaders' explicitly means APP_DIRS has to stay off; the app loader is
+# listed instead.
+TEMPLATE_CACHE = config('TEMPLATE_CACHE', default=True, cast=bool)
+TEMPLATE_WARMUP_ON_START = config('TEMPLATE_WARMUP_ON_START', default=not DEBUG, cast=bool)
+# Lifetime of the {% cache %} fragments (vertical menu, navbar user menu)
+TEMPLATE_FRAGMENT_TTL = config('TEMPLATE_FRAGMENT_TTL', default=600, cast=int)
+
+template_loaders = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if TEMPLATE_CACHE:
+    template_loaders = [('django.template.loaders.cached.Loader', template_loaders)]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'inventory_app.context_processors.layout',
             ],
+            'loaders': template_loaders,
             'libraries': {
                 'theme': 'web_project.template_tags.theme',
             },
@@ -112,13 +133,122 @@ WSGI_APPLICATION = 'Radhe.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
+# Profile is picked with DB_ENGINE: "sqlite" (default) or "postgres".
+# Connections are kept open for DB_CONN_MAX_AGE seconds and checked before
+# reuse, so a gunicorn worker does not reconnect on every request.
+
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+
+if DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='radhe'),
+            'USER': config('DB_USER', default='radhe'),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+            'OPTIONS': {
+                'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
+            },
+        }
+    }
+
+    # Connection pooling is built into the backend from Django 5.1 (psycopg 3
+    # with psycopg[pool]); on older versions DB_POOL_SIZE is ignored and
+    # PgBouncer in front of the server does the pooling.
+    DB_POOL_SIZE = config('DB_POOL_SIZE', default=0, cast=int)
+    if DB_POOL_SIZE and django.VERSION >= (5, 1):
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': DB_POOL_SIZE,
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        }
+        # Pooled connections are returned to the pool, not kept per thread
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'OPTIONS': {
+                # Seconds a writer waits for the lock before "database is locked"
+                'timeout': config('SQLITE_BUSY_TIMEOUT', default=20, cast=int),
+            },
+        }
+    }
+
+# Applied on every new SQLite connection (see inventory_app.signals).
+# WAL lets readers run alongside the single writer; NORMAL sync is safe in
+# WAL mode and avoids an fsync per commit.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': config('SQLITE_BUSY_TIMEOUT', default=20, cast=int) * 1000,
+    'foreign_keys': 'ON',
+}
+
+# Read replica for reporting views (inventory_app.routers). Setting
+# DB_REPORTING_NAME adds a "reporting" alias with the primary's settings and
+# that database name; for PostgreSQL also point DB_REPORTING_HOST at the
+# standby. Locally a SQLite copy refreshed by `manage.py sync_reporting_replica`
+# stands in for it.
+DB_REPORTING_NAME = config('DB_REPORTING_NAME', default='')
+if DB_REPORTING_NAME:
+    DATABASES['reporting'] = {
+        **DATABASES['default'],
+        'NAME': DB_REPORTING_NAME,
+        'OPTIONS': dict(DATABASES['default'].get('OPTIONS', {})),
+        'TEST': {'MIRROR': 'default'},
+    }
+    if DB_ENGINE == 'postgres':
+        DATABASES['reporting']['HOST'] = config('DB_REPORTING_HOST', default=DATABASES['default']['HOST'])
+        DATABASES['reporting']['PORT'] = config('DB_REPORTING_PORT', default=DATABASES['default']['PORT'])
+
+DATABASE_ROUTERS = ['inventory_app.routers.ReportingRouter']
+
+# Seconds a user's reporting reads stay on the primary after they write
+READ_YOUR_WRITES_SECONDS = config('READ_YOUR_WRITES_SECONDS', default=10, cast=int)
+
+
+# Cache
+# Backend is picked with CACHE_BACKEND: "locmem" (default), "file" or "redis"
+# (any Redis-compatible server at CACHE_LOCATION).
+
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'radhe-default',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / '.cache')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('CACHE_LOCATION', default='redis://127.0.0.1:6379/1'),
+    },
+}
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        **CACHE_BACKENDS[CACHE_BACKEND],
+        'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
+        'KEY_PREFIX': 'radhe',
     }
 }
 
+# Dashboard payloads are reused until the data version changes or they get
+# older than DASHBOARD_CACHE_MAX_AGE seconds (keeps "today" figures fresh).
+DASHBOARD_CACHE_MAX_AGE = config('DASHBOARD_CACHE_MAX_AGE', default=60, cast=int)
+DASHBOARD_STALE_WHILE_REVALIDATE = config('DASHBOARD_STALE_WHILE_REVALIDATE', default=True, cast=bool)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -146,6 +276,9 @@ LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
 
+# Calendar dates in filters and reports are interpreted in the shop's timezone
+SHOP_TIME_ZONE = config('SHOP_TIME_ZONE', default=TIME_ZONE)
+
 USE_I18N = True
 
 USE_TZ = True
@@ -170,12 +303,79 @@ STATIC_ROOT = BASE_DIR / 'static'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Media served by inventory_app.media: browser cache lifetime for unversioned
+# URLs, and an optional front-end offload ("x-sendfile" or "x-accel-redirect";
+# for nginx, MEDIA_ACCEL_PREFIX must be an `internal` location aliasing MEDIA_ROOT).
+MEDIA_CACHE_SECONDS = config('MEDIA_CACHE_SECONDS', default=60 * 60 * 24 * 7, cast=int)
+MEDIA_SENDFILE = config('MEDIA_SENDFILE', default='')
+MEDIA_ACCEL_PREFIX = config('MEDIA_ACCEL_PREFIX', default='/protected-media/')
+
+# Product photo thumbnails (inventory_app.thumbnails): longest edge in pixels
+# per size name, output format (WEBP, or JPEG when Pillow lacks WebP) and the
+# background rendering threads per process.
+PRODUCT_THUMBNAIL_SIZES = {'sm': 96, 'md': 320}
+PRODUCT_THUMBNAIL_FORMAT = config('PRODUCT_THUMBNAIL_FORMAT', default='WEBP')
+PRODUCT_THUMBNAIL_QUALITY = config('PRODUCT_THUMBNAIL_QUALITY', default=80, cast=int)
+PRODUCT_THUMBNAIL_ASYNC = config('PRODUCT_THUMBNAIL_ASYNC', default=True, cast=bool)
+PRODUCT_THUMBNAIL_WORKERS = config('PRODUCT_THUMBNAIL_WORKERS', default=1, cast=int)
+
 STATICFILES_DIRS = [
     BASE_DIR / "templates" / "assets",
 ]
 
+# collectstatic writes content-hashed copies of the assets plus .gz/.br
+# variants (inventory_app.staticfiles); with STATIC_SERVE on,
+# PrecompressedStaticMiddleware serves them from STATIC_ROOT with immutable
+# cache headers. Turn STATIC_SERVE off when nginx serves /static/ instead.
+STATIC_MANIFEST = config('STATIC_MANIFEST', default=True, cast=bool)
+STATIC_SERVE = config('STATIC_SERVE', default=not DEBUG, cast=bool)
+STATIC_CACHE_SECONDS = config('STATIC_CACHE_SECONDS', default=3600, cast=int)
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'cloudinary_storage.storage.MediaCloudinaryStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'inventory_app.staticfiles.PrecompressedManifestStaticFilesStorage' if STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
 CSRF_FAILURE_VIEW = 'inventory_app.views.csrf_failure'
 
+# Export renderers (inventory_app.exports), imported on first use.
+# PDF backends: "statement" (direct reportlab), "pisa" or "wkhtmltopdf".
+# EXPORT_RENDERERS picks one per export, EXPORT_PDF_BACKEND is the fallback,
+# and a ?renderer= query parameter overrides both for a single request.
+EXPORT_PDF_BACKEND = config('EXPORT_PDF_BACKEND', default='pisa')
+EXPORT_RENDERERS = {
+    'customer_orders': config('EXPORT_CUSTOMER_ORDERS_RENDERER', default='statement'),
+    'supplier_purchases': config('EXPORT_SUPPLIER_PURCHASES_RENDERER', default='statement'),
+}
+WKHTMLTOPDF_PATH = config('WKHTMLTOPDF_PATH', default='')
+# TTF used by the "statement" backend instead of Helvetica (Latin-1 only)
+STATEMENT_FONT = config('STATEMENT_FONT', default='')
+
+# Bulk customer statements (inventory_app.statement_batch): archives are
+# written here, by this many worker processes (0 = one per core). Job
+# progress lives in the default cache, so use a shared backend (Redis) when
+# running several web workers.
+STATEMENT_BATCH_DIR = config('STATEMENT_BATCH_DIR', default=str(BASE_DIR / 'statement_batches'))
+STATEMENT_BATCH_WORKERS = config('STATEMENT_BATCH_WORKERS', default=0, cast=int)
+
+# POS thermal receipts (inventory_app.receipts): default roll width in mm
+# (58 or 80) and the lines printed above and below the items.
+RECEIPT_PAPER = config('RECEIPT_PAPER', default=80, cast=int)
+RECEIPT_HEADER = (
+    'RADHHEY TOOLS AND HARDWARE',
+    'Rajkot, Gujarat',
+    'Phone: 9268384244',
+    'GSTIN: 32IDNAP1991TZ8',
+)
+RECEIPT_FOOTER = ('Thank you for shopping with us!', 'Visit Again')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -198,6 +398,11 @@ SESSION_EXPIRE_AT_BROWSER_CLOSE = False
 
 
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'inventory_app.renderers.ORJSONRenderer',
+        'inventory_app.renderers.ColumnarJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
         'rest_framework.parsers.FormParser',
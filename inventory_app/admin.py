@@ -39,7 +39,7 @@ class CategoryAdmin(admin.ModelAdmin):
 
 @admin.register(Supplier)
 class SupplierAdmin(admin.ModelAdmin):
-    list_display = ('name', 'phone', 'email', 'address')
+    list_display = ('name', 'phone', 'email', 'address', 'lead_time_days')
     search_fields = ('name', 'phone', 'email')
 
 @admin.register(Customer)
@@ -47,6 +47,13 @@ class CustomerAdmin(admin.ModelAdmin):
     list_display = ('name', 'phone', 'email', 'address')
     search_fields = ('name', 'phone', 'email')
 
+@admin.register(CustomerLedgerEntry)
+class CustomerLedgerEntryAdmin(admin.ModelAdmin):
+    list_display = ('customer', 'entry_type', 'amount', 'balance', 'order', 'timestamp')
+    list_filter = ('entry_type', 'timestamp')
+    search_fields = ('customer__name', 'customer__phone')
+    readonly_fields = ('customer', 'entry_type', 'amount', 'balance', 'order', 'order_return', 'timestamp', 'created_by')
+
 class ProductVariantInline(admin.TabularInline):  # Or admin.StackedInline for bigger form
     model = ProductVariant
     extra = 1  # Number of empty rows to display by default
@@ -76,6 +83,13 @@ class InventoryAdmin(admin.ModelAdmin):
     search_fields = ('variant__product__name', 'variant__size')
 
 
+@admin.register(ReorderSuggestion)
+class ReorderSuggestionAdmin(admin.ModelAdmin):
+    list_display = ('variant', 'supplier', 'current_stock', 'reorder_point', 'suggested_quantity', 'computed_at')
+    list_filter = ('supplier',)
+    search_fields = ('variant__product__name', 'variant__size')
+
+
 @admin.register(Purchase)
 class PurchaseAdmin(admin.ModelAdmin):
     list_display = ('supplier', 'variant', 'quantity', 'purchase_price', 'date')
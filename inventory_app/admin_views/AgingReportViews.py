@@ -0,0 +1,109 @@
+import csv
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Case, DecimalField, F, Sum, Value, When
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+
+from inventory_app.models import Order
+from inventory_app.pagination import ListPagination
+
+AGING_BUCKETS = (
+    ("days_0_30", 0, 30),
+    ("days_31_60", 31, 60),
+    ("days_61_90", 61, 90),
+    ("days_90_plus", 91, None),
+)
+
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+CENT = Decimal("0.01")
+
+
+def money(value):
+    # SQLite hands sums back unscaled (Decimal("250")); always report cents
+    return Decimal(value or 0).quantize(CENT)
+
+
+def aging_queryset(as_of=None):
+    """
+    One grouped query: per-customer dues split into age buckets.
+
+    Each order contributes total_amount - return_amount - paid_amount to the
+    bucket matching its age; only orders with something still due are read.
+    """
+    as_of = as_of or timezone.now()
+    due = F("total_amount") - F("return_amount") - F("paid_amount")
+
+    buckets = {}
+    for name, low, high in AGING_BUCKETS:
+        condition = {"order_date__lte": as_of - timedelta(days=low)}
+        if high is not None:
+            condition["order_date__gt"] = as_of - timedelta(days=high + 1)
+        buckets[name] = Sum(
+            Case(When(then=due, **condition), default=Value(Decimal("0.00")), output_field=MONEY),
+            output_field=MONEY,
+        )
+
+    return (
+        Order.objects.filter(customer__isnull=False, order_date__lte=as_of)
+        .alias(due=due)
+        .filter(due__gt=0)
+        .values("customer_id", "customer__name", "customer__phone")
+        .annotate(**buckets, total_due=Sum(due, output_field=MONEY))
+        .order_by("-total_due")
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def receivables_aging(request):
+    rows = aging_queryset()
+
+    search = request.GET.get("search", "").strip()
+    if search:
+        rows = rows.filter(customer__name__icontains=search)
+
+    paginator = ListPagination()
+    page = paginator.paginate_queryset(rows, request)
+    data = [
+        {
+            "customer_id": row["customer_id"],
+            "customer_name": row["customer__name"],
+            "phone": row["customer__phone"],
+            **{name: str(money(row[name])) for name, _, _ in AGING_BUCKETS},
+            "total_due": str(money(row["total_due"])),
+        }
+        for row in page
+    ]
+    return paginator.get_paginated_response(data)
+
+
+class Echo:
+    """File-like object whose write() just hands the line back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def export_receivables_aging_csv(request):
+    writer = csv.writer(Echo())
+    header = ["Customer ID", "Customer", "Phone", "0-30", "31-60", "61-90", "90+", "Total Due"]
+
+    def rows():
+        yield writer.writerow(header)
+        for row in aging_queryset().iterator(chunk_size=2000):
+            yield writer.writerow(
+                [row["customer_id"], row["customer__name"], row["customer__phone"]]
+                + [money(row[name]) for name, _, _ in AGING_BUCKETS]
+                + [money(row["total_due"])]
+            )
+
+    filename = f"receivables_aging_{timezone.localdate():%Y-%m-%d}.csv"
+    response = StreamingHttpResponse(rows(), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
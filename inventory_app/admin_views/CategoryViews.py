@@ -5,11 +5,20 @@ from rest_framework.response import Response
 from rest_framework import generics,viewsets,permissions,filters
 from ..models import *
 from inventory_app.pagination import ListPagination 
+from inventory_app.caching import get_categories
+from inventory_app.mixins import ConditionalListMixin
 
-class CategoryView(viewsets.ModelViewSet):
+class CategoryView(ConditionalListMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     pagination_class = ListPagination
     queryset=Category.objects.all().order_by('-id')
     serializer_class=CategorySerializer
+    etag_models = (Category,)
     filter_backends = [filters.SearchFilter]
     search_fields = ['name', 'description']
+
+    def filter_queryset(self, queryset):
+        # Unfiltered listings (POS category bar, dropdowns) come from the cache
+        if self.action == 'list' and not self.request.query_params.get('search'):
+            return get_categories()
+        return super().filter_queryset(queryset)
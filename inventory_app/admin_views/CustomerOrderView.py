@@ -3,11 +3,11 @@ from ..models import Customer, Order
 from rest_framework.decorators import api_view
 from ..serializers import OrderSerializer
 from rest_framework.response import Response
-from datetime import datetime
-from django.utils.dateparse import parse_date
+from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from inventory_app.pagination import ListPagination
+from inventory_app.dateranges import filter_date_range, parse_date_range
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
@@ -19,13 +19,14 @@ def customer_orders(request, pk):
     end_date = request.GET.get("end_date")
 
     if start_date and end_date:
-        try:
-            start = datetime.strptime(start_date, "%Y-%m-%d")
-            end = datetime.strptime(end_date, "%Y-%m-%d")
-            # filter between dates (inclusive)
-            orders = orders.filter(order_date__date__range=[start, end])
-        except Exception as e:
-            print("Invalid date filter:", e)
+        start, end = parse_date_range(start_date, end_date)
+        if not (start and end):
+            return Response(
+                {"error": "start_date and end_date must be dates in YYYY-MM-DD format."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        # filter between dates (inclusive)
+        orders = filter_date_range(orders, "order_date", start, end)
 
     paginator = ListPagination()
     result_page = paginator.paginate_queryset(orders, request)
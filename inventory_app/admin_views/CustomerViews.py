@@ -7,13 +7,18 @@ from ..models import *
 from rest_framework.decorators import action
 from rest_framework import status
 from inventory_app.pagination import ListPagination 
+from inventory_app.mixins import ConditionalListMixin
+from inventory_app.projections import FastListMixin, CustomerProjection
+from inventory_app.dateranges import date_bounds, parse_date_range
 from django.db import IntegrityError 
 
-class CustomerView(viewsets.ModelViewSet):
+class CustomerView(ConditionalListMixin, FastListMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     pagination_class = ListPagination
     queryset=Customer.objects.all().order_by('-id')
     serializer_class=CustomerSerializer
+    list_projection = CustomerProjection
+    etag_models = (Customer,)
     filter_backends = [filters.SearchFilter]
     search_fields = [
         'name','email','phone','address'      
@@ -139,19 +144,12 @@ class CustomerView(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # ✅ Adjust logic using Decimal
-            if customer.pending_amount > 0:
-                if payment_amount >= customer.pending_amount:
-                    extra = payment_amount - customer.pending_amount
-                    customer.advance_payment += extra
-                    customer.pending_amount = Decimal('0.00')
-                else:
-                    customer.pending_amount -= payment_amount
-            else:
-                # No pending, add as advance
-                customer.advance_payment += payment_amount
-
-            customer.save()
+            # ✅ Post to the ledger; it settles pending/advance atomically
+            entry = CustomerLedgerEntry.post(
+                customer, "payment", -payment_amount,
+                note=request.data.get("note") or None,
+                created_by=request.user,
+            )
 
             return Response(
                 {
@@ -159,6 +157,7 @@ class CustomerView(viewsets.ModelViewSet):
                     "message": "Payment updated successfully.",
                     "pending_amount": str(customer.pending_amount),
                     "advance_payment": str(customer.advance_payment),
+                    "balance": str(entry.balance),
                 },
                 status=status.HTTP_200_OK,
             )
@@ -167,4 +166,65 @@ class CustomerView(viewsets.ModelViewSet):
             return Response(
                 {"status": False, "message": str(e)},
                 status=status.HTTP_400_BAD_REQUEST,
-            )
\ No newline at end of file
+            )
+
+    @action(detail=True, methods=['post'], url_path='adjustment')
+    def add_adjustment(self, request, pk=None):
+        """Manual balance correction, posted to the ledger (positive adds to pending)."""
+        customer = self.get_object()
+        try:
+            amount = Decimal(str(request.data.get("amount", "")))
+        except Exception:
+            return Response(
+                {"status": False, "message": "Invalid adjustment amount format."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not amount.is_finite() or amount == 0:
+            return Response(
+                {"status": False, "message": "Adjustment amount must be a non-zero number."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        entry = CustomerLedgerEntry.post(
+            customer, "adjustment", amount,
+            note=request.data.get("note") or None,
+            created_by=request.user,
+        )
+        return Response(
+            {
+                "status": True,
+                "message": "Adjustment recorded.",
+                "pending_amount": str(customer.pending_amount),
+                "advance_payment": str(customer.advance_payment),
+                "balance": str(entry.balance),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=True, methods=['get'], url_path='ledger')
+    def ledger(self, request, pk=None):
+        """Customer statement: ledger entries in a date range with the opening balance."""
+        customer = self.get_object()
+        entries = CustomerLedgerEntry.objects.filter(customer=customer)
+
+        opening_balance = Decimal('0.00')
+        start, end = parse_date_range(request.GET.get("start_date"), request.GET.get("end_date"))
+        start_dt, end_dt = date_bounds(start, end)
+        if start_dt:
+            entries = entries.filter(timestamp__gte=start_dt)
+            previous = (
+                CustomerLedgerEntry.objects.filter(customer=customer, timestamp__lt=start_dt)
+                .order_by('-timestamp', '-id')
+                .values_list('balance', flat=True)
+                .first()
+            )
+            opening_balance = previous or Decimal('0.00')
+        if end_dt:
+            entries = entries.filter(timestamp__lt=end_dt)
+
+        paginator = ListPagination()
+        page = paginator.paginate_queryset(entries.order_by('timestamp', 'id'), request, view=self)
+        serializer = CustomerLedgerEntrySerializer(page, many=True)
+        response = paginator.get_paginated_response(serializer.data)
+        response.data['opening_balance'] = str(opening_balance)
+        return response
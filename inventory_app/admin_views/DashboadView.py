@@ -2,26 +2,48 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q, Sum
-from django.utils.timezone import now, make_aware
-from datetime import datetime, timedelta
+from datetime import timedelta
+
+from inventory_app.admin_views.SalesView import top_products as top_selling_products
+from inventory_app.caching import get_role_name, versioned_payload
+from inventory_app.routers import ReportingMixin
+from inventory_app.dateranges import date_bounds, day_start, filter_date_range, shop_today
 
 from inventory_app.models import (
     Category, Supplier, Customer,
-    Product, ProductVariant, Purchase,Order,Inventory
+    Product, ProductVariant, Purchase,Order,Inventory,ReorderSuggestion
 )
 
 
-class DashboardStatsAPIView(APIView):
-    permission_classes = [IsAuthenticated]
+class CachedDashboardMixin:
+    """
+    Serve build_payload() from the dashboard cache. Entries are keyed per role
+    scope and dropped when the dashboard data version is bumped by signals.
+    """
+    cache_name = None
+
+    def get_cache_scope(self, request):
+        user = request.user
+        if user.is_superuser or get_role_name(user) in ["Admin"]:
+            return "admin"
+        return f"user-{user.pk}"
 
     def get(self, request):
+        name = f"{self.cache_name}:{self.get_cache_scope(request)}"
+        return Response(versioned_payload("dashboard", name, lambda: self.build_payload(request)))
+
+
+class DashboardStatsAPIView(ReportingMixin, CachedDashboardMixin, APIView):
+    permission_classes = [IsAuthenticated]
+    cache_name = "stats"
+
+    def build_payload(self, request):
         user = request.user
-        is_admin = user.is_superuser or (hasattr(user, "role") and user.role.name in ["Admin"])
+        is_admin = user.is_superuser or get_role_name(user) in ["Admin"]
 
-        today = now().date()
+        today = shop_today()
         ten_days_ago = today - timedelta(days=10)
-        today_start = make_aware(datetime.combine(today, datetime.min.time()))
-        today_end = make_aware(datetime.combine(today, datetime.max.time()))
+        today_start, today_end = date_bounds(today, today)
 
         # Filters for staff vs admin
         product_filter = Q()
@@ -46,12 +68,13 @@ class DashboardStatsAPIView(APIView):
         # Orders
         today_orders = Order.objects.filter(
             order_filter,
-            order_date__range=(today_start, today_end)
+            order_date__gte=today_start,
+            order_date__lt=today_end,
         ).count()
 
         last_10_days_orders = Order.objects.filter(
             order_filter,
-            order_date__gte=ten_days_ago
+            order_date__gte=day_start(ten_days_ago)
         ).count()
 
         total_sales_amount = Order.objects.filter(order_filter).aggregate(
@@ -67,24 +90,24 @@ class DashboardStatsAPIView(APIView):
         month_start = today.replace(day=1)
         monthly_orders = Order.objects.filter(
             order_filter,
-            order_date__gte=month_start
+            order_date__gte=day_start(month_start)
         ).count()
         
         monthly_sales = Order.objects.filter(
             order_filter,
-            order_date__gte=month_start
+            order_date__gte=day_start(month_start)
         ).aggregate(total=Sum("total_amount"))["total"] or 0
 
         # Weekly stats
         week_start = today - timedelta(days=today.weekday())
         weekly_orders = Order.objects.filter(
             order_filter,
-            order_date__gte=week_start
+            order_date__gte=day_start(week_start)
         ).count()
         
         weekly_sales = Order.objects.filter(
             order_filter,
-            order_date__gte=week_start
+            order_date__gte=day_start(week_start)
         ).aggregate(total=Sum("total_amount"))["total"] or 0
 
         # Product variants count
@@ -119,13 +142,20 @@ class DashboardStatsAPIView(APIView):
             "out_of_stock_products": out_of_stock_products,
         }
 
-        return Response(data)
+        return data
 
 
-class DashboardDataAPIView(APIView):
+class DashboardDataAPIView(ReportingMixin, CachedDashboardMixin, APIView):
     permission_classes = [IsAuthenticated]
+    cache_name = "data"
+
+    def get_cache_scope(self, request):
+        # The data payload does not depend on the user
+        return "all"
+
+    def build_payload(self, request):
+        today = shop_today()
 
-    def get(self, request):
         # Recent Products (5 latest)
         recent_products = list(
             Product.objects.select_related("category", "supplier")
@@ -158,19 +188,9 @@ class DashboardDataAPIView(APIView):
             .values("id", "order_date", "total_amount", "customer__name")
         )
 
-        # Top selling products (based on order items)
-        from django.db.models import Count, Sum as DBSum
-        top_products = list(
-            ProductVariant.objects
-            .filter(orderitem__isnull=False)
-            .annotate(
-                total_sold=DBSum("orderitem__quantity"),
-                order_count=Count("orderitem")
-            )
-            .select_related("product")
-            .order_by("-total_sold")[:5]
-            .values("product__name", "size", "total_sold", "order_count")
-        )
+        # Top selling products over the months of the sales trend below, net of returns
+        trend_start = (today.replace(day=1) - timedelta(days=30 * 5)).replace(day=1)
+        top_products = top_selling_products(start=day_start(trend_start), limit=5)
 
         # Low stock items with details
         low_stock_items = list(
@@ -181,30 +201,39 @@ class DashboardDataAPIView(APIView):
             .values("variant__product__name", "variant__size", "quantity")
         )
 
+        # Reorder suggestions from the nightly reorder engine
+        reorder_suggestions = list(
+            ReorderSuggestion.objects
+            .filter(suggested_quantity__gt=0)
+            .order_by("-suggested_quantity")[:10]
+            .values(
+                "variant__product__name", "variant__size", "current_stock",
+                "reorder_point", "suggested_quantity", "supplier__name",
+            )
+        )
+
         # Monthly sales trend (last 6 months)
-        from datetime import date
         monthly_trend = []
         for i in range(6):
-            month_date = date.today().replace(day=1) - timedelta(days=30*i)
+            month_date = today.replace(day=1) - timedelta(days=30*i)
             month_start = month_date.replace(day=1)
             if i == 0:
-                month_end = date.today()
+                month_end = today
             else:
                 next_month = month_date.replace(day=28) + timedelta(days=4)
                 month_end = (next_month - timedelta(days=next_month.day)).replace(day=1) + timedelta(days=31)
                 month_end = min(month_end.replace(day=1) + timedelta(days=31) - timedelta(days=1), month_end)
             
-            month_sales = Order.objects.filter(
-                order_date__date__gte=month_start,
-                order_date__date__lte=month_end
-            ).aggregate(total=DBSum("total_amount"))["total"] or 0
+            month_sales = filter_date_range(
+                Order.objects.all(), "order_date", month_start, month_end
+            ).aggregate(total=Sum("total_amount"))["total"] or 0
             
             monthly_trend.append({
                 "month": month_start.strftime("%b %Y"),
                 "sales": float(month_sales)
             })
 
-        return Response({
+        return {
             "recent_products": recent_products,
             "recent_purchases": recent_purchases,
             "recent_customers": recent_customers,
@@ -212,5 +241,6 @@ class DashboardDataAPIView(APIView):
             "recent_orders": recent_orders,
             "top_products": top_products,
             "low_stock_items": low_stock_items,
+            "reorder_suggestions": reorder_suggestions,
             "monthly_sales_trend": monthly_trend[::-1],  # Reverse to show oldest first
-        })
+        }
@@ -1,17 +1,18 @@
 from django.http import HttpResponse
-from openpyxl import Workbook
 from inventory_app.models import *
 from inventory_app.serializers import OrderSerializer 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
-from django.template.loader import get_template
 from django.http import HttpResponse
 from datetime import datetime
-import pdfkit  # For wkhtmltopdf (commented out below)
-from xhtml2pdf import pisa  # For xhtml2pdf
-import io
+from inventory_app.dateranges import filter_date_range, parse_date_range
+from inventory_app.routers import reporting_view
+# PDF/Excel libraries are imported on first export, not with the URLconf
+from inventory_app.exports import get_backend, statement_response
+from inventory_app.statements import customer_orders_statement, supplier_purchases_statement
 
 @permission_classes([IsAuthenticated])
+@reporting_view
 def export_customer_orders_excel(request, pk):
     # Fetch orders for this customer
     orders = Order.objects.filter(customer_id=pk)
@@ -21,7 +22,8 @@ def export_customer_orders_excel(request, pk):
     orders_data = serializer.data
 
     # Create workbook
-    wb = Workbook()
+    excel = get_backend("xlsx")
+    wb = excel.workbook()
     ws = wb.active
     ws.title = "Orders"
 
@@ -65,68 +67,36 @@ def export_customer_orders_excel(request, pk):
             ])
 
     # Return as downloadable Excel
-    response = HttpResponse(
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+    response = HttpResponse(content_type=excel.content_type)
     response["Content-Disposition"] = f'attachment; filename=customer_{pk}_orders.xlsx'
     wb.save(response)
     return response
 
+# PDFs are written by the backend picked per export (EXPORT_RENDERERS or
+# ?renderer=): "statement" draws rows directly with reportlab, "pisa" and
+# "wkhtmltopdf" render the pdf_templates/ HTML reports.
+
 @permission_classes([IsAuthenticated])
+@reporting_view
 def export_customer_orders_pdf(request, pk):
     start_date = request.GET.get("start_date")
     end_date = request.GET.get("end_date")
 
     orders = Order.objects.filter(customer_id=pk)
     if start_date and end_date:
-        orders = orders.filter(order_date__date__range=[start_date, end_date])
+        orders = filter_date_range(orders, "order_date", *parse_date_range(start_date, end_date))
 
     customer = Customer.objects.get(id=pk)
-    
-    #Calculate grand total here in Python  
-    total_sum = sum(order.total_amount for order in orders)
-
-    # Render HTML template - use queryset directly for proper date formatting
-    template_path = "pdf_templates/customer_orders.html"
-    context = {
-        "customer": customer,
-        "orders": orders,  # Use queryset instead of serialized data
-        "start_date": start_date,
-        "end_date": end_date,
-        "total_sum": total_sum,
-    }
 
-    template = get_template(template_path)
-    html = template.render(context)
+    statement = customer_orders_statement(customer, orders, start_date, end_date)
 
-    # Generate PDF using xhtml2pdf
-    result = io.BytesIO()
-    pdf_status = pisa.CreatePDF(html, dest=result)
-    
-    if pdf_status.err:
-        return HttpResponse('We had some errors <pre>' + html + '</pre>')
-    
     current_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     filename = f"customer_{pk}_orders_{current_time}.pdf"
+    return statement_response(request, "customer_orders", statement, f'attachment; filename="{filename}"')
 
-    # Return response
-    response = HttpResponse(result.getvalue(), content_type="application/pdf")
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return response
-
-    # --- COMMENTED OUT: wkhtmltopdf/pdfkit implementation ---
-    # Generate PDF using pdfkit (wkhtmltopdf)
-    # path_wkhtmltopdf = r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe"  
-    # config = pdfkit.configuration(wkhtmltopdf=path_wkhtmltopdf)
-    # current_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    # filename = f"customer_{pk}_orders_{current_time}.pdf"
-    # pdf = pdfkit.from_string(html, False, configuration=config)
-    # Return response
-    # response = HttpResponse(pdf, content_type="application/pdf")
-    # response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    # return response
 
 @permission_classes([IsAuthenticated])
+@reporting_view
 def export_supplier_purchases_pdf(request, pk):
     start_date = request.GET.get("start_date")
     end_date = request.GET.get("end_date")
@@ -136,51 +106,18 @@ def export_supplier_purchases_pdf(request, pk):
         purchases = purchases.filter(date__range=[start_date, end_date])
 
     supplier = Supplier.objects.get(id=pk)
-    total_sum = sum(p.total_price for p in purchases)
-
-    template_path = "pdf_templates/supplier_purchases.html"
-    context = {
-        "supplier": supplier,
-        "purchases": purchases,
-        "start_date": start_date,
-        "end_date": end_date,
-        "total_sum": total_sum,
-    }
 
-    template = get_template(template_path)
-    html = template.render(context)
-    
-    # Generate PDF using xhtml2pdf
-    result = io.BytesIO()
-    pdf_status = pisa.CreatePDF(html, dest=result)
-    
-    if pdf_status.err:
-        return HttpResponse('We had some errors <pre>' + html + '</pre>')
+    statement = supplier_purchases_statement(supplier, purchases, start_date, end_date)
 
     current_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     filename = f"supplier_{pk}_purchases_{current_time}.pdf"
-
-    # Return response
-    response = HttpResponse(result.getvalue(), content_type="application/pdf")
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return response
-
-    # --- COMMENTED OUT: wkhtmltopdf/pdfkit implementation ---
-    # Generate PDF using pdfkit (wkhtmltopdf)
-    # path_wkhtmltopdf = r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe" 
-    # config = pdfkit.configuration(wkhtmltopdf=path_wkhtmltopdf)
-    # current_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    # filename = f"supplier_{pk}_purchases_{current_time}.pdf"
-    # pdf = pdfkit.from_string(html, False, configuration=config)
-    # Return response
-    # response = HttpResponse(pdf, content_type="application/pdf")
-    # response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    # return response
+    return statement_response(request, "supplier_purchases", statement, f'attachment; filename="{filename}"')
 
 
 # ==================== PRINT PDF FUNCTIONS (Direct View/Print) ====================
 
 @permission_classes([IsAuthenticated])
+@reporting_view
 def print_customer_orders_pdf(request, pk):
     """Generate PDF for direct printing (inline display in browser)"""
     start_date = request.GET.get("start_date")
@@ -193,38 +130,15 @@ def print_customer_orders_pdf(request, pk):
 
     orders = Order.objects.filter(customer_id=pk)
     if start_date and end_date:
-        orders = orders.filter(order_date__date__range=[start_date, end_date])
-
-    # Calculate grand total
-    total_sum = sum(order.total_amount or 0 for order in orders)
+        orders = filter_date_range(orders, "order_date", *parse_date_range(start_date, end_date))
 
-    # Render HTML template
-    template_path = "pdf_templates/customer_orders.html"
-    context = {
-        "customer": customer,
-        "orders": orders,
-        "start_date": start_date,
-        "end_date": end_date,
-        "total_sum": total_sum,
-    }
-
-    template = get_template(template_path)
-    html = template.render(context)
-
-    # Generate PDF using xhtml2pdf
-    result = io.BytesIO()
-    pdf_status = pisa.CreatePDF(html, dest=result)
-    
-    if pdf_status.err:
-        return HttpResponse('We had some errors <pre>' + html + '</pre>')
-
-    # Return response for inline display (no attachment header)
-    response = HttpResponse(result.getvalue(), content_type="application/pdf")
-    response["Content-Disposition"] = "inline"  # This makes it display in browser instead of download
-    return response
+    statement = customer_orders_statement(customer, orders, start_date, end_date)
+    # "inline" displays it in the browser instead of downloading
+    return statement_response(request, "customer_orders", statement, "inline")
 
 
 @permission_classes([IsAuthenticated])
+@reporting_view
 def print_supplier_purchases_pdf(request, pk):
     """Generate PDF for direct printing (inline display in browser)"""
     start_date = request.GET.get("start_date")
@@ -239,30 +153,5 @@ def print_supplier_purchases_pdf(request, pk):
     if start_date and end_date:
         purchases = purchases.filter(date__range=[start_date, end_date])
 
-    # Calculate grand total
-    total_sum = sum(p.total_price or 0 for p in purchases)
-
-    # Render HTML template
-    template_path = "pdf_templates/supplier_purchases.html"
-    context = {
-        "supplier": supplier,
-        "purchases": purchases,
-        "start_date": start_date,
-        "end_date": end_date,
-        "total_sum": total_sum,
-    }
-
-    template = get_template(template_path)
-    html = template.render(context)
-    
-    # Generate PDF using xhtml2pdf
-    result = io.BytesIO()
-    pdf_status = pisa.CreatePDF(html, dest=result)
-    
-    if pdf_status.err:
-        return HttpResponse('We had some errors <pre>' + html + '</pre>')
-
-    # Return response for inline display (no attachment header)
-    response = HttpResponse(result.getvalue(), content_type="application/pdf")
-    response["Content-Disposition"] = "inline"  # This makes it display in browser instead of download
-    return response
+    statement = supplier_purchases_statement(supplier, purchases, start_date, end_date)
+    return statement_response(request, "supplier_purchases", statement, "inline")
@@ -5,12 +5,14 @@ from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from ..models import OrderItem
 from ..serializers import OrderItemSerializer
+from ..mixins import QueryPlanMixin
 
 
-class OrderItemManagementViewSet(viewsets.ModelViewSet):
+class OrderItemManagementViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """ViewSet for managing individual order items"""
     queryset = OrderItem.objects.all()
     serializer_class = OrderItemSerializer
+    query_plans = {"*": {"select_related": ("variant__product",)}}
     permission_classes = [IsAuthenticated]
 
     @action(detail=True, methods=['post'])
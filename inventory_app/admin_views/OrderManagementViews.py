@@ -6,14 +6,23 @@ from django.shortcuts import get_object_or_404, render
 from django.utils import timezone
 from django.db import transaction, models
 from decimal import Decimal
-from ..models import Order, OrderItem, OrderReturn, ReturnItem, Customer, Inventory, ProductVariant, Product
+from ..models import Order, OrderItem, OrderReturn, ReturnItem, Customer, Inventory, ProductVariant, Product, CustomerLedgerEntry
 from ..serializers import OrderSerializer, OrderItemSerializer
 from django.core.exceptions import ValidationError
+from ..mixins import QueryPlanMixin
 
 
-class OrderManagementViewSet(viewsets.ModelViewSet):
+ORDER_ITEMS_PREFETCH = models.Prefetch('items', queryset=OrderItem.objects.select_related('variant__product'))
+
+
+class OrderManagementViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """ViewSet for managing order editing and modifications"""
-    queryset = Order.objects.all().select_related('customer').order_by('-order_date')
+    queryset = Order.objects.all().order_by('-order_date')
+    query_plans = {
+        '*': {'select_related': ('customer',)},
+        'list': {'prefetch_related': (ORDER_ITEMS_PREFETCH,)},
+        'retrieve': {'prefetch_related': (ORDER_ITEMS_PREFETCH,)},
+    }
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
     
@@ -399,8 +408,12 @@ class OrderManagementViewSet(viewsets.ModelViewSet):
                     # Update customer balance (add refund as credit)
                     customer = return_order.original_order.customer
                     if customer:
-                        customer.advance_payment += return_order.refund_amount
-                        customer.save()
+                        CustomerLedgerEntry.post(
+                            customer, 'return', -return_order.refund_amount,
+                            order=return_order.original_order,
+                            order_return=return_order,
+                            created_by=request.user if request.user.is_authenticated else None,
+                        )
                     
                     return_order.notes = f"{return_order.notes}\n{notes}".strip()
                     
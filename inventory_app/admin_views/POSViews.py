@@ -2,18 +2,24 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from django.http import Http404, HttpResponse, HttpResponseBadRequest
 from django.utils import timezone
 from django.conf import settings
+from django.contrib.auth.decorators import login_required
 from datetime import datetime
 import pytz
-from ..models import Cart, ProductVariant,Customer, Order, OrderItem, Sale, Inventory
+from ..models import Cart, Customer, Order, OrderItem, Sale, Inventory, CustomerLedgerEntry
 from django.shortcuts import render,redirect
 from ..serializers import CartSerializer,OrderItemSerializer
+from ..caching import get_variant_pricing
+from ..mixins import QueryPlanMixin
+from .. import receipts
 from decimal import Decimal
 
-class CartViewSet(viewsets.ModelViewSet):
+class CartViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Cart.objects.all()
     serializer_class = CartSerializer
+    query_plans = {"*": {"select_related": ("variant__product",)}}
     permission_classes = [IsAuthenticated]
 
     def create(self, request, *args, **kwargs):
@@ -25,11 +31,13 @@ class CartViewSet(viewsets.ModelViewSet):
         if not variant_id:
             return Response({"error": "variantId is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        variant = get_object_or_404(ProductVariant, id=variant_id)
-        final_price = Decimal(price) if price else variant.price
+        variant = get_variant_pricing(variant_id)
+        if variant is None:
+            return Response({"error": "Variant not found"}, status=status.HTTP_404_NOT_FOUND)
+        final_price = Decimal(price) if price else variant["price"]
 
         cart_item, created = Cart.objects.get_or_create(
-            variant=variant,
+            variant_id=variant["id"],
             defaults={"quantity": qty,"price": final_price, "item_discount": 0, "is_percentage": True, "gst": 0}
         )
 
@@ -125,68 +133,16 @@ def place_order(request):
         paid_amount=paid_amount,
     )
 
-    # ---------------- Payment Calculation ----------------
-    final_total = float(total_amount)
-    paid_amount_float = float(paid_amount)
-    old_unpaid = float(customer.pending_amount or 0.0)
-    old_advance = float(customer.advance_payment or 0.0)
-
-    order_balance = 0.0  # New pending for this order
-    order_advance = 0.0  # New advance created by this order
-    is_paid = False
-
-    # CASE 1: Paid >= Current Order
-    if paid_amount_float >= final_total:
-        extra = paid_amount_float - final_total
-        order_balance = 0.0
-
-        if extra > 0:
-            # Use extra to clear old unpaid first
-            if extra >= old_unpaid:
-                extra -= old_unpaid
-                old_unpaid = 0.0
-                order_advance = extra
-                is_paid = True
-            else:
-                old_unpaid -= extra
-                # Use old advance to clear remaining unpaid
-                if old_advance >= old_unpaid:
-                    old_advance -= old_unpaid
-                    old_unpaid = 0.0
-                    is_paid = True
-                else:
-                    old_unpaid -= old_advance
-                    old_advance = 0.0
-                    is_paid = False
-                order_advance = 0.0
-                order_balance = old_unpaid
-        else:
-            order_advance = 0.0
-            order_balance = old_unpaid
-            is_paid = (old_unpaid == 0)
-
-    # CASE 2: Paid < Current Order
-    else:
-        remaining_due = final_total - paid_amount_float
-        if old_advance >= remaining_due:
-            old_advance -= remaining_due
-            remaining_due = 0.0
-            order_balance = 0.0
-            is_paid = True
-        else:
-            remaining_due -= old_advance
-            old_advance = 0.0
-            order_balance = old_unpaid + remaining_due
-            is_paid = False
-        order_advance = 0.0
-
-    # Update customer & order
-    customer.advance_payment = Decimal(old_advance + order_advance)
-    customer.pending_amount = Decimal(order_balance)
-    customer.save()
-
-    order.is_paid = is_paid
-    order.save()
+    # ---------------- Ledger Postings ----------------
+    # The order is a debit and the amount paid at the counter a credit; the
+    # ledger keeps the running balance and the customer's pending/advance.
+    created_by = request.user if request.user.is_authenticated else None
+    CustomerLedgerEntry.post(customer, "order", total_amount, order=order, created_by=created_by)
+    if paid_amount > 0:
+        CustomerLedgerEntry.post(customer, "payment", -paid_amount, order=order, created_by=created_by)
+
+    order.is_paid = customer.pending_amount <= 0
+    order.save(update_fields=["is_paid"])
 
     # ---------------- Save OrderItems ----------------
     cart_items = Cart.objects.all()
@@ -228,4 +184,28 @@ def bill_page(request, order_id):
         "order": order,
         "items": serializer.data,
         "net_amount": net_amount
-    })
\ No newline at end of file
+    })
+
+
+@login_required
+def order_receipt(request, order_id):
+    """Thermal receipt of an order: ?format=escpos (raw printer bytes) or pdf, ?paper=58 or 80."""
+    output = request.GET.get("format", "escpos")
+    try:
+        paper = int(request.GET.get("paper", settings.RECEIPT_PAPER))
+    except ValueError:
+        paper = None
+    if output not in receipts.FORMATS or paper not in receipts.PAPER_COLUMNS:
+        return HttpResponseBadRequest("format must be escpos or pdf and paper 58 or 80")
+
+    content = receipts.render_receipt(order_id, output, paper)
+    if content is None:
+        raise Http404("Order not found")
+
+    if output == "pdf":
+        response = HttpResponse(content, content_type="application/pdf")
+        response["Content-Disposition"] = f'inline; filename="receipt_{order_id}_{paper}mm.pdf"'
+    else:
+        response = HttpResponse(content, content_type="application/octet-stream")
+        response["Content-Disposition"] = f'attachment; filename="receipt_{order_id}.bin"'
+    return response
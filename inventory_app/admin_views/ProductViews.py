@@ -1,21 +1,32 @@
 from rest_framework import viewsets, permissions, filters
 from rest_framework.permissions import IsAuthenticated
-from ..models import ProductVariant,Product
+from ..models import ProductVariant,Product,Category
 from ..serializers import ProductSerializer,ProductVariantSerializer
 from django_filters.rest_framework import DjangoFilterBackend
 from inventory_app.pagination import ListPagination
+from inventory_app.mixins import ConditionalListMixin, QueryPlanMixin
+from inventory_app.projections import FastListMixin, ProductProjection
 
-class ProductView(viewsets.ModelViewSet):
+class ProductView(ConditionalListMixin, FastListMixin, QueryPlanMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     pagination_class = ListPagination
-    queryset = Product.objects.all().prefetch_related("variants").order_by('-id')
+    queryset = Product.objects.all().order_by('-id')
     serializer_class = ProductSerializer
+    list_projection = ProductProjection
+    # Write actions replace the variants, so only reads prefetch them.
+    query_plans = {
+        "*": {"select_related": ("category",)},
+        "list": {"prefetch_related": ("variants",)},
+        "retrieve": {"prefetch_related": ("variants",)},
+    }
+    etag_models = (Product, ProductVariant, Category)
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["name", "category__name"]
     filterset_fields = ["category"]
 
-class ProductVariantView(viewsets.ModelViewSet):
+class ProductVariantView(QueryPlanMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     pagination_class = ListPagination
     queryset = ProductVariant.objects.all().order_by('-id')
-    serializer_class = ProductVariantSerializer
\ No newline at end of file
+    serializer_class = ProductVariantSerializer
+    query_plans = {"*": {"select_related": ("product",)}}
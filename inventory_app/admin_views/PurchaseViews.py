@@ -5,12 +5,16 @@ from ..serializers import PurchaseSerializer
 from rest_framework import status
 from rest_framework.response import Response
 from inventory_app.pagination import ListPagination 
+from inventory_app.projections import FastListMixin, PurchaseProjection
+from inventory_app.mixins import QueryPlanMixin
 
-class PurchaseViewSet(viewsets.ModelViewSet):
+class PurchaseViewSet(FastListMixin, QueryPlanMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     pagination_class = ListPagination
     queryset = Purchase.objects.all().order_by('-date', '-id')
     serializer_class = PurchaseSerializer
+    list_projection = PurchaseProjection
+    query_plans = {"*": {"select_related": ("supplier", "variant__product__category")}}
     filter_backends = [filters.SearchFilter]
     search_fields = [
         'variant__product__name',      
@@ -82,6 +86,20 @@ from ..models import Inventory
 from ..serializers import InventoryVariantSerializer
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
+from inventory_app.columnar import wants_columnar, columnar_response
+from inventory_app.thumbnails import thumbnail_url
+
+PURCHASE_PRODUCT_COLUMNS = (
+    ("id", "id"),
+    ("variant", "variant_id"),
+    ("size", "variant__size"),
+    ("price", "variant__price"),
+    ("quantity", "quantity"),
+    ("product_name", "variant__product__name"),
+    ("product_photo", "variant__product__thumbnails"),
+    ("category_id", "variant__product__category_id"),
+    ("category_name", "variant__product__category__name"),
+)
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
@@ -92,5 +110,11 @@ def purchase_products(request):
     if category_id:
         inventory_qs = inventory_qs.filter(variant__product__category_id=category_id)
 
+    if wants_columnar(request):
+        return columnar_response(
+            request, inventory_qs, PURCHASE_PRODUCT_COLUMNS,
+            transforms={"product_photo": thumbnail_url},
+        )
+
     serializer = InventoryVariantSerializer(inventory_qs, many=True)
     return Response(serializer.data)
@@ -8,16 +8,35 @@ from django.db import transaction, models
 from decimal import Decimal
 from ..models import Order, OrderItem, OrderReturn, ReturnItem, Inventory
 from ..serializers import OrderReturnSerializer, ReturnItemSerializer
+from inventory_app.pagination import ListPagination
+from inventory_app.mixins import QueryPlanMixin
+from inventory_app.routers import reporting_view
+from django.utils.decorators import method_decorator
 
 
-class ReturnsManagementViewSet(viewsets.ModelViewSet):
+RETURN_ITEMS_PREFETCH = models.Prefetch(
+    'return_items',
+    queryset=ReturnItem.objects.select_related('order_item__variant__product'),
+)
+
+
+class ReturnsManagementViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """ViewSet for managing returns and refunds"""
-    queryset = OrderReturn.objects.all().select_related('original_order__customer', 'processed_by').order_by('-return_date')
+    queryset = OrderReturn.objects.all().order_by('-return_date')
+    # Status actions only touch the return itself, so every action can
+    # reuse the prefetched items when serializing the result.
+    query_plans = {
+        '*': {
+            'select_related': ('original_order__customer', 'processed_by'),
+            'prefetch_related': (RETURN_ITEMS_PREFETCH,),
+        },
+    }
     serializer_class = OrderReturnSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = ListPagination
     
     def list(self, request):
-        """Get list of all returns with filtering options"""
+        """Get paginated list of returns with filtering options"""
         returns = self.get_queryset()
         
         # Apply filters
@@ -37,8 +56,9 @@ class ReturnsManagementViewSet(viewsets.ModelViewSet):
                 models.Q(original_order__customer__name__icontains=search)
             )
             
-        serializer = self.get_serializer(returns, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(returns)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
     @action(detail=False, methods=['post'])
     def create_return(self, request):
@@ -229,23 +249,38 @@ class ReturnsManagementViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
     
     @action(detail=False, methods=['get'])
+    @method_decorator(reporting_view)
     def return_statistics(self, request):
         """Get return statistics for dashboard"""
         try:
             from django.db.models import Count, Sum
             
+            # One grouped query for all status counts and refund totals
+            by_status = {
+                row['status']: row
+                for row in OrderReturn.objects.order_by().values('status').annotate(
+                    count=Count('id'),
+                    refund_total=Sum('refund_amount'),
+                )
+            }
+            
+            def status_count(name):
+                return by_status.get(name, {}).get('count', 0)
+            
             stats = {
-                'total_returns': OrderReturn.objects.count(),
-                'pending_returns': OrderReturn.objects.filter(status='pending').count(),
-                'approved_returns': OrderReturn.objects.filter(status='approved').count(),
-                'completed_returns': OrderReturn.objects.filter(status='completed').count(),
-                'rejected_returns': OrderReturn.objects.filter(status='rejected').count(),
-                'total_refund_amount': OrderReturn.objects.filter(
-                    status__in=['approved', 'completed']
-                ).aggregate(total=Sum('refund_amount'))['total'] or 0,
+                'total_returns': sum(row['count'] for row in by_status.values()),
+                'pending_returns': status_count('pending'),
+                'approved_returns': status_count('approved'),
+                'completed_returns': status_count('completed'),
+                'rejected_returns': status_count('rejected'),
+                'total_refund_amount': sum(
+                    by_status.get(name, {}).get('refund_total') or 0
+                    for name in ('approved', 'completed')
+                ),
                 'returns_by_reason': list(
-                    OrderReturn.objects.values('reason').annotate(
-                        count=Count('id')
+                    OrderReturn.objects.order_by().values('reason').annotate(
+                        count=Count('id'),
+                        refund_total=Sum('refund_amount'),
                     ).order_by('-count')
                 )
             }
@@ -1,11 +1,30 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from inventory_app.models import Sale
-from django.utils.dateparse import parse_date
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from inventory_app.models import Sale, OrderItem, ReturnItem, Purchase
 from inventory_app.pagination import ListPagination
-from django.db.models import Q
+from django.db.models import (
+    Q, F, Sum, Count, Case, When, Value, DecimalField, ExpressionWrapper, IntegerField, OuterRef, Subquery,
+)
+from django.db.models.functions import Coalesce
+from inventory_app.columnar import wants_columnar, columnar_response
+from inventory_app.routers import ReportingMixin
+from inventory_app.dateranges import date_bounds, filter_date_range, parse_date_range
+from decimal import Decimal
 
-class SalesListAPI(APIView):
+SALES_COLUMNS = (
+    ("sale_date", "sale_date"),
+    ("order_id", "order_id"),
+    ("customer_name", "customer_name"),
+    ("pay_type", "order__pay_type"),
+    ("total_amount", "total_amount"),
+    ("paid_amount", "paid_amount"),
+    ("profit", "profit"),
+)
+
+
+class SalesListAPI(ReportingMixin, APIView):
     pagination_class = ListPagination
 
     def get(self, request):
@@ -17,10 +36,9 @@ class SalesListAPI(APIView):
 
         # 🔹 Apply date filtering
         if start_date and end_date:
-            start = parse_date(start_date)
-            end = parse_date(end_date)
+            start, end = parse_date_range(start_date, end_date)
             if start and end:
-                sales = sales.filter(sale_date__date__range=(start, end))
+                sales = filter_date_range(sales, "sale_date", start, end)
                 
         if search:
             sales = sales.filter(
@@ -30,6 +48,10 @@ class SalesListAPI(APIView):
             )
 
         paginator = self.pagination_class()
+        if wants_columnar(request):
+            sales = sales.annotate(customer_name=Coalesce("order__customer__name", Value("Walk-in")))
+            return columnar_response(request, sales, SALES_COLUMNS, paginator=paginator, view=self)
+
         paginated_sales = paginator.paginate_queryset(sales, request, view=self)
 
         data = []
@@ -46,6 +68,154 @@ class SalesListAPI(APIView):
 
         return paginator.get_paginated_response(data)
 
+RANKING_METRICS = ("quantity", "revenue", "profit")
+# Net annotation each metric ranks on ("quantity" is taken by the model field)
+RANKING_FIELDS = {"quantity": "net_quantity", "revenue": "net_revenue", "profit": "profit"}
+
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+HUNDRED = Decimal("100.00")
+
+
+def line_revenue(prefix=""):
+    """Order item line total after item discount, excluding GST; fields are read under ``prefix``."""
+    price, quantity, discount = (F(prefix + name) for name in ("price_at_sale", "quantity", "item_discount"))
+    return Case(
+        When(**{prefix + "is_percentage": True}, then=price * quantity * (Value(HUNDRED) - discount) / Value(HUNDRED)),
+        default=price * quantity - discount,
+        output_field=MONEY,
+    )
+
+
+LINE_REVENUE = line_revenue()
+
+# Returned units valued at the sold line's ex-GST unit revenue. ReturnItem
+# refunds include GST and condition deductions, so they are not on the same
+# basis as LINE_REVENUE.
+RETURNED_REVENUE = ExpressionWrapper(
+    line_revenue("order_item__") * F("return_quantity") / F("order_item__quantity"),
+    output_field=MONEY,
+)
+
+
+def _returned(returns, value, output_field):
+    """Sum of ``value`` over ``returns`` of the outer row's variant, 0 when there are none."""
+    total = (
+        returns.filter(order_item__variant_id=OuterRef("variant_id"))
+        .values("order_item__variant_id")
+        .annotate(total=Sum(value))
+        .values("total")
+    )
+    return Coalesce(Subquery(total, output_field=output_field), Value(0), output_field=output_field)
+
+
+def top_products(start=None, end=None, category_id=None, metric="quantity", limit=10):
+    """
+    Rank variants by quantity, revenue or profit sold in ``[start, end)``,
+    net of approved/completed returns.
+
+    One grouped query over the order items in range (filtered on the indexed
+    order date): returned units and revenue are subtracted through correlated
+    subqueries, and the database sorts on the net metric and applies the
+    limit. Revenue is ex-GST; profit uses each variant's latest purchase price
+    (also ex-GST) as unit cost.
+    """
+    items = OrderItem.objects.all()
+    returns = ReturnItem.objects.filter(return_order__status__in=["approved", "completed"])
+    if start:
+        items = items.filter(order__order_date__gte=start)
+        returns = returns.filter(order_item__order__order_date__gte=start)
+    if end:
+        items = items.filter(order__order_date__lt=end)
+        returns = returns.filter(order_item__order__order_date__lt=end)
+    if category_id:
+        items = items.filter(variant__product__category_id=category_id)
+
+    ranked = items.values(
+        "variant_id", "variant__product__name", "variant__size", "variant__product__category__name",
+    ).annotate(
+        # Named apart from the quantity field, which LINE_REVENUE reads
+        quantity_sold=Sum("quantity"),
+        revenue_sold=Sum(LINE_REVENUE),
+        order_count=Count("order", distinct=True),
+        quantity_returned=_returned(returns, "return_quantity", IntegerField()),
+        revenue_returned=_returned(returns, RETURNED_REVENUE, MONEY),
+    ).annotate(
+        net_quantity=F("quantity_sold") - F("quantity_returned"),
+        net_revenue=ExpressionWrapper(F("revenue_sold") - F("revenue_returned"), output_field=MONEY),
+    )
+    if metric == "profit":
+        latest_cost = (
+            Purchase.objects.filter(variant_id=OuterRef("variant_id"))
+            .order_by("-date", "-id")
+            .values("purchase_price")[:1]
+        )
+        ranked = ranked.annotate(
+            profit=ExpressionWrapper(
+                F("net_revenue")
+                - Coalesce(Subquery(latest_cost, output_field=MONEY), Value(0), output_field=MONEY) * F("net_quantity"),
+                output_field=MONEY,
+            ),
+        )
+
+    ranking = []
+    ranked = ranked.order_by(f"-{RANKING_FIELDS[metric]}", "variant_id")[:limit]
+    for row in ranked:
+        entry = {
+            "variant_id": row["variant_id"],
+            "product__name": row["variant__product__name"],
+            "size": row["variant__size"],
+            "category__name": row["variant__product__category__name"],
+            "total_sold": row["net_quantity"],
+            "order_count": row["order_count"],
+            "revenue": Decimal(row["net_revenue"] or 0).quantize(Decimal("0.01")),
+        }
+        if metric == "profit":
+            entry["profit"] = Decimal(row["profit"] or 0).quantize(Decimal("0.01"))
+        ranking.append(entry)
+    return ranking
+
+
+class TopProductsAPI(ReportingMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        metric = request.GET.get("metric", "quantity")
+        if metric not in RANKING_METRICS:
+            return Response(
+                {"error": f"Invalid metric. Valid options are: {', '.join(RANKING_METRICS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            limit = max(1, min(int(request.GET.get("limit", 10)), 100))
+        except ValueError:
+            limit = 10
+
+        category_id = request.GET.get("category_id") or None
+        if category_id is not None:
+            try:
+                category_id = int(category_id)
+            except ValueError:
+                return Response({"error": "category_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        start_date, end_date = request.GET.get("start_date"), request.GET.get("end_date")
+        start_day, end_day = parse_date_range(start_date, end_date)
+        if (start_date and start_day is None) or (end_date and end_day is None):
+            return Response(
+                {"error": "start_date and end_date must be dates in YYYY-MM-DD format."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        start, end = date_bounds(start_day, end_day)
+
+        data = top_products(
+            start=start,
+            end=end,
+            category_id=category_id,
+            metric=metric,
+            limit=limit,
+        )
+        return Response({"metric": metric, "results": data})
+
 # from rest_framework.views import APIView
 # from rest_framework.response import Response
 # from inventory_app.models import Sale
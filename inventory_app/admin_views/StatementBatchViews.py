@@ -0,0 +1,80 @@
+import os
+
+from django.http import FileResponse
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from inventory_app.caching import get_role_name
+from inventory_app.exports import PDF_BACKENDS
+from inventory_app.statement_batch import job_path, job_status, select_customers, start_batch_job
+
+
+def _is_admin(user):
+    return user.is_superuser or get_role_name(user) in ["Admin"]
+
+
+def _parse_customer_ids(value):
+    """``value`` as a list of ints, or None when it is not a list of customer IDs."""
+    if not isinstance(value, list):
+        return None
+    if not all(isinstance(item, int) and not isinstance(item, bool) for item in value):
+        return None
+    return value
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def start_statement_batch(request):
+    """
+    Start rendering customer statements into a zip archive in the background.
+    Body: ``pending_only`` (default true), ``customer_ids``, ``start_date``,
+    ``end_date``, ``renderer``. Poll the returned job for progress.
+    """
+    if not _is_admin(request.user):
+        return Response({"error": "Only admins can run statement batches."}, status=status.HTTP_403_FORBIDDEN)
+
+    renderer = request.data.get("renderer") or None
+    if renderer is not None and renderer not in PDF_BACKENDS:
+        return Response({"error": f"Unknown renderer {renderer!r}."}, status=status.HTTP_400_BAD_REQUEST)
+
+    pending_only = str(request.data.get("pending_only", "true")).lower() not in ("0", "false", "no")
+    customer_ids = request.data.get("customer_ids") or None
+    if customer_ids is not None:
+        customer_ids = _parse_customer_ids(customer_ids)
+        if customer_ids is None:
+            return Response(
+                {"error": "customer_ids must be a list of customer IDs."}, status=status.HTTP_400_BAD_REQUEST,
+            )
+    customers = select_customers(pending_only, customer_ids)
+    if not customers:
+        return Response({"error": "No customers match."}, status=status.HTTP_400_BAD_REQUEST)
+
+    job_id, job = start_batch_job(
+        customers, request.data.get("start_date"), request.data.get("end_date"), renderer,
+    )
+    return Response({"job_id": job_id, **job}, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def statement_batch_status(request, job_id):
+    if not _is_admin(request.user):
+        return Response({"error": "Only admins can view statement batches."}, status=status.HTTP_403_FORBIDDEN)
+    job = job_status(job_id)
+    if job is None:
+        return Response({"error": "Job not found."}, status=status.HTTP_404_NOT_FOUND)
+    return Response({"job_id": job_id, **job})
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def download_statement_batch(request, job_id):
+    if not _is_admin(request.user):
+        return Response({"error": "Only admins can download statement batches."}, status=status.HTTP_403_FORBIDDEN)
+    job = job_status(job_id)
+    path = job_path(job_id)
+    if not job or job["status"] != "done" or not os.path.exists(path):
+        return Response({"error": "Archive not ready."}, status=status.HTTP_404_NOT_FOUND)
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=f"customer_statements_{job_id}.zip")
@@ -8,20 +8,37 @@ from django.utils.dateparse import parse_date
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from inventory_app.pagination import ListPagination 
-class SupplierView(viewsets.ModelViewSet):
+from inventory_app.mixins import ConditionalListMixin
+from inventory_app.columnar import wants_columnar, columnar_response
+from django.db.models import Value
+from django.db.models.functions import Concat
+
+class SupplierView(ConditionalListMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     pagination_class = ListPagination
     queryset=Supplier.objects.all().order_by('-id')
     serializer_class=SupplierSerializer
+    etag_models = (Supplier,)
     filter_backends = [filters.SearchFilter]
     search_fields = [
         'name','email','phone','address'      
     ]
 
+SUPPLIER_PURCHASE_COLUMNS = (
+    ("id", "id"),
+    ("date", "date"),
+    ("variant", "variant_label"),
+    ("quantity", "quantity"),
+    ("purchase_price", "purchase_price"),
+    ("discount", "discount"),
+    ("gst", "gst"),
+    ("total_price", "total_price"),
+)
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])    
 def supplier_purchases(request, pk):
-    purchases = Purchase.objects.filter(supplier=pk).order_by("-date")
+    purchases = Purchase.objects.filter(supplier=pk).select_related("variant__product").order_by("-date")
 
     # Optional date filtering
     start_date = request.GET.get("start_date")
@@ -30,6 +47,10 @@ def supplier_purchases(request, pk):
         purchases = purchases.filter(date__range=[parse_date(start_date), parse_date(end_date)])
         
     paginator = ListPagination()
+    if wants_columnar(request):
+        purchases = purchases.annotate(variant_label=Concat("variant__product__name", Value(" - "), "variant__size"))
+        return columnar_response(request, purchases, SUPPLIER_PURCHASE_COLUMNS, paginator=paginator)
+
     query_params = getattr(request, "query_params", request.GET)
     result_page = paginator.paginate_queryset(purchases, request)
 
@@ -5,15 +5,17 @@ from rest_framework.decorators import action
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.hashers import check_password
 from ..models import UserAccount, Role
+from ..mixins import QueryPlanMixin
 from ..serializers import UserProfileSerializer, UserCreateSerializer, RoleSerializer
 from inventory_app.pagination import ListPagination
 
 
-class UserManagementViewSet(viewsets.ModelViewSet):
+class UserManagementViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """ViewSet for managing users in settings"""
     permission_classes = [IsAuthenticated]
     pagination_class = ListPagination
     queryset = UserAccount.objects.all().order_by('-date_joined')
+    query_plans = {'*': {'select_related': ('role', 'created_by')}}
     filter_backends = [filters.SearchFilter]
     search_fields = ['full_name', 'email', 'mobile', 'username']
     
@@ -25,7 +27,7 @@ class UserManagementViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter users based on permissions"""
-        queryset = UserAccount.objects.all().order_by('-date_joined')
+        queryset = super().get_queryset()
         
         # If not superuser, only show users created by current user
         if not self.request.user.is_superuser:
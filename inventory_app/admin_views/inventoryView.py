@@ -1,15 +1,48 @@
 from rest_framework import viewsets,filters
+from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
-from ..models import Inventory
-from ..serializers import InventorySerializer
+from ..models import Inventory, Product, ProductVariant, ReorderSuggestion
+from ..serializers import InventorySerializer, ReorderSuggestionSerializer
 from inventory_app.pagination import ListPagination
+from inventory_app.mixins import ConditionalListMixin, QueryPlanMixin
+from inventory_app.columnar import ColumnarListMixin
+from inventory_app.projections import FastListMixin, InventoryProjection
 
-class InventoryViewSet(viewsets.ModelViewSet):
+class InventoryViewSet(ConditionalListMixin, ColumnarListMixin, FastListMixin, QueryPlanMixin, viewsets.ModelViewSet):
     pagination_class = ListPagination
     permission_classes = [IsAuthenticated]
     queryset = Inventory.objects.all().order_by('-id')  # or order_by('variant__product__name')
     serializer_class = InventorySerializer
+    list_projection = InventoryProjection
+    etag_models = (Inventory, ProductVariant, Product)
+    query_plans = {"*": {"select_related": ("variant__product",)}}
+    columnar_fields = (
+        ("id", "id"),
+        ("variant", "variant_id"),
+        ("variant_name", "variant__product__name"),
+        ("size", "variant__size"),
+        ("quantity", "quantity"),
+    )
     filter_backends = [filters.SearchFilter]
     search_fields = [
         'variant__product__name',   
     ]
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def reorder_suggestions(request):
+    suggestions = (
+        ReorderSuggestion.objects.filter(suggested_quantity__gt=0)
+        .select_related("variant__product", "supplier")
+        .order_by("-suggested_quantity")
+    )
+
+    supplier_id = request.GET.get("supplier_id")
+    if supplier_id:
+        suggestions = suggestions.filter(supplier_id=supplier_id)
+
+    paginator = ListPagination()
+    page = paginator.paginate_queryset(suggestions, request)
+    serializer = ReorderSuggestionSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
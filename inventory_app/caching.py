@@ -0,0 +1,181 @@
+"""
+Read-through cache for reference data (categories, variant pricing, roles)
+and for computed report payloads such as the dashboard.
+
+Entries live in the default cache configured in settings.CACHES. Each group
+of keys carries a version number; the signal handlers in
+inventory_app.signals bump that version on model saves/deletes, which
+invalidates every key of the group at once without scanning the backend.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from inventory_app.models import Category, ProductVariant, UserAccount
+from inventory_app.routers import reading_replica, replica_lag_seconds
+
+KEY_PREFIX = "refdata"
+TIMEOUT = 60 * 60
+GROUPS = ("categories", "variants", "roles", "dashboard", "templates")
+
+
+def _version_key(group):
+    return f"{KEY_PREFIX}:{group}:version"
+
+
+def _new_version():
+    # Seeded from the clock rather than 1: a version key evicted from the
+    # cache comes back as a number no existing entry was stored under.
+    return time.time_ns()
+
+
+def group_version(group):
+    version = cache.get(_version_key(group))
+    if version is None:
+        cache.add(_version_key(group), _new_version(), timeout=None)
+        version = cache.get(_version_key(group))
+    # Still missing means the backend does not keep it; never reuse a version then
+    return version if version is not None else _new_version()
+
+
+def _changed_key(group):
+    return f"{KEY_PREFIX}:{group}:changed"
+
+
+def invalidate(group):
+    """Drop every cached entry of ``group`` by moving it to a new version."""
+    try:
+        cache.incr(_version_key(group))
+    except ValueError:
+        cache.set(_version_key(group), _new_version(), timeout=None)
+    # Marks the window in which the replica may not have this change yet
+    cache.set(_changed_key(group), 1, replica_lag_seconds())
+
+
+def _count(group, outcome):
+    key = f"{KEY_PREFIX}:stats:{group}:{outcome}"
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def read_through(group, name, loader):
+    """Return the cached value for ``name`` in ``group``, loading it on a miss."""
+    key = f"{KEY_PREFIX}:{group}:v{group_version(group)}:{name}"
+    sentinel = object()
+    value = cache.get(key, sentinel)
+    if value is not sentinel:
+        _count(group, "hits")
+        return value
+
+    _count(group, "misses")
+    value = loader()
+    cache.set(key, value, TIMEOUT)
+    return value
+
+
+def stats():
+    """Hit/miss counters and current version per group."""
+    data = {}
+    for group in GROUPS:
+        counters = cache.get_many([f"{KEY_PREFIX}:stats:{group}:hits", f"{KEY_PREFIX}:stats:{group}:misses"])
+        hits = counters.get(f"{KEY_PREFIX}:stats:{group}:hits", 0)
+        misses = counters.get(f"{KEY_PREFIX}:stats:{group}:misses", 0)
+        total = hits + misses
+        data[group] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 3) if total else None,
+            "version": group_version(group),
+        }
+    return data
+
+
+def reset_stats():
+    cache.delete_many([f"{KEY_PREFIX}:stats:{group}:{outcome}" for group in GROUPS for outcome in ("hits", "misses")])
+
+
+# ---------- Versioned payloads ----------
+
+def versioned_payload(group, name, builder):
+    """
+    Return the payload cached under ``name`` while ``group``'s data version is
+    unchanged and the entry is younger than DASHBOARD_CACHE_MAX_AGE seconds.
+
+    With DASHBOARD_STALE_WHILE_REVALIDATE on, an outdated entry is served as
+    is while a single background thread rebuilds it; otherwise the caller
+    rebuilds inline.
+    """
+    key = f"{KEY_PREFIX}:{group}:payload:{name}"
+    max_age = getattr(settings, "DASHBOARD_CACHE_MAX_AGE", 60)
+    version = group_version(group)
+    entry = cache.get(key)
+
+    if entry and entry["version"] == version and time.time() - entry["computed_at"] < max_age:
+        _count(group, "hits")
+        return entry["payload"]
+
+    _count(group, "misses")
+    if entry and getattr(settings, "DASHBOARD_STALE_WHILE_REVALIDATE", False):
+        if cache.add(f"{key}:refreshing", 1, timeout=30):
+            threading.Thread(target=_refresh_payload, args=(group, key, builder), daemon=True).start()
+        return entry["payload"]
+
+    return _store_payload(group, key, builder)
+
+
+def _store_payload(group, key, builder):
+    # Read the version before building so a write during the build
+    # leaves the entry outdated rather than silently current.
+    version = group_version(group)
+    changed_recently = cache.get(_changed_key(group)) is not None
+    payload = builder()
+    # A replica that has not replayed the latest change yet would have its
+    # old figures stored as current until the next write; serve them once.
+    if not (changed_recently and reading_replica()):
+        cache.set(key, {"version": version, "computed_at": time.time(), "payload": payload}, timeout=None)
+    return payload
+
+
+def _refresh_payload(group, key, builder):
+    try:
+        _store_payload(group, key, builder)
+    finally:
+        cache.delete(f"{key}:refreshing")
+        connection.close()
+
+
+# ---------- Helpers ----------
+
+def get_categories():
+    """All categories as dicts (id, name, description), newest first."""
+    return read_through(
+        "categories", "all",
+        lambda: list(Category.objects.order_by("-id").values("id", "name", "description")),
+    )
+
+
+def get_variant_pricing(variant_id):
+    """Price/GST figures for one variant, or None if it does not exist."""
+    def load():
+        return (
+            ProductVariant.objects.filter(id=variant_id)
+            .values("id", "product_id", "product__name", "size", "price", "discount", "gst", "total_price")
+            .first()
+        )
+    return read_through("variants", str(variant_id), load)
+
+
+def get_role_name(user):
+    """Name of the user's role, or None for users without one."""
+    if not getattr(user, "is_authenticated", False):
+        return None
+    return read_through(
+        "roles", str(user.pk),
+        lambda: UserAccount.objects.filter(pk=user.pk).values_list("role__name", flat=True).first(),
+    )
@@ -0,0 +1,57 @@
+"""
+Columnar list responses built from ``values_list()``.
+
+With ``?format=columnar`` a list endpoint can skip model instances and
+serializers entirely: rows come back from the database as tuples and are
+returned as ``{"columns": [...], "rows": [[...]]}``, rendered by
+inventory_app.renderers.ColumnarJSONRenderer.
+"""
+from django.core.files.storage import default_storage
+from rest_framework.response import Response
+
+
+def wants_columnar(request):
+    return request.query_params.get("format") == "columnar"
+
+
+def _rows(values, transforms):
+    if not transforms:
+        return [list(row) for row in values]
+    return [[transform(value) if transform else value for transform, value in zip(transforms, row)] for row in values]
+
+
+def columnar_response(request, queryset, columns, paginator=None, view=None, transforms=None):
+    """
+    ``columns`` is a sequence of ``(name, lookup)`` pairs; lookups may name
+    fields, related fields or annotations on ``queryset``. ``transforms`` maps
+    a column name to a callable applied to each of its values.
+    """
+    names = [name for name, _ in columns]
+    values = queryset.values_list(*[lookup for _, lookup in columns])
+    per_column = [transforms.get(name) for name in names] if transforms else None
+
+    if paginator is None:
+        return Response({"columns": names, "rows": _rows(values, per_column)})
+
+    page = paginator.paginate_queryset(values, request, view=view)
+    return paginator.get_paginated_response({"columns": names, "rows": _rows(page, per_column)})
+
+
+def storage_url(name):
+    """Column transform turning a stored file name into its public URL."""
+    return default_storage.url(name) if name else None
+
+
+class ColumnarListMixin:
+    """Serve ``list`` from ``columnar_fields`` when ``?format=columnar`` is requested."""
+    columnar_fields = ()
+    columnar_transforms = None
+
+    def list(self, request, *args, **kwargs):
+        if not wants_columnar(request):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return columnar_response(
+            request, queryset, self.columnar_fields,
+            paginator=self.paginator, view=self, transforms=self.columnar_transforms,
+        )
@@ -0,0 +1,49 @@
+from django.conf import settings
+
+from inventory_app import caching
+
+
+# (section, path marker) for each menu entry, in menu order
+MENU_SECTIONS = (
+    ("dashboard", "/dashboard/"),
+    ("pos", "/pos/"),
+    ("category", "/category"),
+    ("product", "/product"),
+    ("supplier", "/supplier"),
+    ("customer", "/customer"),
+    ("purchase", "/purchase"),
+    ("inventory", "/inventory"),
+    ("sales", "/sales-list/"),
+    ("orders", "/orders-list/"),
+    ("returns", "/returns-management/"),
+    ("settings", "/settings/"),
+)
+
+
+def menu_section(request):
+    """
+    The menu entry the page belongs to ("" for none). The menu is cached by
+    it, so every URL of a section shares one fragment.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match and match.url_name == "index":
+        return "dashboard"
+    for section, marker in MENU_SECTIONS:
+        if marker in request.path:
+            return section
+    return ""
+
+
+def layout(request):
+    """
+    Values the menu and navbar fragments are cached by: the user's role (read
+    from the roles cache instead of request.user.role), the menu section, and
+    the "templates" cache version, which warm_templates bumps on every deploy
+    so fragments rendered by old templates are not served again.
+    """
+    return {
+        "user_role": caching.get_role_name(getattr(request, "user", None)),
+        "menu_section": menu_section(request),
+        "fragment_ttl": settings.TEMPLATE_FRAGMENT_TTL,
+        "fragment_version": caching.group_version("templates"),
+    }
@@ -0,0 +1,60 @@
+"""
+Calendar-date filters for timestamp columns.
+
+Filtering with ``field__date__range`` wraps the column in a date cast, which
+rules out any index on it. These helpers turn local calendar dates into aware
+datetimes in the shop's timezone (settings.SHOP_TIME_ZONE) and filter with a
+half-open ``field >= start AND field < day after end`` range instead, which
+the database answers with an index range scan and which stays exact across
+DST changes.
+"""
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+
+def shop_timezone():
+    return ZoneInfo(getattr(settings, "SHOP_TIME_ZONE", settings.TIME_ZONE))
+
+
+def shop_today():
+    """Today's date in the shop's timezone."""
+    return timezone.localdate(timezone=shop_timezone())
+
+
+def day_start(day):
+    """Aware datetime for midnight at the start of ``day`` in the shop's timezone."""
+    return datetime.combine(day, time.min, tzinfo=shop_timezone())
+
+
+def date_bounds(start=None, end=None):
+    """
+    Half-open ``(lower, upper)`` datetime bounds covering the calendar days
+    ``start`` through ``end`` inclusive. Either side may be None (open).
+    """
+    lower = day_start(start) if start else None
+    upper = day_start(end + timedelta(days=1)) if end else None
+    return lower, upper
+
+
+def parse_date_range(start_value, end_value):
+    """Parse ``YYYY-MM-DD`` query values; missing or invalid values become None."""
+    def parse(value):
+        try:
+            return parse_date(value or "")
+        except ValueError:
+            return None
+    return parse(start_value), parse(end_value)
+
+
+def filter_date_range(queryset, field, start=None, end=None):
+    """Restrict the timestamp ``field`` of ``queryset`` to the calendar days ``start``..``end``."""
+    lower, upper = date_bounds(start, end)
+    if lower is not None:
+        queryset = queryset.filter(**{f"{field}__gte": lower})
+    if upper is not None:
+        queryset = queryset.filter(**{f"{field}__lt": upper})
+    return queryset
@@ -0,0 +1,98 @@
+"""
+Export backends.
+
+PDF and spreadsheet libraries (xhtml2pdf, wkhtmltopdf via pdfkit, openpyxl,
+reportlab underneath) take a noticeable share of worker start-up to import,
+while exports are rare. Backends are therefore registered by dotted path and
+imported on first use; importing this package, or any view that renders
+exports, loads none of them.
+
+    get_backend("pisa").render(html)          # -> PDF bytes
+    get_backend("xlsx").workbook()            # -> openpyxl Workbook
+
+Tabular statements are described once as a ``Statement`` and written by any
+PDF backend with ``write_statement(statement, stream)``: the HTML backends
+render its template first, while "statement" draws the rows straight onto
+reportlab pages. Which backend an export uses comes from EXPORT_RENDERERS,
+or from a ``?renderer=`` query parameter (see ``statement_response``).
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+
+BACKENDS = {
+    "pisa": "inventory_app.exports.html_pdf.PisaBackend",
+    "wkhtmltopdf": "inventory_app.exports.html_pdf.WkhtmltopdfBackend",
+    "statement": "inventory_app.exports.statement_pdf.StatementBackend",
+    "receipt": "inventory_app.exports.receipt_pdf.ReceiptBackend",
+    "xlsx": "inventory_app.exports.excel.XlsxBackend",
+}
+PDF_BACKENDS = ("statement", "pisa", "wkhtmltopdf")
+
+STATEMENT_TEMPLATE = "pdf_templates/statement.html"
+
+
+class ExportError(Exception):
+    """A backend could not produce the document."""
+
+
+class Statement:
+    """
+    A tabular PDF document.
+
+    ``columns`` is a sequence of ``(label, width, align)`` with relative
+    widths and ``"left"``/``"right"`` alignment; ``rows`` is any iterable of
+    tuples of display strings and is consumed once. ``lines`` are printed
+    under the title and ``totals`` after the table; totals are read only
+    after the rows, so they may be a generator over sums taken while the rows
+    streamed. HTML backends render ``template`` with ``context`` (by default
+    a generic table of the same data).
+    """
+
+    def __init__(self, title, columns, rows, lines=(), totals=(), template=None, context=None):
+        self.title = title
+        self.columns = columns
+        self.rows = rows
+        self.lines = lines
+        self.totals = totals
+        self.template = template or STATEMENT_TEMPLATE
+        self.context = context if context is not None else {"statement": self}
+
+
+def register(name, path):
+    """Add or replace the backend ``name`` with the class at dotted ``path``."""
+    BACKENDS[name] = path
+    get_backend.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def get_backend(name):
+    """Instance of the backend ``name``, importing its module on the first call."""
+    try:
+        path = BACKENDS[name]
+    except KeyError:
+        raise ExportError(f"Unknown export backend {name!r}; available: {', '.join(BACKENDS)}")
+    return import_string(path)()
+
+
+def renderer_for(request, export):
+    """PDF backend name for ``export``: ``?renderer=`` if valid, else EXPORT_RENDERERS, else EXPORT_PDF_BACKEND."""
+    requested = request.GET.get("renderer")
+    if requested in PDF_BACKENDS:
+        return requested
+    return getattr(settings, "EXPORT_RENDERERS", {}).get(export, settings.EXPORT_PDF_BACKEND)
+
+
+def statement_response(request, export, statement, disposition):
+    """HttpResponse with ``statement`` written as a PDF by the export's backend."""
+    backend = get_backend(renderer_for(request, export))
+    response = HttpResponse(content_type=backend.content_type)
+    response["Content-Disposition"] = disposition
+    try:
+        backend.write_statement(statement, response)
+    except ExportError as exc:
+        return HttpResponse(f"We had some errors <pre>{escape(exc)}</pre>")
+    return response
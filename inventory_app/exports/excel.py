@@ -0,0 +1,9 @@
+"""Spreadsheet backend. Imported lazily through inventory_app.exports.get_backend."""
+from openpyxl import Workbook
+
+
+class XlsxBackend:
+    content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+    def workbook(self):
+        return Workbook()
@@ -0,0 +1,44 @@
+"""HTML-to-PDF backends. Imported lazily through inventory_app.exports.get_backend."""
+import io
+from abc import ABC, abstractmethod
+
+import pdfkit
+from django.conf import settings
+from django.template.loader import render_to_string
+from xhtml2pdf import pisa
+
+from inventory_app.exports import ExportError
+
+
+class HtmlPdfBackend(ABC):
+    content_type = "application/pdf"
+
+    @abstractmethod
+    def render(self, html):
+        """PDF bytes for the HTML document ``html``."""
+
+    def write_statement(self, statement, stream):
+        stream.write(self.render(render_to_string(statement.template, statement.context)))
+
+
+class PisaBackend(HtmlPdfBackend):
+    def render(self, html):
+        result = io.BytesIO()
+        status = pisa.CreatePDF(html, dest=result)
+        if status.err:
+            raise ExportError(f"xhtml2pdf reported {status.err} error(s)")
+        return result.getvalue()
+
+
+class WkhtmltopdfBackend(HtmlPdfBackend):
+    """Needs the wkhtmltopdf binary; WKHTMLTOPDF_PATH points at it when it is not on PATH."""
+
+    def __init__(self):
+        path = getattr(settings, "WKHTMLTOPDF_PATH", "")
+        self.configuration = pdfkit.configuration(wkhtmltopdf=path) if path else None
+
+    def render(self, html):
+        try:
+            return pdfkit.from_string(html, False, configuration=self.configuration)
+        except (IOError, OSError) as exc:
+            raise ExportError(str(exc))
@@ -0,0 +1,44 @@
+"""
+Narrow PDF receipts for 58/80 mm thermal rolls.
+
+The page is as wide as the roll and as tall as the receipt, with the lines
+laid out by inventory_app.receipts drawn in a monospaced font sized so the
+paper's column count fills the printable width. Imported lazily through
+inventory_app.exports.get_backend.
+"""
+from io import BytesIO
+
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+FONT, BOLD_FONT = "Courier", "Courier-Bold"
+# Printable width of each roll; thermal heads leave a few mm unprinted
+PRINTABLE_WIDTH = {58: 48 * mm, 80: 72 * mm}
+LINE_SPACING = 1.2
+
+
+class ReceiptBackend:
+    content_type = "application/pdf"
+
+    def render_receipt(self, lines, paper, columns):
+        """PDF bytes of ``(text, align, bold)`` ``lines`` on a ``paper`` mm wide roll."""
+        printable = PRINTABLE_WIDTH[paper]
+        margin = (paper * mm - printable) / 2
+        font_size = printable / stringWidth("0" * columns, FONT, 1)
+        leading = font_size * LINE_SPACING
+        width, height = paper * mm, len(lines) * leading + 2 * margin
+
+        output = BytesIO()
+        pdf = canvas.Canvas(output, pagesize=(width, height), pageCompression=1)
+        y = height - margin
+        for text, align, bold in lines:
+            y -= leading
+            pdf.setFont(BOLD_FONT if bold else FONT, font_size)
+            if align == "center":
+                pdf.drawCentredString(width / 2, y, text)
+            else:
+                pdf.drawString(margin, y, text)
+        pdf.showPage()
+        pdf.save()
+        return output.getvalue()
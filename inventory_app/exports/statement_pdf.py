@@ -0,0 +1,125 @@
+"""
+Direct reportlab backend for tabular statements.
+
+Rows are drawn onto the canvas as they come out of ``statement.rows`` and
+each full page is closed with ``showPage()``, so neither an HTML document
+nor a platypus table of the whole statement is ever built; a 5k-row
+statement costs little more than the text it prints. Cells wrap to their
+column width. Imported lazily through inventory_app.exports.get_backend.
+"""
+from django.conf import settings
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+MARGIN = 1 * cm
+FONT_SIZE = 8
+LEADING = 10
+PADDING = 3
+HEADER_FILL = 0.94
+
+
+class StatementBackend:
+    content_type = "application/pdf"
+
+    def __init__(self):
+        # Built-in Helvetica covers Latin-1 only; STATEMENT_FONT can point at
+        # a TTF (e.g. DejaVuSans.ttf) for other scripts.
+        self.font, self.bold_font = "Helvetica", "Helvetica-Bold"
+        font_path = getattr(settings, "STATEMENT_FONT", "")
+        if font_path:
+            pdfmetrics.registerFont(TTFont("StatementFont", font_path))
+            self.font = self.bold_font = "StatementFont"
+
+    def write_statement(self, statement, stream):
+        # Backends are shared between requests; page state lives in the writer
+        _StatementWriter(statement, stream, self.font, self.bold_font).write()
+
+
+class _StatementWriter:
+    def __init__(self, statement, stream, font, bold_font):
+        self.statement = statement
+        self.font, self.bold_font = font, bold_font
+        self.page_width, self.page_height = A4
+        self.pdf = canvas.Canvas(stream, pagesize=A4, pageCompression=1)
+        self.pdf.setTitle(statement.title)
+        weights = [column[1] for column in statement.columns]
+        usable = self.page_width - 2 * MARGIN
+        self.widths = [usable * weight / sum(weights) for weight in weights]
+        self.page = 1
+
+    def write(self):
+        pdf = self.pdf
+        y = self.draw_header(self.draw_title(self.page_height - MARGIN))
+        for row in self.statement.rows:
+            cells = [
+                simpleSplit(str(value), self.font, FONT_SIZE, width - 2 * PADDING) or [""]
+                for value, width in zip(row, self.widths)
+            ]
+            height = max(len(lines) for lines in cells) * LEADING + 2 * PADDING
+            if y - height < MARGIN + LEADING:
+                y = self.draw_header(self.new_page())
+            self.draw_row(cells, y, height)
+            y -= height
+
+        for line in self.statement.totals:
+            if y - LEADING * 2 < MARGIN:
+                y = self.new_page()
+            y -= LEADING * 2
+            pdf.setFont(self.bold_font, FONT_SIZE + 2)
+            pdf.drawRightString(self.page_width - MARGIN, y, line)
+
+        self.draw_page_number()
+        pdf.save()
+
+    def new_page(self):
+        self.draw_page_number()
+        self.pdf.showPage()
+        self.page += 1
+        return self.page_height - MARGIN
+
+    def draw_page_number(self):
+        self.pdf.setFont(self.font, FONT_SIZE - 1)
+        self.pdf.drawRightString(self.page_width - MARGIN, MARGIN / 2, f"Page {self.page}")
+
+    def draw_title(self, y):
+        pdf, center = self.pdf, self.page_width / 2
+        pdf.setFont(self.bold_font, 16)
+        y -= 16
+        pdf.drawCentredString(center, y, self.statement.title)
+        pdf.setFont(self.font, FONT_SIZE + 2)
+        for line in self.statement.lines:
+            y -= LEADING + 3
+            pdf.drawCentredString(center, y, line)
+        return y - LEADING
+
+    def draw_header(self, y):
+        pdf = self.pdf
+        height = LEADING + 2 * PADDING
+        pdf.setFillGray(HEADER_FILL)
+        pdf.rect(MARGIN, y - height, sum(self.widths), height, stroke=1, fill=1)
+        pdf.setFillGray(0)
+        pdf.setFont(self.bold_font, FONT_SIZE)
+        x = MARGIN
+        for (label, _weight, _align), width in zip(self.statement.columns, self.widths):
+            pdf.drawString(x + PADDING, y - PADDING - FONT_SIZE, label)
+            x += width
+        return y - height
+
+    def draw_row(self, cells, y, height):
+        pdf = self.pdf
+        pdf.setFont(self.font, FONT_SIZE)
+        x = MARGIN
+        for (_label, _weight, align), width, lines in zip(self.statement.columns, self.widths, cells):
+            pdf.rect(x, y - height, width, height, stroke=1, fill=0)
+            text_y = y - PADDING - FONT_SIZE
+            for line in lines:
+                if align == "right":
+                    pdf.drawRightString(x + width - PADDING, text_y, line)
+                else:
+                    pdf.drawString(x + PADDING, text_y, line)
+                text_y -= LEADING
+            x += width
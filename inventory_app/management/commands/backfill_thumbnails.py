@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from inventory_app.models import Product
+from inventory_app.thumbnails import is_rendered, render_thumbnails
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the thumbnail sizes of existing product photos that do not "
+        "have them yet (all of them with --force)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Re-render thumbnails that already exist.")
+
+    def handle(self, *args, **options):
+        products = (
+            Product.objects.exclude(photo="").exclude(photo__isnull=True)
+            .order_by("id").values_list("id", "thumbnails")
+        )
+        started = time.perf_counter()
+        rendered = failed = 0
+        for product_id, thumbnails in products.iterator():
+            if not options["force"] and is_rendered(thumbnails):
+                continue
+            try:
+                render_thumbnails(product_id)
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"product {product_id}: {exc}")
+            else:
+                rendered += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered thumbnails for {rendered} products in {time.perf_counter() - started:.1f}s"
+            + (f" ({failed} failed)" if failed else "")
+        ))
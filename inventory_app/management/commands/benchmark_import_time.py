@@ -0,0 +1,65 @@
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Start-up of a worker: configure Django, then load the whole URLconf
+STARTUP = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+HEAVY_PACKAGES = ("openpyxl", "xhtml2pdf", "pdfkit", "reportlab", "weasyprint", "pandas", "PIL")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker start-up imports with `python -X importtime`: total "
+        "time for django.setup() plus URLconf loading, the slowest top-level "
+        "packages, and which heavy export libraries were loaded. Each run is "
+        "a fresh interpreter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters to run; the fastest counts.")
+        parser.add_argument("--top", type=int, default=15, help="Slowest top-level packages to list.")
+
+    def run_once(self):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP],
+            capture_output=True, text=True,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE},
+        )
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+
+        packages, imported = {}, set()
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_RE.match(line)
+            if not match:
+                continue
+            cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+            top = name.split(".")[0]
+            # Heavy libraries usually load nested under inventory_app, not at the top level
+            imported.add(top)
+            if len(indent) == 1:
+                packages[top] = packages.get(top, 0) + cumulative
+        return packages, imported
+
+    def handle(self, *args, **options):
+        runs = [self.run_once() for _ in range(max(options["repeat"], 1))]
+        best, imported = min(runs, key=lambda run: sum(run[0].values()))
+        total = sum(best.values())
+
+        self.stdout.write(f"django.setup() + URLconf imports: {total / 1000:.1f} ms (best of {len(runs)})")
+        for name, micros in sorted(best.items(), key=lambda item: -item[1])[:options["top"]]:
+            self.stdout.write(f"  {name:<28}{micros / 1000:8.1f} ms")
+
+        loaded = [name for name in HEAVY_PACKAGES if name in imported]
+        if loaded:
+            self.stdout.write(self.style.WARNING(f"Heavy libraries loaded at start-up: {', '.join(loaded)}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("No heavy export libraries loaded at start-up."))
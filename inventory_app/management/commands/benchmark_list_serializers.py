@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from inventory_app.models import Customer, Inventory, Product, Purchase
+from inventory_app.projections import (
+    CustomerProjection, InventoryProjection, ProductProjection, PurchaseProjection,
+)
+from inventory_app.serializers import (
+    CustomerSerializer, InventorySerializer, ProductSerializer, PurchaseSerializer,
+)
+
+ENDPOINTS = {
+    "inventory": (Inventory.objects.order_by("-id"), InventorySerializer, InventoryProjection),
+    "purchases": (Purchase.objects.order_by("-date", "-id"), PurchaseSerializer, PurchaseProjection),
+    "products": (Product.objects.prefetch_related("variants").order_by("-id"), ProductSerializer, ProductProjection),
+    "customers": (Customer.objects.order_by("-id"), CustomerSerializer, CustomerProjection),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the ModelSerializer and values() projection paths used by the "
+        "list endpoints: time per page, queries per page and whether both "
+        "produce the same payload."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100, help="Rows per page.")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per path.")
+        parser.add_argument("endpoints", nargs="*",
+                            help=f"Endpoints to benchmark: {', '.join(ENDPOINTS)} (default: all).")
+
+    def _measure(self, build, repeat):
+        with CaptureQueriesContext(connection) as ctx:
+            payload = build()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            build()
+        elapsed = (time.perf_counter() - started) / repeat
+        return payload, elapsed * 1000, len(ctx.captured_queries)
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        names = options["endpoints"] or list(ENDPOINTS)
+        unknown = set(names) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f"Unknown endpoint(s): {', '.join(sorted(unknown))}")
+
+        self.stdout.write(f"{'endpoint':<12}{'path':<12}{'ms/page':>10}{'queries':>10}")
+        for name in names:
+            queryset, serializer_class, projection_class = ENDPOINTS[name]
+
+            def serialized():
+                return serializer_class(list(queryset.all()[:rows]), many=True).data
+
+            def projected():
+                projection = projection_class()
+                return projection.convert(list(projection.values(queryset.all())[:rows]))
+
+            expected, serializer_ms, serializer_queries = self._measure(serialized, repeat)
+            actual, projection_ms, projection_queries = self._measure(projected, repeat)
+
+            self.stdout.write(f"{name:<12}{'serializer':<12}{serializer_ms:>10.2f}{serializer_queries:>10}")
+            self.stdout.write(f"{'':<12}{'projection':<12}{projection_ms:>10.2f}{projection_queries:>10}")
+
+            if [dict(item) for item in expected] != actual:
+                self.stdout.write(self.style.WARNING(f"  {name}: payloads differ"))
+            elif projection_ms:
+                self.stdout.write(self.style.SUCCESS(f"  {name}: identical, {serializer_ms / projection_ms:.1f}x faster"))
@@ -0,0 +1,68 @@
+import io
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory_app.exports import PDF_BACKENDS, ExportError, Statement, get_backend
+from inventory_app.statements import SUPPLIER_PURCHASE_COLUMNS, money
+
+
+def synthetic_rows(count):
+    start = date(2025, 1, 1)
+    for n in range(count):
+        quantity = n % 40 + 1
+        price = 100 + n % 900
+        yield (
+            (start + timedelta(days=n % 365)).strftime("%d/%m/%Y"), f"Product {n % 300} - Size {n % 7}",
+            quantity, money(price), money(price * 0.05), "18.00", money(price * quantity * 1.13),
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        "Render a synthetic supplier statement with each PDF backend and "
+        "report wall time, peak Python memory and output size. Every backend "
+        "gets the same rows through the generic statement layout."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000, help="Statement rows.")
+        parser.add_argument("backends", nargs="*", help="Backends to run (default: statement pisa).")
+
+    def handle(self, *args, **options):
+        names = options["backends"] or ["statement", "pisa"]
+        unknown = [name for name in names if name not in PDF_BACKENDS]
+        if unknown:
+            raise CommandError(f"Unknown PDF backend(s): {', '.join(unknown)}")
+
+        self.stdout.write(f"{options['rows']} rows")
+        for name in names:
+            try:
+                backend = get_backend(name)
+            except (ImportError, OSError, ExportError) as exc:
+                self.stdout.write(self.style.WARNING(f"{name:<12} unavailable: {exc}"))
+                continue
+
+            statement = Statement(
+                "Supplier Purchases Report", SUPPLIER_PURCHASE_COLUMNS, synthetic_rows(options["rows"]),
+                lines=["Supplier: Benchmark"], totals=["Grand Total: Rs. 0.00"],
+            )
+            output = io.BytesIO()
+            tracemalloc.start()
+            started = time.perf_counter()
+            try:
+                backend.write_statement(statement, output)
+            except ExportError as exc:
+                tracemalloc.stop()
+                self.stdout.write(self.style.ERROR(f"{name:<12} failed: {exc}"))
+                continue
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            self.stdout.write(
+                f"{name:<12} {elapsed:8.2f} s   peak {peak / 2**20:7.1f} MiB   "
+                f"{len(output.getvalue()) / 1024:8.0f} KiB"
+            )
@@ -0,0 +1,99 @@
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from inventory_app.models import Inventory, LoginRecord, Order, OrderReturn, Purchase, Sale
+
+
+def key_queries():
+    """The filter/ordering shapes used by the views, keyed by a short name."""
+    now = timezone.now()
+    month_ago = now - timedelta(days=30)
+    return {
+        "orders by status": Order.objects.filter(status="pending").order_by("-order_date").values("id")[:10],
+        "orders since date": Order.objects.filter(order_date__gte=month_ago).values("id"),
+        "customer orders": Order.objects.filter(customer_id=1).order_by("-order_date").values("id"),
+        "sales list": Sale.objects.order_by("-sale_date").values("id")[:10],
+        "sales in range": Sale.objects.filter(sale_date__gte=month_ago, sale_date__lt=now).values("id"),
+        "purchases list": Purchase.objects.order_by("-date", "-id").values("id")[:10],
+        "supplier purchases": Purchase.objects.filter(supplier_id=1).order_by("-date").values("id"),
+        "low stock": Inventory.objects.filter(quantity__lt=5).values("id"),
+        "in stock": Inventory.objects.filter(quantity__gt=0).values("id"),
+        "returns by status": OrderReturn.objects.filter(status="pending").order_by("-return_date").values("id")[:10],
+        "open returns of order": OrderReturn.objects.filter(
+            original_order_id=1, status__in=["pending", "approved"]
+        ).values("id"),
+        "recent logins": LoginRecord.objects.filter(login_time__gte=month_ago).values("id"),
+        "user logins": LoginRecord.objects.filter(user_id=1).order_by("-login_time").values("id")[:10],
+    }
+
+
+def _sqlite_scans(cursor, sql, params):
+    cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+    plan = [row[-1] for row in cursor.fetchall()]
+    scans = [
+        detail for detail in plan
+        if detail.startswith("SCAN") and "USING" not in detail
+    ]
+    return plan, scans
+
+
+def _postgres_scans(cursor, sql, params):
+    # Small tables make Seq Scan the cheapest plan anyway, so ask whether
+    # an index path exists at all rather than which one the planner prefers.
+    cursor.execute("SET LOCAL enable_seqscan = off")
+    cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+    root = cursor.fetchone()[0]
+    if isinstance(root, str):
+        root = json.loads(root)
+
+    plan, scans = [], []
+    stack = [root[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        label = f"{node['Node Type']} {node.get('Relation Name', '')}".strip()
+        plan.append(label)
+        if node["Node Type"] == "Seq Scan":
+            scans.append(label)
+        stack.extend(node.get("Plans", []))
+    return plan, scans
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN over the key list/report queries and fail if any of them "
+        "falls back to a full table scan. Supports SQLite and PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose-plan", action="store_true", help="Print the full plan of every query.")
+
+    def handle(self, *args, **options):
+        if connection.vendor == "sqlite":
+            explain = _sqlite_scans
+        elif connection.vendor == "postgresql":
+            explain = _postgres_scans
+        else:
+            raise CommandError(f"EXPLAIN checks are not implemented for {connection.vendor}.")
+
+        failures = []
+        for name, queryset in key_queries().items():
+            sql, params = queryset.query.sql_with_params()
+            with transaction.atomic(), connection.cursor() as cursor:
+                plan, scans = explain(cursor, sql, params)
+
+            if scans:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"{name}: full scan ({'; '.join(scans)})"))
+            else:
+                self.stdout.write(f"{name}: ok")
+            if options["verbose_plan"]:
+                for line in plan:
+                    self.stdout.write(f"    {line}")
+
+        if failures:
+            raise CommandError(f"{len(failures)} queries fall back to full table scans: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All key queries use an index."))
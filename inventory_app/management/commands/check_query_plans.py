@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from inventory_app.models import UserAccount
+from inventory_app.urls import router
+
+
+def _restricted(viewset, limit):
+    """Subclass of ``viewset`` whose queryset only holds its first ``limit`` rows."""
+    class Restricted(viewset):
+        def get_queryset(self):
+            queryset = super().get_queryset()
+            pks = list(queryset.model._default_manager.order_by("pk").values_list("pk", flat=True)[:limit])
+            return queryset.filter(pk__in=pks)
+
+    Restricted.__name__ = viewset.__name__
+    return Restricted
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the list action of every registered viewset over 1 row and over "
+        "--rows rows and fail if the number of queries grows with the row count."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20, help="Rows in the larger run.")
+
+    def _count_queries(self, prefix, viewset, basename, user, limit):
+        view = _restricted(viewset, limit).as_view({"get": "list"}, basename=basename)
+        request = APIRequestFactory().get(f"/admin_api/{prefix}/", {"page_size": limit})
+        force_authenticate(request, user=user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = view(request)
+        if response.status_code >= 400:
+            raise CommandError(f"{prefix}: list returned HTTP {response.status_code}")
+        return len(ctx.captured_queries)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        user = UserAccount.objects.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError("A superuser is needed to call the API views.")
+
+        failures = []
+        self.stdout.write(f"{'viewset':<32}{'1 row':>8}{f'{rows} rows':>10}")
+        for prefix, viewset, basename in router.registry:
+            model = viewset.queryset.model
+            if model._default_manager.count() < 2:
+                self.stdout.write(f"{viewset.__name__:<32}{'skipped, not enough rows':>18}")
+                continue
+
+            # Warm caches (reference data, ETag versions) so both runs see the same state
+            self._count_queries(prefix, viewset, basename, user, rows)
+            single = self._count_queries(prefix, viewset, basename, user, 1)
+            many = self._count_queries(prefix, viewset, basename, user, rows)
+
+            line = f"{viewset.__name__:<32}{single:>8}{many:>10}"
+            if many > single:
+                failures.append(viewset.__name__)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+
+        if failures:
+            raise CommandError(f"Query count grows with row count for: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("Query counts are flat for every viewset."))
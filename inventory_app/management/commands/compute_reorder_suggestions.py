@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from inventory_app.reorder import REVIEW_PERIOD_DAYS, VELOCITY_WINDOW_DAYS, compute_reorder_suggestions
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute reorder points and suggested quantities for all variants. "
+        "Meant to run nightly, e.g. from cron: "
+        "`0 2 * * * python manage.py compute_reorder_suggestions`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--window", type=int, default=VELOCITY_WINDOW_DAYS,
+                            help="Days of sales the velocity is averaged over.")
+        parser.add_argument("--review-days", type=int, default=REVIEW_PERIOD_DAYS,
+                            help="Days of demand to cover beyond the reorder point.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = compute_reorder_suggestions(
+            window_days=options["window"],
+            review_days=options["review_days"],
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Computed reorder suggestions for {count} variants in {elapsed:.2f}s"
+        ))
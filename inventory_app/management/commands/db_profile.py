@@ -0,0 +1,74 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections, transaction
+
+BENCH_TABLE = "db_profile_bench"
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the active database profile (persistent connections, pool, SQLite "
+        "pragmas) and optionally measure concurrent write throughput with "
+        "--bench, using a scratch table that is dropped afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bench", action="store_true", help="Run the concurrent write benchmark.")
+        parser.add_argument("--threads", type=int, default=8, help="Concurrent writers.")
+        parser.add_argument("--writes", type=int, default=200, help="Transactions per writer.")
+
+    def handle(self, *args, **options):
+        db = settings.DATABASES["default"]
+        self.stdout.write(f"engine:             {db['ENGINE']}")
+        self.stdout.write(f"CONN_MAX_AGE:       {db.get('CONN_MAX_AGE', 0)}")
+        self.stdout.write(f"CONN_HEALTH_CHECKS: {db.get('CONN_HEALTH_CHECKS', False)}")
+        pool = db.get("OPTIONS", {}).get("pool")
+        if pool:
+            self.stdout.write(f"pool:               {pool}")
+
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                for pragma in ("journal_mode", "synchronous", "busy_timeout", "foreign_keys"):
+                    cursor.execute(f"PRAGMA {pragma}")
+                    self.stdout.write(f"{pragma + ':':<20}{cursor.fetchone()[0]}")
+
+        if options["bench"]:
+            self.bench(options["threads"], options["writes"])
+
+    def bench(self, threads, writes):
+        id_column = "id INTEGER PRIMARY KEY" if connection.vendor == "sqlite" else "id SERIAL PRIMARY KEY"
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {BENCH_TABLE} ({id_column}, worker INTEGER, n INTEGER)")
+
+        errors = []
+
+        def writer(worker):
+            try:
+                for n in range(writes):
+                    try:
+                        with transaction.atomic(), connection.cursor() as cursor:
+                            cursor.execute(f"INSERT INTO {BENCH_TABLE} (worker, n) VALUES (%s, %s)", [worker, n])
+                    except OperationalError as exc:
+                        errors.append(str(exc))
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        workers = [threading.Thread(target=writer, args=(i,)) for i in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE {BENCH_TABLE}")
+
+        total = threads * writes - len(errors)
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} writes from {threads} threads in {elapsed:.2f}s "
+            f"({total / elapsed:.0f} writes/s, {len(errors)} lock errors)"
+        ))
@@ -0,0 +1,57 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from inventory_app.exports import PDF_BACKENDS
+from inventory_app.statement_batch import build_statement_archive, select_customers
+
+
+class Command(BaseCommand):
+    help = (
+        "Render customer-orders statements for every customer with a pending "
+        "amount (or all / selected customers) in a process pool and write "
+        "them into one zip archive, reporting progress as they finish."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Include customers with nothing pending.")
+        parser.add_argument("--customer", type=int, action="append", dest="customers",
+                            help="Only this customer id (repeatable).")
+        parser.add_argument("--start-date", help="YYYY-MM-DD; needs --end-date.")
+        parser.add_argument("--end-date", help="YYYY-MM-DD; needs --start-date.")
+        parser.add_argument("--renderer", help=f"PDF backend: {', '.join(PDF_BACKENDS)}.")
+        parser.add_argument("--workers", type=int, help="Worker processes (default: all cores).")
+        parser.add_argument("--output", help="Zip path (default: statements_<date>.zip).")
+
+    def handle(self, *args, **options):
+        if options["renderer"] and options["renderer"] not in PDF_BACKENDS:
+            raise CommandError(f"Unknown renderer {options['renderer']!r}.")
+        if bool(options["start_date"]) != bool(options["end_date"]):
+            raise CommandError("--start-date and --end-date go together.")
+
+        customers = select_customers(not options["all"], options["customers"])
+        if not customers:
+            raise CommandError("No customers match.")
+        output = options["output"] or f"statements_{timezone.localdate():%Y-%m-%d}.zip"
+
+        started = time.perf_counter()
+        step = max(len(customers) // 100, 1)
+
+        def progress(done, total, failed):
+            if done == total or done % step == 0:
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f"{done}/{total} ({done * 100 // total}%), {failed} failed, {elapsed:.0f}s")
+
+        written, failures = build_statement_archive(
+            output, customers, options["start_date"], options["end_date"], options["renderer"],
+            workers=options["workers"], progress=progress,
+        )
+        for customer_id, error in failures:
+            self.stderr.write(f"customer {customer_id}: {error}")
+
+        size = os.path.getsize(output) / 2**20
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} statements to {output} ({size:.1f} MiB) in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,48 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from inventory_app.routers import REPORTING_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database into the reporting replica file "
+        "(DB_REPORTING_NAME) with SQLite's online backup API. Run once, or "
+        "with --interval to keep the local replica in sync. PostgreSQL "
+        "replicas are kept in sync by streaming replication instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=int, default=0,
+                            help="Repeat every N seconds instead of copying once.")
+
+    def handle(self, *args, **options):
+        if REPORTING_ALIAS not in connections.databases:
+            raise CommandError("No reporting database configured; set DB_REPORTING_NAME.")
+
+        primary = connections["default"].settings_dict
+        replica = connections[REPORTING_ALIAS].settings_dict
+        if connections["default"].vendor != "sqlite":
+            raise CommandError("Only SQLite replicas are synced by this command.")
+
+        while True:
+            started = time.perf_counter()
+            self.copy(str(primary["NAME"]), str(replica["NAME"]))
+            self.stdout.write(f"Synced {replica['NAME']} in {time.perf_counter() - started:.2f}s")
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+    def copy(self, source_path, target_path):
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(target_path, timeout=30)
+        try:
+            # Readers of the replica wait on its lock during the copy rather
+            # than seeing a half-written file.
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
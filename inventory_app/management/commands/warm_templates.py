@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory_app import caching
+from inventory_app.templating import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Compile every template at deploy time so syntax errors fail the "
+        "deploy, and drop the cached menu/navbar fragments rendered by the "
+        "previous release."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-fragments", action="store_true",
+                            help="Do not invalidate cached template fragments.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        compiled, errors = warm_templates()
+        elapsed = time.perf_counter() - started
+
+        for name, message in errors:
+            self.stderr.write(f"{name}: {message}")
+        if errors:
+            raise CommandError(f"{len(errors)} template(s) failed to compile.")
+
+        if not options["keep_fragments"]:
+            caching.invalidate("templates")
+        self.stdout.write(self.style.SUCCESS(f"Compiled {compiled} templates in {elapsed:.2f}s"))
@@ -0,0 +1,174 @@
+"""
+Serving files from MEDIA_ROOT.
+
+Every response carries an ``ETag`` (a hash of the file's content, computed
+once per file version and process) and ``Last-Modified``, so browsers
+revalidate with a 304 instead of downloading the image again. The API builds
+image URLs with ``versioned_media_url``, which adds that hash as ``?v=``;
+such responses are cached as immutable for a year and plain URLs for
+MEDIA_CACHE_SECONDS.
+
+Single byte ranges (``Range: bytes=...``) get a 206. With MEDIA_SENDFILE set
+to ``x-sendfile`` (Apache/lighttpd) or ``x-accel-redirect`` (nginx) the body
+and ranges are left to the front-end server and the worker only sends headers.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+@lru_cache(maxsize=4096)
+def _content_hash(file_path, mtime_ns, size):
+    # mtime/size are part of the key so a replaced file is hashed again
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def _resolve(path):
+    try:
+        file_path = safe_join(settings.MEDIA_ROOT, path)
+    except ValueError:
+        raise Http404("File not found")
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        raise Http404("File not found")
+    if not os.path.isfile(file_path):
+        raise Http404("File not found")
+    return file_path, stat
+
+
+def content_hash(path):
+    """Short content hash of the media file ``path`` (relative to MEDIA_ROOT)."""
+    file_path, stat = _resolve(path)
+    return _content_hash(file_path, stat.st_mtime_ns, stat.st_size)
+
+
+def versioned_media_url(name):
+    """
+    Storage URL of the file ``name``. Files served from MEDIA_ROOT get their
+    content hash as ``?v=``, so browsers may cache them forever.
+    """
+    url = default_storage.url(name)
+    if not url.startswith(settings.MEDIA_URL):
+        # Stored elsewhere (e.g. Cloudinary), which serves its own cache headers
+        return url
+    try:
+        return f"{url}?v={content_hash(name)}"
+    except Http404:
+        return url
+
+
+def _parse_range(header, size):
+    """
+    ``(start, end)`` for a single ``bytes=`` range, ``None`` when the header
+    should be ignored (absent, malformed or multi-range) and ``False`` when
+    the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    value = request.headers.get("If-Range")
+    if not value:
+        return True
+    if value.startswith(('"', "W/")):
+        return value == etag
+    return parse_http_date_safe(value) == last_modified
+
+
+def _iter_range(file_path, start, length):
+    with open(file_path, "rb") as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _offload(file_path, path):
+    mode = getattr(settings, "MEDIA_SENDFILE", "")
+    if mode == "x-sendfile":
+        return {"X-Sendfile": file_path}
+    if mode == "x-accel-redirect":
+        prefix = getattr(settings, "MEDIA_ACCEL_PREFIX", "/protected-media/")
+        return {"X-Accel-Redirect": prefix.rstrip("/") + "/" + path.lstrip("/")}
+    return None
+
+
+def serve_media(request, path):
+    file_path, stat = _resolve(path)
+    size = stat.st_size
+    last_modified = int(stat.st_mtime)
+    version = _content_hash(file_path, stat.st_mtime_ns, size)
+    etag = quote_etag(version)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        content_type, encoding = mimetypes.guess_type(file_path)
+        content_type = content_type or "application/octet-stream"
+        offload = _offload(file_path, path)
+        byte_range = None
+        if offload is None and _if_range_matches(request, etag, last_modified):
+            byte_range = _parse_range(request.headers.get("Range"), size)
+
+        if offload is not None:
+            response = HttpResponse(content_type=content_type)
+            for header, value in offload.items():
+                response[header] = value
+        elif byte_range is False:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+        elif byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                _iter_range(file_path, start, length), status=206, content_type=content_type,
+            )
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            response["Content-Length"] = str(length)
+        else:
+            response = FileResponse(open(file_path, "rb"), content_type=content_type)
+        if encoding:
+            response["Content-Encoding"] = encoding
+        if offload is None:
+            response["Accept-Ranges"] = "bytes"
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    if request.GET.get("v") == version:
+        response["Cache-Control"] = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        response["Cache-Control"] = f"public, max-age={getattr(settings, 'MEDIA_CACHE_SECONDS', 86400)}"
+    return response
@@ -0,0 +1,98 @@
+import mimetypes
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from inventory_app.routers import record_write, replica_configured
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReadYourWritesMiddleware:
+    """
+    Remember that the user just changed data, so reporting views serve them
+    from the primary until the replica has caught up (see inventory_app.routers).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400 and replica_configured():
+            # DRF copies its authenticated user onto the underlying request
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                record_write(user)
+        return response
+
+
+class PrecompressedStaticMiddleware:
+    """
+    Serve files from STATIC_ROOT, preferring the ``.br``/``.gz`` variant
+    written by collectstatic (see inventory_app.staticfiles). Names listed in
+    the staticfiles manifest carry a content hash and are cached as
+    immutable; anything else is revalidated after STATIC_CACHE_SECONDS.
+    Development keeps runserver's own static handling (STATIC_SERVE=False).
+    """
+
+    encodings = ((".br", "br"), (".gz", "gzip"))
+    # Paths come from clients, so lookups (including misses) are kept in a bounded LRU
+    stat_cache_size = 4096
+
+    def __init__(self, get_response):
+        if not getattr(settings, "STATIC_SERVE", False) or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.root = str(settings.STATIC_ROOT)
+        self.hashed_names = set(getattr(staticfiles_storage, "hashed_files", {}).values())
+        self.stat = lru_cache(maxsize=self.stat_cache_size)(self._stat)
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD") and request.path_info.startswith(self.prefix):
+            response = self.serve(request, request.path_info[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def _stat(self, name):
+        # Files only change with a deploy, which restarts the workers
+        try:
+            path = safe_join(self.root, name)
+            return (path, os.stat(path)) if os.path.isfile(path) else None
+        except (SuspiciousFileOperation, ValueError, OSError):
+            return None
+
+    def serve(self, request, name):
+        found = self.stat(name)
+        if found is None:
+            return None
+        path, stat = found
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        response = get_conditional_response(request, last_modified=int(stat.st_mtime))
+        if response is None:
+            accepted = request.headers.get("Accept-Encoding", "")
+            encoding = None
+            for suffix, coding in self.encodings:
+                variant = self.stat(name + suffix)
+                if variant is not None and coding in accepted:
+                    path, encoding = variant[0], coding
+                    break
+            response = FileResponse(open(path, "rb"), content_type=content_type)
+            if encoding:
+                response["Content-Encoding"] = encoding
+        response["Last-Modified"] = http_date(int(stat.st_mtime))
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if name in self.hashed_names:
+            response["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response["Cache-Control"] = f"public, max-age={getattr(settings, 'STATIC_CACHE_SECONDS', 3600)}"
+        return response
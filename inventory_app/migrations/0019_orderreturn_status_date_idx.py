@@ -0,0 +1,19 @@
+# Generated by Django 5.0.4 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory_app", "0018_orderitem_is_return"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="orderreturn",
+            index=models.Index(
+                fields=["status", "return_date"], name="orderreturn_status_date_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 5.0.4 on 2026-10-19 10:30
+
+import django.db.models.deletion
+import django.utils.timezone
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+def open_balances(apps, schema_editor):
+    """Seed each customer's ledger with its current pending/advance position."""
+    Customer = apps.get_model("inventory_app", "Customer")
+    CustomerLedgerEntry = apps.get_model("inventory_app", "CustomerLedgerEntry")
+
+    entries = []
+    for customer in Customer.objects.all().iterator():
+        balance = (customer.pending_amount or Decimal("0.00")) - (customer.advance_payment or Decimal("0.00"))
+        if balance:
+            entries.append(
+                CustomerLedgerEntry(
+                    customer=customer,
+                    entry_type="adjustment",
+                    amount=balance,
+                    balance=balance,
+                    note="Opening balance",
+                )
+            )
+    CustomerLedgerEntry.objects.bulk_create(entries, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory_app", "0019_orderreturn_status_date_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CustomerLedgerEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "entry_type",
+                    models.CharField(
+                        choices=[
+                            ("order", "Order"),
+                            ("payment", "Payment"),
+                            ("return", "Return"),
+                            ("adjustment", "Adjustment"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("balance", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("note", models.TextField(blank=True, null=True)),
+                (
+                    "timestamp",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "customer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ledger_entries",
+                        to="inventory_app.customer",
+                    ),
+                ),
+                (
+                    "order",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="ledger_entries",
+                        to="inventory_app.order",
+                    ),
+                ),
+                (
+                    "order_return",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="ledger_entries",
+                        to="inventory_app.orderreturn",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["timestamp", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["customer", "timestamp"], name="ledger_customer_ts_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(open_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory_app", "0020_customerledgerentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="supplier",
+            name="lead_time_days",
+            field=models.PositiveIntegerField(
+                default=7, help_text="Days from order to delivery"
+            ),
+        ),
+        migrations.CreateModel(
+            name="ReorderSuggestion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("current_stock", models.IntegerField(default=0)),
+                (
+                    "avg_daily_sales",
+                    models.DecimalField(decimal_places=3, default=0, max_digits=10),
+                ),
+                ("lead_time_days", models.PositiveIntegerField(default=0)),
+                ("reorder_point", models.PositiveIntegerField(default=0)),
+                ("suggested_quantity", models.PositiveIntegerField(default=0)),
+                (
+                    "computed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "supplier",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="inventory_app.supplier",
+                    ),
+                ),
+                (
+                    "variant",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reorder_suggestion",
+                        to="inventory_app.productvariant",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["suggested_quantity"], name="reorder_suggested_qty_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory_app", "0021_supplier_lead_time_days_reordersuggestion"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["order_date"], name="order_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="orderitem",
+            index=models.Index(
+                fields=["variant", "order"], name="orderitem_variant_order_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.0.4 on 2026-10-19 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory_app", "0023_modelversion"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="loginrecord",
+            index=models.Index(fields=["login_time"], name="loginrecord_time_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="loginrecord",
+            index=models.Index(
+                fields=["user", "login_time"], name="loginrecord_user_time_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="inventory",
+            index=models.Index(fields=["quantity"], name="inventory_quantity_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="purchase",
+            index=models.Index(fields=["date", "id"], name="purchase_date_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="purchase",
+            index=models.Index(
+                fields=["supplier", "date"], name="purchase_supplier_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["status", "order_date"], name="order_status_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["customer", "order_date"], name="order_customer_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sale",
+            index=models.Index(fields=["sale_date"], name="sale_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="orderreturn",
+            index=models.Index(
+                condition=models.Q(("status__in", ["pending", "approved"])),
+                fields=["original_order"],
+                name="orderreturn_open_order_idx",
+            ),
+        ),
+    ]
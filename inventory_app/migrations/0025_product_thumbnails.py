@@ -0,0 +1,26 @@
+# Generated by Django 5.0.4 on 2026-10-19 13:10
+
+from django.db import migrations, models
+
+
+def record_sources(apps, schema_editor):
+    # Until backfill_thumbnails runs, list URLs fall back to the original photo
+    Product = apps.get_model("inventory_app", "Product")
+    for pk, photo in Product.objects.exclude(photo="").exclude(photo__isnull=True).values_list("id", "photo"):
+        Product.objects.filter(pk=pk).update(thumbnails={"source": photo})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory_app", "0024_index_plan"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="thumbnails",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.RunPython(record_sources, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+import hashlib
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from inventory_app.models import ModelVersion
+
+
+class ConditionalListMixin:
+    """
+    Answer list requests with an ETag and return 304 Not Modified when the
+    client already has the current page.
+
+    The ETag covers the ModelVersion counters of ``etag_models`` plus the full
+    request path, so a matching revalidation costs one small query and no
+    serialization.
+    """
+    etag_models = ()
+
+    def get_list_etag(self, request):
+        names = [model.__name__ for model in self.etag_models]
+        versions = ModelVersion.current(names)
+        raw = "|".join(f"{name}:{version}" for name, version in zip(names, versions))
+        digest = hashlib.md5(f"{raw}|{request.get_full_path()}".encode(), usedforsecurity=False).hexdigest()
+        return f'W/"{digest}"'
+
+    def list(self, request, *args, **kwargs):
+        etag = self.get_list_etag(request)
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")]:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().list(request, *args, **kwargs)
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+
+class QueryPlanMixin:
+    """
+    Apply per-action ``select_related``/``prefetch_related`` plans to the
+    viewset queryset so serializers that follow relations do not issue a
+    query per row.
+
+    ``query_plans`` maps an action name to a dict with ``select_related``
+    and/or ``prefetch_related`` sequences. The ``"*"`` entry applies to every
+    action and is extended by the action's own entry; write actions usually
+    only need ``"*"`` so they do not load relations they are about to change.
+    """
+    query_plans = {}
+
+    def get_query_plan(self):
+        common = self.query_plans.get("*", {})
+        specific = self.query_plans.get(getattr(self, "action", None), {})
+        return {
+            key: tuple(common.get(key, ())) + tuple(specific.get(key, ()))
+            for key in ("select_related", "prefetch_related")
+        }
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        plan = self.get_query_plan()
+        if plan["select_related"]:
+            queryset = queryset.select_related(*plan["select_related"])
+        if plan["prefetch_related"]:
+            queryset = queryset.prefetch_related(*plan["prefetch_related"])
+        return queryset
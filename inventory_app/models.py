@@ -94,15 +94,44 @@ class LoginRecord(models.Model):
     login_time = models.DateTimeField(auto_now_add=True)
     user_agent = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['login_time'], name='loginrecord_time_idx'),
+            models.Index(fields=['user', 'login_time'], name='loginrecord_user_time_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.full_name} - {self.ip_address} at {self.login_time}"
 
 
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 
 
+# ---------- MODEL VERSIONS ----------
+class ModelVersion(models.Model):
+    """
+    Per-model change counter, bumped by signals on every save/delete.
+    List endpoints derive their ETag from it (see inventory_app.mixins).
+    """
+    name = models.CharField(max_length=100, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def bump(cls, name):
+        if not cls.objects.filter(name=name).update(version=models.F('version') + 1):
+            cls.objects.get_or_create(name=name, defaults={'version': 1})
+
+    @classmethod
+    def current(cls, names):
+        versions = dict(cls.objects.filter(name__in=names).values_list('name', 'version'))
+        return [versions.get(name, 0) for name in names]
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
 # ---------- CATEGORY ----------
 class Category(models.Model):
     name = models.CharField(max_length=255, unique=True)
@@ -118,6 +147,7 @@ class Supplier(models.Model):
     phone = models.CharField(max_length=20, blank=True, null=True)
     email = models.EmailField(blank=True, null=True)
     address = models.TextField(blank=True, null=True)
+    lead_time_days = models.PositiveIntegerField(default=7, help_text="Days from order to delivery")
 
     def __str__(self):
         return self.name
@@ -138,10 +168,22 @@ class Product(models.Model):
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, related_name="products")
     name = models.CharField(max_length=255)
     photo = models.ImageField(upload_to="products/", blank=True, null=True)
+    # {"source": photo name, "<size>": thumbnail name, ...}; sizes are filled
+    # in by inventory_app.thumbnails once rendered.
+    thumbnails = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        source = self.photo.name if self.photo else None
+        if (self.thumbnails or {}).get("source") != source:
+            self.thumbnails = {"source": source} if source else {}
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "thumbnails"}
+        super().save(*args, **kwargs)
+
 
 class ProductVariant(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="variants")
@@ -173,11 +215,36 @@ class Inventory(models.Model):
 
     class Meta:
         unique_together = ('variant',)
+        indexes = [
+            # Low-stock counts and in-stock listings filter on quantity ranges
+            models.Index(fields=['quantity'], name='inventory_quantity_idx'),
+        ]
 
     def __str__(self):
         return f"{self.variant} - {self.quantity} pcs"
 
 
+# ---------- REORDER ----------
+class ReorderSuggestion(models.Model):
+    """Nightly reorder point and quantity per variant, see inventory_app.reorder."""
+    variant = models.OneToOneField(ProductVariant, on_delete=models.CASCADE, related_name="reorder_suggestion")
+    supplier = models.ForeignKey(Supplier, on_delete=models.SET_NULL, null=True, blank=True)
+    current_stock = models.IntegerField(default=0)
+    avg_daily_sales = models.DecimalField(max_digits=10, decimal_places=3, default=0)
+    lead_time_days = models.PositiveIntegerField(default=0)
+    reorder_point = models.PositiveIntegerField(default=0)
+    suggested_quantity = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['suggested_quantity'], name='reorder_suggested_qty_idx'),
+        ]
+
+    def __str__(self):
+        return f"Reorder {self.suggested_quantity} of {self.variant}"
+
+
 # ---------- PURCHASE ----------
 class Purchase(models.Model):
     supplier = models.ForeignKey(Supplier, on_delete=models.CASCADE)
@@ -190,6 +257,12 @@ class Purchase(models.Model):
     total_price = models.DecimalField(max_digits=12, decimal_places=2, editable=False, default=0.00)
     date = models.DateField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['date', 'id'], name='purchase_date_id_idx'),
+            models.Index(fields=['supplier', 'date'], name='purchase_supplier_date_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         # Check if this is an update (instance has pk) or create (no pk)
         is_update = self.pk is not None
@@ -300,6 +373,13 @@ class Order(models.Model):
     paid_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
     return_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0.00, help_text="Total amount returned to customer")
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['order_date'], name='order_date_idx'),
+            models.Index(fields=['status', 'order_date'], name='order_status_date_idx'),
+            models.Index(fields=['customer', 'order_date'], name='order_customer_date_idx'),
+        ]
+    
     # def subtotal(self):
     #     return sum(item.total_price() for item in self.items.all())
 
@@ -348,6 +428,11 @@ class OrderItem(models.Model):
     gst = models.DecimalField(max_digits=5, decimal_places=2, default=0.00)
     is_return = models.BooleanField(default=False, help_text="Mark if this item has been returned")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['variant', 'order'], name='orderitem_variant_order_idx'),
+        ]
+
     def discount_price(self):
         total = self.price_at_sale * self.quantity
         if self.is_percentage:
@@ -389,6 +474,11 @@ class Sale(models.Model):
     profit = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
     paid_amount = models. DecimalField(max_digits=20, decimal_places=2, default=0.0)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['sale_date'], name='sale_date_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
 
@@ -466,6 +556,17 @@ class OrderReturn(models.Model):
     processed_by = models.ForeignKey(UserAccount, on_delete=models.SET_NULL, null=True, blank=True)
     processed_at = models.DateTimeField(null=True, blank=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'return_date'], name='orderreturn_status_date_idx'),
+            # Only open returns block order edits, and they are a small slice of the table
+            models.Index(
+                fields=['original_order'],
+                name='orderreturn_open_order_idx',
+                condition=models.Q(status__in=['pending', 'approved']),
+            ),
+        ]
+    
     def __str__(self):
         return f"Return #{self.id} for Order #{self.original_order.id}"
     
@@ -532,3 +633,66 @@ class ReturnItem(models.Model):
     
     def __str__(self):
         return f"Return {self.return_quantity}x {self.order_item.variant}"
+
+
+# ---------- CUSTOMER LEDGER ----------
+class CustomerLedgerEntry(models.Model):
+    """
+    Append-only record of everything that changes what a customer owes.
+
+    ``amount`` is signed: orders are debits (positive), payments and return
+    refunds are credits (negative). ``balance`` is the running balance after
+    this entry, so a positive balance is pending and a negative one is advance.
+    """
+    ENTRY_TYPE_CHOICES = (
+        ('order', 'Order'),
+        ('payment', 'Payment'),
+        ('return', 'Return'),
+        ('adjustment', 'Adjustment'),
+    )
+
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name="ledger_entries")
+    entry_type = models.CharField(max_length=20, choices=ENTRY_TYPE_CHOICES)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    balance = models.DecimalField(max_digits=12, decimal_places=2)
+    order = models.ForeignKey(Order, on_delete=models.SET_NULL, null=True, blank=True, related_name="ledger_entries")
+    order_return = models.ForeignKey(OrderReturn, on_delete=models.SET_NULL, null=True, blank=True, related_name="ledger_entries")
+    note = models.TextField(blank=True, null=True)
+    timestamp = models.DateTimeField(default=timezone.now)
+    created_by = models.ForeignKey(UserAccount, on_delete=models.SET_NULL, null=True, blank=True)
+
+    class Meta:
+        ordering = ['timestamp', 'id']
+        indexes = [
+            models.Index(fields=['customer', 'timestamp'], name='ledger_customer_ts_idx'),
+        ]
+
+    @classmethod
+    def post(cls, customer, entry_type, amount, **extra):
+        """
+        Append an entry and refresh the customer's pending/advance figures.
+
+        The customer row is locked for the duration so concurrent orders and
+        payments cannot interleave their running balances.
+        """
+        amount = Decimal(str(amount)).quantize(Decimal('0.01'))
+        with transaction.atomic():
+            locked = Customer.objects.select_for_update().get(pk=customer.pk)
+            last = cls.objects.filter(customer=locked).order_by('-id').first()
+            previous = last.balance if last else locked.pending_amount - locked.advance_payment
+            balance = previous + amount
+
+            entry = cls.objects.create(
+                customer=locked, entry_type=entry_type, amount=amount, balance=balance, **extra
+            )
+
+            pending = balance if balance > 0 else Decimal('0.00')
+            advance = -balance if balance < 0 else Decimal('0.00')
+            Customer.objects.filter(pk=locked.pk).update(pending_amount=pending, advance_payment=advance)
+
+        customer.pending_amount = pending
+        customer.advance_payment = advance
+        return entry
+
+    def __str__(self):
+        return f"{self.get_entry_type_display()} {self.amount} for {self.customer}"
@@ -0,0 +1,174 @@
+"""
+Read-only list projections.
+
+A projection is a tiny field mapper over ``queryset.values()``: each field
+names the output key, the lookup to fetch (joins are explicit in the lookup
+path) and an optional converter. Rows never become model instances and no
+serializer fields are built, which is what dominates ModelSerializer cost on
+100-row pages. Output matches the corresponding ModelSerializer, so list
+endpoints can switch transparently (see FastListMixin).
+"""
+from rest_framework.response import Response
+
+from inventory_app.media import versioned_media_url
+from inventory_app.models import ProductVariant
+from inventory_app.thumbnails import thumbnail_url
+
+
+def decimal_str(value):
+    return None if value is None else "{:f}".format(value)
+
+
+def date_iso(value):
+    return None if value is None else value.isoformat()
+
+
+def file_url(value, request=None):
+    if not value:
+        return None
+    url = versioned_media_url(value)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+file_url.needs_request = True
+
+
+def thumbnail_file_url(value, request=None):
+    return thumbnail_url(value, request=request)
+
+
+thumbnail_file_url.needs_request = True
+
+
+class Projection:
+    """
+    ``fields`` is a sequence of ``(name, lookup)`` or ``(name, lookup, converter)``.
+    Converters take the raw value, plus the request when ``needs_request`` is
+    set on them (see ``file_url``).
+    """
+    fields = ()
+
+    def __init__(self, request=None):
+        self.request = request
+        self.lookups = [field[1] for field in self.fields]
+
+    def values(self, queryset):
+        return queryset.prefetch_related(None).values(*self.lookups)
+
+    def convert(self, rows):
+        request = self.request
+        mapped = []
+        for row in rows:
+            item = {}
+            for field in self.fields:
+                name, lookup = field[0], field[1]
+                value = row[lookup]
+                if len(field) > 2:
+                    converter = field[2]
+                    if getattr(converter, "needs_request", False):
+                        value = converter(value, request)
+                    else:
+                        value = converter(value)
+                item[name] = value
+            mapped.append(item)
+        return self.extend(mapped)
+
+    def extend(self, items):
+        """Hook for nested data fetched in one extra query per page."""
+        return items
+
+
+class InventoryProjection(Projection):
+    fields = (
+        ("id", "id"),
+        ("variant", "variant_id"),
+        ("variant_name", "variant__product__name"),
+        ("size", "variant__size"),
+        ("quantity", "quantity"),
+    )
+
+
+class PurchaseProjection(Projection):
+    fields = (
+        ("id", "id"),
+        ("supplier_name", "supplier__name"),
+        ("supplier", "supplier_id"),
+        ("variant", "variant_id"),
+        ("product_name", "variant__product__name"),
+        ("category_id", "variant__product__category_id"),
+        ("category_name", "variant__product__category__name"),
+        ("variant_size", "variant__size"),
+        ("variant_price", "variant__price", decimal_str),
+        ("product_photo", "variant__product__thumbnails", thumbnail_file_url),
+        ("quantity", "quantity"),
+        ("purchase_price", "purchase_price", decimal_str),
+        ("discount", "discount", decimal_str),
+        ("gst", "gst", decimal_str),
+        ("total_price", "total_price", decimal_str),
+        ("date", "date", date_iso),
+    )
+
+
+class CustomerProjection(Projection):
+    fields = (
+        ("id", "id"),
+        ("name", "name"),
+        ("phone", "phone"),
+        ("email", "email"),
+        ("address", "address"),
+        ("pending_amount", "pending_amount", decimal_str),
+        ("advance_payment", "advance_payment", decimal_str),
+    )
+
+
+class ProductProjection(Projection):
+    fields = (
+        ("id", "id"),
+        ("name", "name"),
+        ("category", "category_id"),
+        ("category_name", "category__name"),
+        ("photo", "photo", file_url),
+        ("thumbnail", "thumbnails", thumbnail_file_url),
+    )
+
+    def extend(self, items):
+        if not items:
+            return items
+
+        by_product = {item["id"]: item for item in items}
+        for item in items:
+            item["variants"] = []
+
+        variants = (
+            ProductVariant.objects.filter(product_id__in=list(by_product))
+            .order_by("id")
+            .values("id", "product_id", "size", "price", "total_price", "product__name")
+        )
+        for variant in variants:
+            by_product[variant["product_id"]]["variants"].append({
+                "id": variant["id"],
+                "size": variant["size"],
+                "price": decimal_str(variant["price"]),
+                "total_price": decimal_str(variant["total_price"]),
+                "product_name": variant["product__name"],
+            })
+        return items
+
+
+class FastListMixin:
+    """
+    Serve paginated ``list`` responses through ``list_projection`` instead of
+    the viewset's ModelSerializer. Other actions are unaffected.
+    """
+    list_projection = None
+
+    def list(self, request, *args, **kwargs):
+        if self.list_projection is None:
+            return super().list(request, *args, **kwargs)
+
+        projection = self.list_projection(request)
+        rows = projection.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(projection.convert(page))
+        return Response(projection.convert(rows))
@@ -0,0 +1,159 @@
+"""
+Thermal receipts for the POS counter.
+
+A receipt is laid out once as fixed-width text lines for the paper width
+(32 columns on 58 mm rolls, 48 on 80 mm) and then emitted either as an
+ESC/POS byte stream for the receipt printer or as a narrow PDF of the same
+lines. The order and its items come from one LEFT JOINed ``values()`` query.
+
+Rendered receipts are cached under the order's receipt version, which the
+signal handlers replace whenever the order or one of its items is saved, so
+a reprint is a single cache read. Versions expire with the receipts they
+name, so orders that are never reprinted leave nothing behind.
+"""
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from inventory_app.dateranges import shop_timezone
+from inventory_app.models import Order
+
+PAPER_COLUMNS = {58: 32, 80: 48}
+FORMATS = ("escpos", "pdf")
+CACHE_TIMEOUT = 60 * 60 * 24
+
+ORDER_FIELDS = (
+    "id", "order_date", "customer__name", "subtotal", "total_discount", "total_gst",
+    "total_amount", "return_amount", "paid_amount", "pay_type",
+)
+ITEM_FIELDS = (
+    "items__id", "items__variant__product__name", "items__variant__size", "items__quantity",
+    "items__price_at_sale", "items__gst", "items__is_return",
+)
+
+# ESC/POS commands
+ESC_INIT = b"\x1b@"
+ESC_ALIGN = {"left": b"\x1ba\x00", "center": b"\x1ba\x01"}
+ESC_BOLD = {False: b"\x1bE\x00", True: b"\x1bE\x01"}
+ESC_FEED_AND_CUT = b"\x1bd\x04\x1dV\x42\x00"
+
+
+def _version_key(order_id):
+    return f"receipt:{order_id}:version"
+
+
+def receipt_version(order_id):
+    version = cache.get(_version_key(order_id))
+    if version is None:
+        # From the clock, so an expired version never names an older receipt
+        cache.add(_version_key(order_id), time.time_ns(), CACHE_TIMEOUT)
+        version = cache.get(_version_key(order_id))
+    return version if version is not None else time.time_ns()
+
+
+def invalidate(order_id):
+    cache.set(_version_key(order_id), time.time_ns(), CACHE_TIMEOUT)
+
+
+def load_receipt(order_id):
+    """The order as a dict with ``items``, or None when it does not exist."""
+    rows = list(
+        Order.objects.filter(pk=order_id).order_by("items__id").values(*ORDER_FIELDS, *ITEM_FIELDS)
+    )
+    if not rows:
+        return None
+    order = {field: rows[0][field] for field in ORDER_FIELDS}
+    order["items"] = [
+        {
+            "name": row["items__variant__product__name"],
+            "size": row["items__variant__size"],
+            "quantity": row["items__quantity"],
+            "price": row["items__price_at_sale"],
+            "gst": row["items__gst"],
+            "is_return": row["items__is_return"],
+        }
+        for row in rows if row["items__id"] is not None
+    ]
+    return order
+
+
+def _amount(value):
+    return f"{value or 0:.2f}"
+
+
+def _pair(left, right, columns):
+    """``left`` and ``right`` on one line, truncating ``left`` to make room."""
+    room = columns - len(right) - 1
+    return f"{left[:room]:<{room}} {right}"
+
+
+def receipt_lines(order, columns):
+    """``(text, align, bold)`` lines of the receipt at ``columns`` characters per line."""
+    rule = ("-" * columns, "left", False)
+    lines = [(text, "center", index == 0) for index, text in enumerate(settings.RECEIPT_HEADER)]
+    lines.append(rule)
+    lines.append((f"Bill No: #{order['id']}", "left", True))
+    lines.append((f"Date: {timezone.localtime(order['order_date'], shop_timezone()):%d %b %Y %H:%M}", "left", False))
+    if order["customer__name"]:
+        lines.append((f"Customer: {order['customer__name']}"[:columns], "left", False))
+    lines.append(rule)
+
+    for item in order["items"]:
+        name = f"{item['name']} ({item['size']})" + (" [returned]" if item["is_return"] else "")
+        lines.append((name[:columns], "left", False))
+        line_total = item["price"] * item["quantity"]
+        lines.append((_pair(f"  {item['quantity']} x {_amount(item['price'])}", _amount(line_total), columns),
+                      "left", False))
+        if item["gst"]:
+            lines.append((f"  GST {item['gst']:.2f}%", "left", False))
+    lines.append(rule)
+
+    totals = [("Subtotal", order["subtotal"]), ("Discount", order["total_discount"]), ("GST", order["total_gst"])]
+    for label, value in totals:
+        lines.append((_pair(label, _amount(value), columns), "left", False))
+    lines.append((_pair("TOTAL", _amount(order["total_amount"]), columns), "left", True))
+    net = (order["total_amount"] or Decimal("0")) - (order["return_amount"] or Decimal("0"))
+    if order["return_amount"]:
+        lines.append((_pair("Returned", f"-{_amount(order['return_amount'])}", columns), "left", False))
+        lines.append((_pair("Net", _amount(net), columns), "left", True))
+    paid = order["paid_amount"] or Decimal("0")
+    paid_label = f"Paid ({order['pay_type']})" if order["pay_type"] else "Paid"
+    lines.append((_pair(paid_label, _amount(paid), columns), "left", False))
+    if net - paid > 0:
+        lines.append((_pair("Balance due", _amount(net - paid), columns), "left", True))
+    lines.append(rule)
+    lines.extend((text, "center", False) for text in settings.RECEIPT_FOOTER)
+    return lines
+
+
+def escpos_bytes(lines):
+    """ESC/POS stream for ``lines``, ending with a feed and partial cut."""
+    out = [ESC_INIT]
+    for text, align, bold in lines:
+        out += [ESC_ALIGN[align], ESC_BOLD[bold], text.encode("ascii", "replace"), b"\n"]
+    out += [ESC_BOLD[False], ESC_ALIGN["left"], ESC_FEED_AND_CUT]
+    return b"".join(out)
+
+
+def render_receipt(order_id, output="escpos", paper=80):
+    """Receipt bytes for ``order_id`` (None if there is no such order), cached per order version."""
+    version = receipt_version(order_id)
+    key = f"receipt:{order_id}:v{version}:{output}:{paper}"
+    content = cache.get(key)
+    if content is not None:
+        return content
+
+    order = load_receipt(order_id)
+    if order is None:
+        return None
+    lines = receipt_lines(order, PAPER_COLUMNS[paper])
+    if output == "pdf":
+        from inventory_app.exports import get_backend
+        content = get_backend("receipt").render_receipt(lines, paper, PAPER_COLUMNS[paper])
+    else:
+        content = escpos_bytes(lines)
+    cache.set(key, content, CACHE_TIMEOUT)
+    return content
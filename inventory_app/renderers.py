@@ -0,0 +1,57 @@
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+_fallback_encoder = encoders.JSONEncoder()
+
+
+def _orjson_default(obj):
+    # Decimals, datetimes, lazy strings etc. are encoded the way DRF's
+    # JSONEncoder does, so switching renderers does not change the payload.
+    return _fallback_encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson when it is installed."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        return orjson.dumps(
+            data,
+            default=_orjson_default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+def to_columnar(records):
+    """Turn a list of dicts into {"columns": [...], "rows": [[...]]}."""
+    if not records:
+        return {"columns": [], "rows": []}
+    columns = list(records[0].keys())
+    return {"columns": columns, "rows": [[record.get(column) for column in columns] for record in records]}
+
+
+class ColumnarJSONRenderer(ORJSONRenderer):
+    """
+    Selected with ``?format=columnar``.
+
+    Views that support it build ``{"columns", "rows"}`` straight from
+    ``values_list()`` (see inventory_app.columnar); any other list payload,
+    paginated or not, is converted from dicts here.
+    """
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, list) and (not data or isinstance(data[0], dict)):
+            data = to_columnar(data)
+        elif isinstance(data, dict) and isinstance(data.get("results"), list):
+            data = {**data, "results": to_columnar(data["results"])}
+        return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,120 @@
+"""
+Reorder engine.
+
+Sales velocity is computed for every variant at once: order items from the
+velocity window are loaded in a single query and pivoted into a matrix of
+shop-local days x variants, whose per-variant mean and standard deviation are
+the daily demand. Reorder points combine that velocity with the lead time of
+the variant's latest supplier.
+"""
+import math
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from inventory_app import caching
+from inventory_app.dateranges import day_start, shop_timezone
+from inventory_app.models import Inventory, OrderItem, Purchase, ReorderSuggestion
+
+VELOCITY_WINDOW_DAYS = 28
+REVIEW_PERIOD_DAYS = 7
+SERVICE_LEVEL_Z = 1.65  # ~95% chance of not running out during lead time
+DEFAULT_LEAD_TIME_DAYS = 7
+
+
+def sales_velocity(as_of=None, window_days=VELOCITY_WINDOW_DAYS):
+    """
+    Return a DataFrame indexed by variant_id with ``avg_daily`` and ``std_daily``
+    demand over the ``window_days`` shop days ending on the day of ``as_of``.
+    """
+    import pandas as pd
+
+    as_of = as_of or timezone.now()
+    shop_tz = shop_timezone()
+    last_day = timezone.localtime(as_of, shop_tz).date()
+    first_day = last_day - timedelta(days=window_days - 1)
+
+    rows = OrderItem.objects.filter(
+        order__order_date__gte=day_start(first_day),
+        order__order_date__lte=as_of,
+    ).values_list("variant_id", "order__order_date", "quantity")
+
+    sales = pd.DataFrame.from_records(list(rows), columns=["variant_id", "order_date", "quantity"])
+    if sales.empty:
+        return pd.DataFrame(columns=["avg_daily", "std_daily"]).rename_axis("variant_id")
+
+    # Bucket by the shop's calendar day, not the UTC one
+    local = pd.to_datetime(sales["order_date"], utc=True).dt.tz_convert(shop_tz)
+    sales["day"] = local.dt.tz_localize(None).dt.normalize()
+    daily = sales.pivot_table(index="day", columns="variant_id", values="quantity", aggfunc="sum")
+    daily = daily.reindex(pd.date_range(first_day, last_day, freq="D"), fill_value=0).fillna(0)
+
+    return pd.DataFrame({
+        "avg_daily": daily.mean(),
+        "std_daily": daily.std().fillna(0),
+    }).rename_axis("variant_id")
+
+
+def latest_suppliers():
+    """Map variant_id -> (supplier_id, lead_time_days) from each variant's most recent purchase."""
+    suppliers = {}
+    purchases = Purchase.objects.order_by("variant_id", "-date", "-id").values_list(
+        "variant_id", "supplier_id", "supplier__lead_time_days"
+    )
+    for variant_id, supplier_id, lead_time in purchases.iterator(chunk_size=5000):
+        suppliers.setdefault(variant_id, (supplier_id, lead_time))
+    return suppliers
+
+
+def compute_reorder_suggestions(as_of=None, window_days=VELOCITY_WINDOW_DAYS, review_days=REVIEW_PERIOD_DAYS):
+    """Recompute and persist a ReorderSuggestion for every variant with an inventory row."""
+    as_of = as_of or timezone.now()
+    velocity = sales_velocity(as_of=as_of, window_days=window_days)
+    suppliers = latest_suppliers()
+    stock = dict(Inventory.objects.values_list("variant_id", "quantity"))
+
+    suggestions = []
+    for variant_id, quantity in stock.items():
+        if variant_id in velocity.index:
+            avg_daily = float(velocity.at[variant_id, "avg_daily"])
+            std_daily = float(velocity.at[variant_id, "std_daily"])
+        else:
+            avg_daily = std_daily = 0.0
+
+        supplier_id, lead_time = suppliers.get(variant_id, (None, None))
+        lead_time = lead_time or DEFAULT_LEAD_TIME_DAYS
+
+        safety_stock = SERVICE_LEVEL_Z * std_daily * math.sqrt(lead_time)
+        reorder_point = math.ceil(avg_daily * lead_time + safety_stock)
+        target = reorder_point + avg_daily * review_days
+        suggested = math.ceil(target - quantity) if quantity <= reorder_point else 0
+
+        suggestions.append(ReorderSuggestion(
+            variant_id=variant_id,
+            supplier_id=supplier_id,
+            current_stock=quantity,
+            avg_daily_sales=Decimal(str(round(avg_daily, 3))),
+            lead_time_days=lead_time,
+            reorder_point=reorder_point,
+            suggested_quantity=max(suggested, 0),
+            computed_at=as_of,
+        ))
+
+    with transaction.atomic():
+        ReorderSuggestion.objects.bulk_create(
+            suggestions,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["variant"],
+            update_fields=[
+                "supplier", "current_stock", "avg_daily_sales", "lead_time_days",
+                "reorder_point", "suggested_quantity", "computed_at",
+            ],
+        )
+        ReorderSuggestion.objects.filter(variant__inventory__isnull=True).delete()
+
+    # bulk_create sends no post_save, so refresh the dashboard explicitly
+    caching.invalidate("dashboard")
+    return len(suggestions)
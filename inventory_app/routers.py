@@ -0,0 +1,98 @@
+"""
+Read-replica routing for reporting views.
+
+Reads made inside ``reporting_reads()`` go to the ``reporting`` database
+alias when it is configured; everything else, and every write, uses
+``default``. Views opt in with ``ReportingMixin`` (class-based) or the
+``reporting_view`` decorator (functions; ``method_decorator`` for viewset
+actions).
+
+A replica lags behind the primary, so a user who has just written something
+(recorded by inventory_app.middleware.ReadYourWritesMiddleware) keeps
+reading from the primary for READ_YOUR_WRITES_SECONDS.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPORTING_ALIAS = "reporting"
+
+_reporting_reads = ContextVar("reporting_reads", default=False)
+
+
+def replica_configured():
+    return REPORTING_ALIAS in connections.databases
+
+
+def reading_replica():
+    """True inside a ``reporting_reads()`` block that goes to the replica."""
+    return _reporting_reads.get()
+
+
+def replica_lag_seconds():
+    return getattr(settings, "READ_YOUR_WRITES_SECONDS", 10)
+
+
+def _write_key(user):
+    return f"read-your-writes:{user.pk}"
+
+
+def record_write(user):
+    cache.set(_write_key(user), 1, replica_lag_seconds())
+
+
+def wrote_recently(user):
+    if user is None or not getattr(user, "is_authenticated", False):
+        return False
+    return cache.get(_write_key(user)) is not None
+
+
+@contextmanager
+def reporting_reads(user=None):
+    """Send reads in this block to the replica, unless ``user`` wrote recently."""
+    if not replica_configured() or wrote_recently(user):
+        yield
+        return
+    token = _reporting_reads.set(True)
+    try:
+        yield
+    finally:
+        _reporting_reads.reset(token)
+
+
+def reporting_view(view):
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        with reporting_reads(getattr(request, "user", None)):
+            return view(request, *args, **kwargs)
+    return wrapped
+
+
+class ReportingMixin:
+    """Serve every read of an APIView from the reporting replica."""
+
+    def dispatch(self, request, *args, **kwargs):
+        with reporting_reads(getattr(request, "user", None)):
+            return super().dispatch(request, *args, **kwargs)
+
+
+class ReportingRouter:
+    def db_for_read(self, model, **hints):
+        if _reporting_reads.get():
+            return REPORTING_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary
+        return db != REPORTING_ALIAS
@@ -1,8 +1,34 @@
 import json
+from django.db import models
 from rest_framework import serializers
 from .models import *
 from decimal import Decimal
 
+from inventory_app.media import versioned_media_url
+from inventory_app.thumbnails import thumbnail_url
+
+
+class ThumbnailField(serializers.ReadOnlyField):
+    """URL of a product thumbnail, read from a ``Product.thumbnails`` source."""
+
+    def __init__(self, size="md", **kwargs):
+        self.size = size
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return thumbnail_url(value, self.size, self.context.get("request"))
+
+
+class VersionedImageField(serializers.ImageField):
+    """ImageField whose URL carries the file's content hash (see media.versioned_media_url)."""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        url = versioned_media_url(value.name)
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request is not None else url
+
 
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -18,6 +44,19 @@ class CustomerSerializer(serializers.ModelSerializer):
     class Meta:
         model = Customer
         fields = '__all__'
+        # Balances only move through CustomerLedgerEntry.post (orders, payments, adjustments)
+        read_only_fields = ["pending_amount", "advance_payment"]
+
+class CustomerLedgerEntrySerializer(serializers.ModelSerializer):
+    entry_type_display = serializers.CharField(source="get_entry_type_display", read_only=True)
+
+    class Meta:
+        model = CustomerLedgerEntry
+        fields = [
+            "id", "customer", "entry_type", "entry_type_display", "amount", "balance",
+            "order", "order_return", "note", "timestamp", "created_by",
+        ]
+        read_only_fields = fields
 
 class ProductVariantSerializer(serializers.ModelSerializer):
     product_name = serializers.CharField(source="product.name", read_only=True)
@@ -31,10 +70,14 @@ class ProductVariantSerializer(serializers.ModelSerializer):
 class ProductSerializer(serializers.ModelSerializer):
     variants = ProductVariantSerializer(many=True, required=False)
     category_name = serializers.CharField(source="category.name", read_only=True)
+    thumbnail = ThumbnailField(source="thumbnails")
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping, models.ImageField: VersionedImageField,
+    }
 
     class Meta:
         model = Product
-        fields = ["id", "name", "category", "category_name", "photo", "variants"]
+        fields = ["id", "name", "category", "category_name", "photo", "thumbnail", "variants"]
 
     def _get_variants_data(self):
         """Helper to get variants as a list of dicts even if sent as JSON string."""
@@ -107,7 +150,7 @@ class PurchaseSerializer(serializers.ModelSerializer):
     category_name = serializers.CharField(source='variant.product.category.name', read_only=True)
     variant_size = serializers.CharField(source='variant.size', read_only=True)
     variant_price = serializers.DecimalField(source='variant.price', max_digits=10, decimal_places=2, read_only=True)
-    product_photo = serializers.ImageField(source='variant.product.photo', read_only=True)
+    product_photo = ThumbnailField(source='variant.product.thumbnails')
 
     class Meta:
         model = Purchase
@@ -131,11 +174,24 @@ class InventorySerializer(serializers.ModelSerializer):
         model = Inventory
         fields = ['id', 'variant', 'variant_name','size', 'quantity']
 
+class ReorderSuggestionSerializer(serializers.ModelSerializer):
+    product_name = serializers.CharField(source="variant.product.name", read_only=True)
+    size = serializers.CharField(source="variant.size", read_only=True)
+    supplier_name = serializers.CharField(source="supplier.name", read_only=True, default=None)
+
+    class Meta:
+        model = ReorderSuggestion
+        fields = [
+            "id", "variant", "product_name", "size", "supplier", "supplier_name",
+            "current_stock", "avg_daily_sales", "lead_time_days",
+            "reorder_point", "suggested_quantity", "computed_at",
+        ]
+
 class InventoryVariantSerializer(serializers.ModelSerializer):
     size = serializers.CharField(source="variant.size", default="", allow_null=True)
     price = serializers.DecimalField(source="variant.price", max_digits=10, decimal_places=2, default=0.00, allow_null=True)
     product_name = serializers.CharField(source="variant.product.name", read_only=True, default="")
-    product_photo = serializers.ImageField(source="variant.product.photo", read_only=True, default=None)
+    product_photo = ThumbnailField(source="variant.product.thumbnails", default=None)
     category_id = serializers.IntegerField(source="variant.product.category.id", read_only=True, default=0)
     category_name = serializers.CharField(source="variant.product.category.name", read_only=True, default="")
 
@@ -174,11 +230,7 @@ class CartSerializer(serializers.ModelSerializer):
         ]
 
     def get_variant_photo(self, obj):
-        request = self.context.get("request")
-        photo = obj.variant.product.photo
-        if photo:
-            return request.build_absolute_uri(photo.url)
-        return None
+        return thumbnail_url(obj.variant.product.thumbnails, "sm", self.context.get("request"))
 
     def get_discount_price(self, obj):
         base_price = obj.price or obj.variant.price
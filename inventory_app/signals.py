@@ -0,0 +1,154 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from inventory_app import caching, receipts, thumbnails
+from inventory_app.models import (
+    Category, Customer, CustomerLedgerEntry, Inventory, ModelVersion, Order, OrderItem, OrderReturn, Product,
+    ProductVariant, Purchase, ReorderSuggestion, ReturnItem, Role, Sale,
+    Supplier, UserAccount,
+)
+
+
+# ---------- Reference data cache invalidation ----------
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_categories(sender, **kwargs):
+    caching.invalidate("categories")
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=ProductVariant)
+def invalidate_variants(sender, **kwargs):
+    caching.invalidate("variants")
+
+
+@receiver([post_save, post_delete], sender=Role)
+@receiver(post_delete, sender=UserAccount)
+def invalidate_roles(sender, **kwargs):
+    caching.invalidate("roles")
+
+
+# Only these change what get_role_name() returns for a user; other saves
+# (last_login on every login, profile edits) leave the roles group alone.
+USER_ROLE_FIELDS = ("role", "is_active")
+
+
+def _role_state(user):
+    # Read from __dict__ so deferred fields are not loaded just for this
+    return tuple(user.__dict__.get(field) for field in ("role_id", "is_active"))
+
+
+@receiver(post_init, sender=UserAccount)
+def remember_user_role(sender, instance, **kwargs):
+    instance._role_state = _role_state(instance)
+
+
+@receiver(post_save, sender=UserAccount)
+def invalidate_user_role(sender, instance, created=False, update_fields=None, **kwargs):
+    if update_fields is not None and not set(USER_ROLE_FIELDS) & set(update_fields):
+        return
+    state = _role_state(instance)
+    if not created and state == instance._role_state:
+        return
+    instance._role_state = state
+    caching.invalidate("roles")
+
+
+# ---------- Product thumbnails ----------
+
+@receiver(post_save, sender=Product)
+def queue_thumbnails(sender, instance, raw=False, **kwargs):
+    if raw or not instance.photo or thumbnails.is_rendered(instance.thumbnails):
+        return
+    thumbnails.schedule(instance.pk)
+
+
+# ---------- POS receipts ----------
+
+@receiver([post_save, post_delete], sender=Order)
+def invalidate_order_receipt(sender, instance, **kwargs):
+    receipts.invalidate(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=OrderItem)
+def invalidate_item_receipt(sender, instance, **kwargs):
+    receipts.invalidate(instance.order_id)
+
+
+# ---------- Dashboard data version ----------
+
+DASHBOARD_SOURCES = (
+    Order, OrderItem, Sale, Purchase, OrderReturn, ReturnItem, Inventory,
+    ReorderSuggestion, Customer, Supplier, Product, ProductVariant, Category,
+)
+
+
+def bump_dashboard_version(sender, **kwargs):
+    caching.invalidate("dashboard")
+
+
+for model in DASHBOARD_SOURCES:
+    post_save.connect(bump_dashboard_version, sender=model, dispatch_uid=f"dashboard-version-save-{model.__name__}")
+    post_delete.connect(bump_dashboard_version, sender=model, dispatch_uid=f"dashboard-version-delete-{model.__name__}")
+
+
+# ---------- List ETag versions ----------
+
+VERSIONED_MODELS = (Category, Supplier, Customer, Product, ProductVariant, Inventory)
+
+
+def bump_model_version(sender, **kwargs):
+    ModelVersion.bump(sender.__name__)
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(bump_model_version, sender=model, dispatch_uid=f"model-version-save-{model.__name__}")
+    post_delete.connect(bump_model_version, sender=model, dispatch_uid=f"model-version-delete-{model.__name__}")
+
+
+@receiver(post_save, sender=CustomerLedgerEntry)
+def bump_customer_version(sender, **kwargs):
+    # Ledger postings refresh pending/advance with a queryset update(),
+    # which sends no signal for Customer itself.
+    ModelVersion.bump(Customer.__name__)
+
+
+# ---------- SQLite connection setup ----------
+
+# Pragmas SQLITE_PRAGMAS may set and their allowed values (int: any integer).
+# Values come from the environment and cannot be bound as parameters, so
+# anything else is refused rather than interpolated into the statement.
+SQLITE_PRAGMA_VALUES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "foreign_keys": {"ON", "OFF"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+    "busy_timeout": int,
+    "cache_size": int,
+    "mmap_size": int,
+}
+
+
+def sqlite_pragma(pragma, value):
+    """The statement setting ``pragma`` to ``value``; ImproperlyConfigured if either is not allowed."""
+    allowed = SQLITE_PRAGMA_VALUES.get(pragma)
+    if allowed is int:
+        if (isinstance(value, int) and not isinstance(value, bool)) or re.fullmatch(r"-?\d+", str(value)):
+            return f"PRAGMA {pragma} = {int(value)}"
+    elif allowed is not None and str(value).upper() in allowed:
+        return f"PRAGMA {pragma} = {str(value).upper()}"
+    raise ImproperlyConfigured(f"SQLITE_PRAGMAS: {pragma} = {value!r} is not allowed.")
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in getattr(settings, "SQLITE_PRAGMAS", {}).items():
+            cursor.execute(sqlite_pragma(pragma, value))
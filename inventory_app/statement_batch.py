@@ -0,0 +1,170 @@
+"""
+Month-end customer statements as one zip archive.
+
+``build_statement_archive`` renders the customer-orders statement of every
+selected customer in a process pool and writes each PDF into a zip file on
+disk as soon as its worker returns it. Workers are started once per batch:
+each sets up Django, imports the PDF backend and compiles the HTML template
+a single time, then renders its share of customers with its own database
+connection (reads go to the reporting replica when one is configured).
+
+``start_batch_job`` runs the same thing on a background thread for the API,
+recording progress in the cache under the job id.
+"""
+import io
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils.text import slugify
+
+from inventory_app.dateranges import filter_date_range, parse_date_range
+
+# Models are imported inside functions: spawned workers import this module
+# to find _init_worker before Django is set up.
+
+JOB_TIMEOUT = 60 * 60 * 24
+
+
+def select_customers(pending_only=True, customer_ids=None):
+    from inventory_app.models import Customer
+
+    customers = Customer.objects.all()
+    if pending_only:
+        customers = customers.filter(pending_amount__gt=0)
+    if customer_ids:
+        customers = customers.filter(id__in=customer_ids)
+    return list(customers.order_by("id").values_list("id", flat=True))
+
+
+def batch_dir():
+    path = getattr(settings, "STATEMENT_BATCH_DIR", os.path.join(settings.BASE_DIR, "statement_batches"))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# ---------- Worker process ----------
+
+_worker = {}
+
+
+def _init_worker(renderer):
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    from django.template.loader import get_template
+
+    from inventory_app.exports import get_backend
+
+    _worker["backend"] = get_backend(renderer)
+    if renderer != "statement":
+        # Compiled once here and reused from the cached loader afterwards
+        get_template("pdf_templates/customer_orders.html")
+
+
+def _render_customer(customer_id, start_date, end_date):
+    from inventory_app.models import Customer, Order
+    from inventory_app.routers import reporting_reads
+    from inventory_app.statements import customer_orders_statement
+
+    try:
+        with reporting_reads():
+            customer = Customer.objects.get(id=customer_id)
+            orders = Order.objects.filter(customer_id=customer_id)
+            if start_date and end_date:
+                orders = filter_date_range(orders, "order_date", *parse_date_range(start_date, end_date))
+            statement = customer_orders_statement(customer, orders, start_date, end_date)
+            output = io.BytesIO()
+            _worker["backend"].write_statement(statement, output)
+    except Exception as exc:
+        return customer_id, None, f"{type(exc).__name__}: {exc}"
+    slug = slugify(customer.name or "")
+    name = f"customer_{customer_id}_{slug}.pdf" if slug else f"customer_{customer_id}.pdf"
+    return customer_id, name, output.getvalue()
+
+
+# ---------- Batch ----------
+
+def build_statement_archive(path, customer_ids, start_date=None, end_date=None, renderer=None,
+                            workers=None, progress=None):
+    """
+    Render statements for ``customer_ids`` into the zip file at ``path``.
+
+    ``progress(done, total, failed)`` is called after every statement.
+    Returns ``(written, failures)`` with failures as ``(customer_id, error)``.
+    """
+    renderer = renderer or settings.EXPORT_RENDERERS.get("customer_orders", settings.EXPORT_PDF_BACKEND)
+    workers = workers or getattr(settings, "STATEMENT_BATCH_WORKERS", None) or os.cpu_count()
+    context = multiprocessing.get_context(getattr(settings, "STATEMENT_BATCH_START_METHOD", "spawn"))
+    total, written, failures = len(customer_ids), 0, []
+
+    # Children must open their own connections, never share the parent's
+    connections.close_all()
+    partial = f"{path}.part"
+    with zipfile.ZipFile(partial, "w", compression=zipfile.ZIP_STORED) as archive, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                initializer=_init_worker, initargs=(renderer,)) as pool:
+        futures = [pool.submit(_render_customer, pk, start_date, end_date) for pk in customer_ids]
+        for future in as_completed(futures):
+            customer_id, name, result = future.result()
+            if name is None:
+                failures.append((customer_id, result))
+            else:
+                # PDF pages are already deflated; storing avoids compressing twice
+                archive.writestr(name, result)
+                written += 1
+            if progress:
+                progress(written + len(failures), total, len(failures))
+    os.replace(partial, path)
+    return written, failures
+
+
+# ---------- Background jobs for the API ----------
+
+def _job_key(job_id):
+    return f"statement-batch:{job_id}"
+
+
+def job_status(job_id):
+    return cache.get(_job_key(job_id))
+
+
+def job_path(job_id):
+    return os.path.join(batch_dir(), f"statements_{job_id}.zip")
+
+
+def start_batch_job(customer_ids, start_date=None, end_date=None, renderer=None):
+    job_id = uuid.uuid4().hex
+    status = {"status": "running", "done": 0, "total": len(customer_ids), "failed": 0, "started_at": time.time()}
+    cache.set(_job_key(job_id), status, JOB_TIMEOUT)
+
+    def progress(done, total, failed):
+        # Every 1% is plenty for a progress bar and keeps cache writes low
+        if done == total or done % max(total // 100, 1) == 0:
+            cache.set(_job_key(job_id), {**status, "done": done, "failed": failed}, JOB_TIMEOUT)
+
+    def run():
+        try:
+            written, failures = build_statement_archive(
+                job_path(job_id), customer_ids, start_date, end_date, renderer, progress=progress,
+            )
+            cache.set(_job_key(job_id), {
+                **status, "status": "done", "done": len(customer_ids), "written": written,
+                "failed": len(failures), "errors": failures[:50], "finished_at": time.time(),
+            }, JOB_TIMEOUT)
+        except Exception as exc:
+            cache.set(_job_key(job_id), {**status, "status": "failed", "error": str(exc)}, JOB_TIMEOUT)
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=run, daemon=True, name=f"statement-batch-{job_id}").start()
+    return job_id, status
@@ -0,0 +1,192 @@
+"""
+Customer and supplier statements.
+
+Each builder returns an inventory_app.exports.Statement carrying both the
+plain rows used by the direct "statement" PDF backend and the template
+context of the original HTML report, so any PDF backend can render it.
+
+Rows come from a single ``values()`` query with the joins the report needs
+(orders are LEFT JOINed to their items and grouped back in Python) streamed
+with ``iterator()``. The grand total is added up from the same rows as they
+stream past (see ``RunningTotal``), so a statement is one round trip per
+chunk; no model instances are built and nothing is iterated twice.
+"""
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+
+from django.utils import timezone
+
+from inventory_app.dateranges import parse_date_range, shop_timezone
+from inventory_app.exports import Statement
+
+# Rows fetched per round trip while streaming a statement
+CHUNK_SIZE = 2000
+
+CUSTOMER_ORDER_COLUMNS = (
+    ("Order ID", 1, "left"),
+    ("Order Date", 1.4, "left"),
+    ("Total", 1.5, "right"),
+    ("Discount", 1.5, "right"),
+    ("GST", 1.5, "right"),
+    ("Final", 1.5, "right"),
+    ("Products", 5, "left"),
+)
+
+SUPPLIER_PURCHASE_COLUMNS = (
+    ("Date", 1.2, "left"),
+    ("Variant", 3.5, "left"),
+    ("Quantity", 1, "right"),
+    ("Purchase Price", 1.5, "right"),
+    ("Discount", 1.3, "right"),
+    ("GST (%)", 1, "right"),
+    ("Total", 1.5, "right"),
+)
+
+
+def money(value):
+    return f"Rs. {value or 0:.2f}"
+
+
+def day(value):
+    if value is None:
+        return ""
+    if hasattr(value, "hour"):
+        value = timezone.localtime(value, shop_timezone())
+    return value.strftime("%d/%m/%Y")
+
+
+def period_line(label, start_date, end_date):
+    start, end = parse_date_range(start_date, end_date)
+    if not (start and end):
+        return None
+    return f"{label} {day(start)} to {day(end)}"
+
+
+class RunningTotal:
+    """
+    Sum of ``field`` over the records passed through ``track()``.
+
+    Totals are printed after the rows, so they are read (by calling the
+    instance) only once the rows have streamed through.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self.value = Decimal("0")
+
+    def track(self, records):
+        for record in records:
+            self.value += record[self.field] or 0
+            yield record
+
+    def __call__(self):
+        return self.value
+
+    def lines(self, label):
+        # A generator, so the text is built when the backend prints it
+        yield f"{label}: {money(self.value)}"
+
+
+ORDER_FIELDS = ("id", "order_date", "subtotal", "total_discount", "total_gst", "total_amount")
+ORDER_ITEM_FIELDS = {
+    "items__id": "id",
+    "items__variant__product__name": "product_name",
+    "items__variant__size": "size",
+    "items__quantity": "quantity",
+    "items__price_at_sale": "price_at_sale",
+}
+
+
+def customer_order_records(orders):
+    """One dict per order, with its ``items`` as dicts, from a single query."""
+    rows = (
+        orders.order_by("order_date", "id", "items__id")
+        .values(*ORDER_FIELDS, *ORDER_ITEM_FIELDS)
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for _order_id, group in groupby(rows, key=itemgetter("id")):
+        group = list(group)
+        order = {field: group[0][field] for field in ORDER_FIELDS}
+        order["items"] = [
+            {name: row[lookup] for lookup, name in ORDER_ITEM_FIELDS.items()}
+            for row in group if row["items__id"] is not None
+        ]
+        yield order
+
+
+def supplier_purchase_records(purchases):
+    """One dict per purchase with the variant's display name, from a single query."""
+    rows = (
+        purchases.order_by("date", "id")
+        .values(
+            "id", "date", "variant__product__name", "variant__size", "quantity",
+            "purchase_price", "discount", "gst", "total_price",
+        )
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for row in rows:
+        # Same text as ProductVariant.__str__
+        row["variant_name"] = f"{row.pop('variant__product__name')} - {row.pop('variant__size')}"
+        yield row
+
+
+def customer_orders_statement(customer, orders, start_date, end_date):
+    total_sum = RunningTotal("total_amount")
+    records = total_sum.track(customer_order_records(orders))
+
+    def rows():
+        for order in records:
+            products = "\n".join(
+                f"{item['product_name']} - {item['size']} ({item['quantity']}) – {money(item['price_at_sale'])}"
+                for item in order["items"]
+            ) or "No items"
+            yield (
+                order["id"], day(order["order_date"]), money(order["subtotal"]), money(order["total_discount"]),
+                money(order["total_gst"]), money(order["total_amount"]), products,
+            )
+
+    lines = [f"Customer: {customer.name}"]
+    if customer.phone:
+        lines.append(f"Phone: {customer.phone}")
+    period = period_line("Period:", start_date, end_date)
+    if period:
+        lines.append(period)
+
+    return Statement(
+        "Customer Orders Report", CUSTOMER_ORDER_COLUMNS, rows(),
+        lines=lines, totals=total_sum.lines("Grand Total"),
+        template="pdf_templates/customer_orders.html",
+        context={
+            "customer": customer, "orders": records,
+            "start_date": start_date, "end_date": end_date, "total_sum": total_sum,
+        },
+    )
+
+
+def supplier_purchases_statement(supplier, purchases, start_date, end_date):
+    total_sum = RunningTotal("total_price")
+    records = total_sum.track(supplier_purchase_records(purchases))
+
+    def rows():
+        for purchase in records:
+            yield (
+                day(purchase["date"]), purchase["variant_name"], purchase["quantity"],
+                money(purchase["purchase_price"]), money(purchase["discount"]), f"{purchase['gst']:.2f}",
+                money(purchase["total_price"]),
+            )
+
+    lines = [f"Supplier: {supplier.name}"]
+    period = period_line("From:", start_date, end_date)
+    if period:
+        lines.append(period)
+
+    return Statement(
+        "Supplier Purchases Report", SUPPLIER_PURCHASE_COLUMNS, rows(),
+        lines=lines, totals=total_sum.lines("Grand Total"),
+        template="pdf_templates/supplier_purchases.html",
+        context={
+            "supplier": supplier, "purchases": records,
+            "start_date": start_date, "end_date": end_date, "total_sum": total_sum,
+        },
+    )
@@ -0,0 +1,70 @@
+"""
+Fingerprinted, precompressed static files.
+
+``collectstatic`` with ``PrecompressedManifestStaticFilesStorage`` writes
+every asset under a content-hashed name (``app.3f2a9c1b.js``) plus a manifest,
+and next to each text asset a ``.gz`` and, when the ``brotli`` package is
+installed, a ``.br`` variant compressed at maximum level. Compression happens
+once at deploy, so serving costs no CPU;
+inventory_app.middleware.PrecompressedStaticMiddleware picks the variant the
+browser accepts and marks hashed names as immutable.
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip variants are written without it
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    ".css", ".js", ".mjs", ".map", ".json", ".svg", ".txt", ".html", ".xml", ".ttf", ".eot", ".otf", ".ico",
+)
+# A variant must save at least this fraction of the original to be kept
+MIN_SAVING = 0.05
+
+
+def compressed_variants(content):
+    """``{suffix: bytes}`` of the worthwhile compressed forms of ``content``."""
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(content, quality=11)
+    limit = len(content) * (1 - MIN_SAVING)
+    return {suffix: data for suffix, data in variants.items() if len(data) < limit}
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # Vendor CSS references a few files that are not shipped (e.g. the
+    # boxicons font paths); keep such references as written instead of
+    # failing collectstatic, and fall back to unhashed URLs at runtime.
+    manifest_strict = False
+
+    def url_converter(self, name, hashed_files, template=None):
+        converter = super().url_converter(name, hashed_files, template)
+
+        def tolerant_converter(matchobj):
+            try:
+                return converter(matchobj)
+            except ValueError:
+                return matchobj["matched"]
+
+        return tolerant_converter
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        names = set(paths)
+        names.update(self.hashed_files.get(self.hash_key(self.clean_name(name)), name) for name in paths)
+        for name in sorted(names):
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS) or not self.exists(name):
+                continue
+            with self.open(name) as handle:
+                content = handle.read()
+            for suffix, data in compressed_variants(content).items():
+                if self.exists(name + suffix):
+                    self.delete(name + suffix)
+                self._save(name + suffix, ContentFile(data))
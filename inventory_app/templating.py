@@ -0,0 +1,42 @@
+"""
+Template warm-up.
+
+The cached template loader compiles a template the first time a process asks
+for it and keeps the result for the life of that process. ``warm_templates``
+asks for every template up front, so the first request after a deploy (in
+each worker, when called from Radhe/wsgi.py) does not pay for parsing, and a
+template with a syntax error fails the deploy instead of a page.
+"""
+from pathlib import Path
+
+from django.template import TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+
+
+def template_names(engine):
+    """Every ``*.html`` / ``*.txt`` template name the engine's directories can load."""
+    dirs = [Path(d) for d in engine.dirs]
+    dirs += [Path(d) for d in get_app_template_dirs("templates")]
+    names = set()
+    for root in dirs:
+        for path in root.rglob("*"):
+            if path.suffix in (".html", ".txt") and path.is_file():
+                names.add(path.relative_to(root).as_posix())
+    return sorted(names)
+
+
+def warm_templates():
+    """Compile every template; return ``(compiled, errors)`` with ``errors`` as ``(name, message)`` pairs."""
+    compiled, errors = 0, []
+    for engine in engines.all():
+        engine = getattr(engine, "engine", None)
+        if engine is None:
+            continue
+        for name in template_names(engine):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as exc:
+                errors.append((name, str(exc)))
+            else:
+                compiled += 1
+    return compiled, errors
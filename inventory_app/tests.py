@@ -1,3 +1,1459 @@
-from django.test import TestCase
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+from decimal import Decimal
+import gzip
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import uuid
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from inventory_app.models import (
+    Cart, Category, Customer, CustomerLedgerEntry, Inventory, Order, OrderItem, OrderReturn, Product, ProductVariant,
+    Purchase, ReorderSuggestion, ReturnItem, Role, Supplier, UserAccount,
+)
+
+
+# Local storages, so tests need neither Cloudinary nor a collectstatic manifest
+FILE_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+def make_user(email="staff@example.com", mobile="9000000001", role="Admin", **extra):
+    role = Role.objects.get_or_create(name=role)[0] if role else None
+    return UserAccount.objects.create_user(
+        email=email, password="secret", full_name="Staff", mobile=mobile, role=role, **extra
+    )
+
+
+def make_variant(name="Hammer", size="500g", price="100.00", gst="0"):
+    category = Category.objects.get_or_create(name="Tools")[0]
+    product = Product.objects.create(category=category, name=name)
+    return ProductVariant.objects.create(
+        product=product, size=size, price=Decimal(price), discount=Decimal("0"), gst=Decimal(gst),
+    )
+
+
+def make_order(customer=None, lines=(), **fields):
+    """An order with ``lines`` of ``(variant, quantity, price)``; totals default to the line sum."""
+    subtotal = sum((Decimal(price) * quantity for _variant, quantity, price in lines), Decimal("0"))
+    fields.setdefault("subtotal", subtotal)
+    fields.setdefault("total_amount", subtotal)
+    order = Order.objects.create(customer=customer, **fields)
+    for variant, quantity, price in lines:
+        OrderItem.objects.create(order=order, variant=variant, quantity=quantity, price_at_sale=Decimal(price))
+    return order
+
+
+def age_order(order, days, now=None):
+    """Move ``order`` (auto_now_add) back by ``days``."""
+    Order.objects.filter(pk=order.pk).update(order_date=(now or timezone.now()) - timedelta(days=days))
+
+
+def count_queries(func):
+    with CaptureQueriesContext(connection) as queries:
+        func()
+    return len(queries)
+
+
+class ApiTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+# ---------- Returns ----------
+
+class ReturnsManagementTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.variant = make_variant()
+        self.order = make_order(Customer.objects.create(name="Ravi"), [(self.variant, 4, "100.00")])
+
+    def make_return(self, status="pending", reason="damaged", refund="0.00"):
+        order_return = OrderReturn.objects.create(
+            original_order=self.order, status=status, reason=reason, refund_amount=Decimal(refund)
+        )
+        ReturnItem.objects.create(
+            return_order=order_return, order_item=self.order.items.get(), return_quantity=1,
+            refund_per_unit=Decimal("100.00"),
+        )
+        return order_return
+
+    def test_list_is_paginated_with_nested_items(self):
+        for _ in range(3):
+            self.make_return()
+
+        response = self.client.get("/admin_api/returns-management/", {"page_size": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(len(response.data["results"]), 2)
+        item = response.data["results"][0]["return_items"][0]
+        self.assertEqual((item["order_item_product_name"], item["order_item_variant_size"]), ("Hammer", "500g"))
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        self.make_return()
+        single = count_queries(lambda: self.client.get("/admin_api/returns-management/"))
+        for _ in range(4):
+            self.make_return()
+        many = count_queries(lambda: self.client.get("/admin_api/returns-management/"))
+        self.assertEqual(single, many)
+
+    def test_list_filters_by_status(self):
+        self.make_return(status="pending")
+        self.make_return(status="rejected")
+
+        response = self.client.get("/admin_api/returns-management/", {"status": "rejected"})
+
+        self.assertEqual([row["status"] for row in response.data["results"]], ["rejected"])
+
+    def test_statistics_group_counts_and_refunds(self):
+        self.make_return(status="pending", reason="damaged")
+        self.make_return(status="approved", reason="damaged", refund="50.00")
+        self.make_return(status="completed", reason="wrong_item", refund="25.00")
+        self.make_return(status="rejected", reason="other", refund="99.00")
+
+        response = self.client.get("/admin_api/returns-management/return_statistics/")
+
+        data = response.data
+        self.assertEqual(data["total_returns"], 4)
+        self.assertEqual(
+            (data["pending_returns"], data["approved_returns"], data["completed_returns"], data["rejected_returns"]),
+            (1, 1, 1, 1),
+        )
+        self.assertEqual(data["total_refund_amount"], Decimal("75.00"))
+        self.assertEqual(data["returns_by_reason"][0]["reason"], "damaged")
+        self.assertEqual(data["returns_by_reason"][0]["count"], 2)
+
+
+# ---------- Customer ledger ----------
+
+class CustomerLedgerTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.customer = Customer.objects.create(name="Asha", phone="9100000001")
+
+    def test_post_keeps_running_balance_and_customer_figures(self):
+        CustomerLedgerEntry.post(self.customer, "order", Decimal("500"))
+        payment = CustomerLedgerEntry.post(self.customer, "payment", Decimal("-200"))
+
+        self.assertEqual(payment.balance, Decimal("300.00"))
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.pending_amount, Decimal("300.00"))
+        self.assertEqual(self.customer.advance_payment, Decimal("0.00"))
+
+    def test_overpayment_becomes_advance(self):
+        CustomerLedgerEntry.post(self.customer, "order", Decimal("100"))
+        CustomerLedgerEntry.post(self.customer, "payment", Decimal("-150"))
+
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.pending_amount, Decimal("0.00"))
+        self.assertEqual(self.customer.advance_payment, Decimal("50.00"))
+
+    def test_first_entry_starts_from_existing_balance(self):
+        Customer.objects.filter(pk=self.customer.pk).update(pending_amount=Decimal("80"))
+        entry = CustomerLedgerEntry.post(self.customer, "order", Decimal("20"))
+        self.assertEqual(entry.balance, Decimal("100.00"))
+
+    def test_post_reads_balance_from_the_locked_row_not_the_instance(self):
+        stale = Customer.objects.get(pk=self.customer.pk)
+        CustomerLedgerEntry.post(self.customer, "order", Decimal("40"))
+        entry = CustomerLedgerEntry.post(stale, "order", Decimal("60"))
+
+        self.assertEqual(entry.balance, Decimal("100.00"))
+        self.assertEqual(stale.pending_amount, Decimal("100.00"))
+
+    def test_balances_are_read_only_through_the_api(self):
+        response = self.client.patch(
+            f"/admin_api/customers/{self.customer.pk}/",
+            {"name": "Asha P", "pending_amount": "999.00", "advance_payment": "5.00"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.name, "Asha P")
+        self.assertEqual(self.customer.pending_amount, Decimal("0.00"))
+        self.assertEqual(self.customer.advance_payment, Decimal("0.00"))
+
+    def test_adjustment_is_posted_to_the_ledger(self):
+        response = self.client.post(
+            f"/admin_api/customers/{self.customer.pk}/adjustment/",
+            {"amount": "75.50", "note": "opening balance"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["pending_amount"], "75.50")
+        entry = CustomerLedgerEntry.objects.get(customer=self.customer)
+        self.assertEqual((entry.entry_type, entry.amount, entry.created_by), ("adjustment", Decimal("75.50"), self.user))
+
+    def test_adjustment_rejects_invalid_amounts(self):
+        for amount in ("abc", "0", "NaN"):
+            response = self.client.post(
+                f"/admin_api/customers/{self.customer.pk}/adjustment/", {"amount": amount}, format="json"
+            )
+            self.assertEqual(response.status_code, 400, amount)
+        self.assertFalse(CustomerLedgerEntry.objects.exists())
+
+
+# ---------- Receivables aging ----------
+
+class ReceivablesAgingTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+        self.customer = Customer.objects.create(name="Meera", phone="9100000002")
+
+    def order(self, days, total, paid="0", returned="0", customer=None):
+        order = make_order(
+            customer or self.customer, total_amount=Decimal(total),
+            paid_amount=Decimal(paid), return_amount=Decimal(returned),
+        )
+        age_order(order, days, self.now)
+        return order
+
+    def test_dues_fall_into_age_buckets(self):
+        from inventory_app.admin_views.AgingReportViews import aging_queryset
+
+        self.order(5, "100", paid="40")
+        self.order(30.5, "10")
+        self.order(45, "200", returned="50")
+        self.order(75, "300")
+        self.order(120, "400", paid="100")
+        self.order(10, "500", paid="500")  # settled, not read
+
+        row = aging_queryset(self.now).get()
+
+        self.assertEqual(row["customer_id"], self.customer.pk)
+        self.assertEqual(row["days_0_30"], Decimal("70.00"))
+        self.assertEqual(row["days_31_60"], Decimal("150.00"))
+        self.assertEqual(row["days_61_90"], Decimal("300.00"))
+        self.assertEqual(row["days_90_plus"], Decimal("300.00"))
+        self.assertEqual(row["total_due"], Decimal("820.00"))
+
+    def test_orders_without_customer_or_dues_are_left_out(self):
+        from inventory_app.admin_views.AgingReportViews import aging_queryset
+
+        make_order(None, total_amount=Decimal("100"))
+        self.order(3, "50", paid="50")
+
+        self.assertFalse(aging_queryset(self.now).exists())
+
+    def test_api_orders_customers_by_total_due(self):
+        other = Customer.objects.create(name="Kiran", phone="9100000003")
+        self.order(5, "100")
+        self.order(5, "900", customer=other)
+
+        response = self.client.get("/admin_api/receivables-aging/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["customer_name"] for row in response.data["results"]], ["Kiran", "Meera"])
+        self.assertEqual(response.data["results"][0]["total_due"], "900.00")
+
+    def test_csv_export_streams_every_row(self):
+        self.order(40, "250")
+
+        response = self.client.get("/admin_api/receivables-aging/export_csv/")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "Customer ID,Customer,Phone,0-30,31-60,61-90,90+,Total Due")
+        self.assertEqual(lines[1], f"{self.customer.pk},Meera,9100000002,0.00,250.00,0.00,0.00,250.00")
+
+
+# ---------- Top products ----------
+
+class TopProductsTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.hammer = make_variant("Hammer", price="100.00", gst="18")
+        self.drill = make_variant("Drill", price="40.00")
+        self.supplier = Supplier.objects.create(name="Acme")
+
+    def purchase(self, variant, price):
+        Purchase.objects.create(
+            supplier=self.supplier, variant=variant, quantity=10, purchase_price=Decimal(price),
+            discount=Decimal("0"), gst=Decimal("18"),
+        )
+
+    def rank(self, **kwargs):
+        from inventory_app.admin_views.SalesView import top_products
+        return {entry["product__name"]: entry for entry in top_products(**kwargs)}
+
+    def test_quantity_and_revenue_are_ex_gst_after_item_discount(self):
+        order = make_order(None, [(self.hammer, 2, "100.00"), (self.drill, 5, "40.00")])
+        OrderItem.objects.filter(order=order, variant=self.hammer).update(item_discount=Decimal("12.5"))
+        make_order(None, [(self.drill, 1, "40.00")])
+
+        ranking = self.rank()
+
+        self.assertEqual(list(ranking), ["Drill", "Hammer"])
+        self.assertEqual((ranking["Drill"]["total_sold"], ranking["Drill"]["order_count"]), (6, 2))
+        self.assertEqual(ranking["Hammer"]["revenue"], Decimal("175.00"))
+
+    def test_returns_are_netted_at_the_sold_unit_revenue(self):
+        order = make_order(None, [(self.hammer, 4, "100.00")])
+        order_return = OrderReturn.objects.create(original_order=order, status="approved", reason="damaged")
+        # Refunds include GST (and condition deductions); revenue must not
+        ReturnItem.objects.create(
+            return_order=order_return, order_item=order.items.get(), return_quantity=1,
+            refund_per_unit=Decimal("118.00"),
+        )
+        pending = OrderReturn.objects.create(original_order=order, status="pending", reason="other")
+        ReturnItem.objects.create(
+            return_order=pending, order_item=order.items.get(), return_quantity=2, refund_per_unit=Decimal("118.00"),
+        )
+
+        hammer = self.rank(metric="revenue")["Hammer"]
+
+        self.assertEqual(hammer["total_sold"], 3)
+        self.assertEqual(hammer["revenue"], Decimal("300.00"))
+
+    def test_profit_uses_latest_purchase_cost(self):
+        self.purchase(self.hammer, "50.00")
+        self.purchase(self.hammer, "70.00")
+        make_order(None, [(self.hammer, 2, "100.00"), (self.drill, 10, "40.00")])
+
+        ranking = self.rank(metric="profit")
+
+        self.assertEqual(list(ranking), ["Drill", "Hammer"])
+        self.assertEqual(ranking["Hammer"]["profit"], Decimal("60.00"))
+        self.assertEqual(ranking["Drill"]["profit"], Decimal("400.00"))
+
+    def test_ranking_is_one_query(self):
+        for _ in range(5):
+            self.purchase(self.hammer, "50.00")
+        make_order(None, [(self.hammer, 2, "100.00"), (self.drill, 1, "40.00")])
+
+        self.assertEqual(count_queries(lambda: self.rank(metric="profit")), 1)
+
+    def test_date_range_is_half_open(self):
+        old = make_order(None, [(self.hammer, 3, "100.00")])
+        age_order(old, 10)
+        make_order(None, [(self.drill, 1, "40.00")])
+
+        recent = self.rank(start=timezone.now() - timedelta(days=1))
+        self.assertEqual(list(recent), ["Drill"])
+        self.assertEqual(list(self.rank(end=timezone.now() - timedelta(days=1))), ["Hammer"])
+
+    def test_database_sorts_and_limits(self):
+        for index in range(4):
+            make_order(None, [(make_variant(f"Tool {index}"), index + 1, "10.00")])
+        order = make_order(None, [(self.drill, 9, "40.00")])
+        order_return = OrderReturn.objects.create(original_order=order, status="completed", reason="damaged")
+        ReturnItem.objects.create(
+            return_order=order_return, order_item=order.items.get(), return_quantity=8, refund_per_unit=Decimal("40.00"),
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            ranking = self.rank(limit=2)
+
+        # The drill sold most but nets only 1 unit after its return
+        self.assertEqual(list(ranking), ["Tool 3", "Tool 2"])
+        self.assertIn("LIMIT 2", queries[0]["sql"])
+
+    def test_api_validates_parameters(self):
+        make_order(None, [(self.hammer, 1, "100.00"), (self.drill, 2, "40.00")])
+        url = "/admin_api/top-products/"
+
+        for params in (
+            {"metric": "margin"}, {"category_id": "abc"}, {"start_date": "01-03-2026"}, {"end_date": "2026-02-30"},
+        ):
+            self.assertEqual(self.client.get(url, params).status_code, 400, params)
+        self.assertEqual(len(self.client.get(url, {"limit": "-3"}).data["results"]), 1)
+        self.assertEqual(len(self.client.get(url, {"limit": "500"}).data["results"]), 2)
+
+
+# ---------- List endpoints ----------
+
+class ConditionalListTests(ApiTestCase):
+    def test_list_etag_revalidates_until_the_data_changes(self):
+        Customer.objects.create(name="Dev")
+        url = "/admin_api/customers/"
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(etag.startswith('W/"'))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        # Another page of the same list is a different ETag
+        self.assertNotEqual(self.client.get(url, {"page": 1})["ETag"], etag)
+
+        Customer.objects.create(name="Nila")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.data["results"]), 2)
+
+
+class QueryPlanTests(ApiTestCase):
+    PLANNED_LISTS = (
+        "product-variants", "purchases", "inventories", "cart", "order-items", "returns-management", "users",
+    )
+
+    def add_rows(self, count):
+        supplier = Supplier.objects.get_or_create(name="Acme")[0]
+        for _ in range(count):
+            index = ProductVariant.objects.count()
+            variant = make_variant(f"Tool {index}")
+            Purchase.objects.create(
+                supplier=supplier, variant=variant, quantity=5, purchase_price=Decimal("10.00"),
+                discount=Decimal("0"), gst=Decimal("0"),
+            )
+            Cart.objects.create(variant=variant, price=Decimal("12.00"))
+            order = make_order(Customer.objects.create(name=f"Customer {index}"), [(variant, 1, "12.00")])
+            order_return = OrderReturn.objects.create(original_order=order, status="pending", reason="damaged")
+            ReturnItem.objects.create(
+                return_order=order_return, order_item=order.items.get(), return_quantity=1,
+                refund_per_unit=Decimal("12.00"),
+            )
+            make_user(f"staff{index}@example.com", f"90000001{index:02d}", role="Staff", created_by=self.user)
+
+    def get_list(self, prefix):
+        response = self.client.get(f"/admin_api/{prefix}/", {"page_size": 50})
+        self.assertEqual(response.status_code, 200, prefix)
+        return response
+
+    def test_list_queries_do_not_grow_with_rows(self):
+        self.add_rows(1)
+        counts = {}
+        for prefix in self.PLANNED_LISTS:
+            self.get_list(prefix)  # warm the reference data caches
+            counts[prefix] = count_queries(lambda: self.get_list(prefix))
+
+        self.add_rows(5)
+        for prefix in self.PLANNED_LISTS:
+            self.get_list(prefix)
+            with self.subTest(prefix), self.assertNumQueries(counts[prefix]):
+                self.get_list(prefix)
+
+    def test_check_query_plans_fails_when_a_plan_regresses(self):
+        from io import StringIO
+        from unittest import mock
+
+        from django.core.management import CommandError, call_command
+        from inventory_app.admin_views.ProductViews import ProductVariantView
+
+        make_user("root@example.com", "9000000099", is_superuser=True)
+        for index in range(3):
+            make_variant(f"Tool {index}")
+
+        call_command("check_query_plans", rows=3, stdout=StringIO())
+        with mock.patch.object(ProductVariantView, "query_plans", {}):
+            with self.assertRaisesMessage(CommandError, "ProductVariantView"):
+                call_command("check_query_plans", rows=3, stdout=StringIO())
+
+
+class IndexPlanTests(TestCase):
+    def test_key_queries_use_the_new_indexes(self):
+        from io import StringIO
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command("check_index_plan", verbose_plan=True, stdout=out)
+
+        report = out.getvalue()
+        self.assertIn("All key queries use an index.", report)
+        self.assertNotIn("full scan", report)
+        for index in (
+            "order_status_date_idx", "order_customer_date_idx", "sale_date_idx", "purchase_date_id_idx",
+            "purchase_supplier_date_idx", "inventory_quantity_idx", "loginrecord_time_idx",
+            "loginrecord_user_time_idx",
+        ):
+            self.assertRegex(report, rf"USING (COVERING )?INDEX {index}\b")
+
+    def test_open_returns_use_the_partial_index(self):
+        # SQLite only matches a partial index against literal constants, so
+        # the command's bound query can't show it; inline the values here.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM inventory_app_orderreturn "
+                "WHERE original_order_id = 1 AND status IN ('pending', 'approved')"
+            )
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+
+        self.assertIn("orderreturn_open_order_idx", plan)
+
+    def test_unindexed_query_fails_the_check(self):
+        from io import StringIO
+        from unittest import mock
+        from django.core.management import CommandError, call_command
+
+        unindexed = {"customers by email": Customer.objects.filter(email="a@example.com").values("id")}
+        with mock.patch("inventory_app.management.commands.check_index_plan.key_queries", return_value=unindexed):
+            with self.assertRaisesMessage(CommandError, "customers by email"):
+                call_command("check_index_plan", stdout=StringIO())
+
+
+class RendererTests(ApiTestCase):
+    RECORDS = [
+        {
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"), "amount": Decimal("12.50"),
+            "day": date(2026, 3, 1), "at": datetime(2026, 3, 1, 9, 30, tzinfo=ZoneInfo("UTC")), "note": None,
+        },
+        {"id": uuid.uuid4(), "amount": Decimal("0.10"), "day": date(2026, 3, 2), "at": None, "note": "x"},
+    ]
+
+    def render(self, renderer_class, data):
+        return json.loads(renderer_class().render(data))
+
+    @staticmethod
+    def rows(table):
+        return [dict(zip(table["columns"], row)) for row in table["rows"]]
+
+    def test_orjson_output_matches_drf(self):
+        from rest_framework.renderers import JSONRenderer
+        from inventory_app.renderers import ORJSONRenderer
+
+        self.assertEqual(self.render(ORJSONRenderer, self.RECORDS), self.render(JSONRenderer, self.RECORDS))
+
+    def test_columnar_round_trips_to_rows(self):
+        from inventory_app.renderers import ColumnarJSONRenderer, ORJSONRenderer
+
+        expected = self.render(ORJSONRenderer, self.RECORDS)
+        self.assertEqual(self.rows(self.render(ColumnarJSONRenderer, self.RECORDS)), expected)
+
+        page = {"count": 2, "next": None, "results": self.RECORDS}
+        columnar = self.render(ColumnarJSONRenderer, page)
+        self.assertEqual(columnar["count"], 2)
+        self.assertEqual(self.rows(columnar["results"]), expected)
+        self.assertEqual(self.render(ColumnarJSONRenderer, []), {"columns": [], "rows": []})
+
+    def test_columnar_list_endpoint_matches_the_row_output(self):
+        for name in ("Dev", "Nila"):
+            Customer.objects.create(name=name, pending_amount=Decimal("10.50"))
+
+        rows = json.loads(self.client.get("/admin_api/customers/").content)
+        columnar = json.loads(self.client.get("/admin_api/customers/", {"format": "columnar"}).content)
+
+        self.assertEqual(columnar["count"], rows["count"])
+        self.assertEqual(self.rows(columnar["results"]), rows["results"])
+
+
+@override_settings(STORAGES=FILE_STORAGES)
+class ProjectionTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        os.makedirs(os.path.join(root.name, "products"))
+        with open(os.path.join(root.name, "products", "drill.jpg"), "wb") as handle:
+            handle.write(b"jpeg")
+        media = override_settings(MEDIA_ROOT=root.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        supplier = Supplier.objects.create(name="Acme")
+        for name, photo in (("Drill", "products/drill.jpg"), ("Saw", "")):
+            variant = make_variant(name, price="99.90", gst="18")
+            ProductVariant.objects.create(
+                product=variant.product, size="XL", price=Decimal("120.00"), discount=Decimal("0"), gst=Decimal("0"),
+            )
+            Product.objects.filter(pk=variant.product_id).update(
+                photo=photo, thumbnails={"source": photo, "md": photo} if photo else {},
+            )
+            Purchase.objects.create(
+                supplier=supplier, variant=variant, quantity=3, purchase_price=Decimal("45.55"),
+                discount=Decimal("1.50"), gst=Decimal("18"),
+            )
+        Customer.objects.create(name="Dev", phone="9000000002", pending_amount=Decimal("10.50"))
+        Customer.objects.create(name="Nila", advance_payment=Decimal("3.25"))
+
+    def test_projections_match_the_serializers(self):
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+
+        from inventory_app.admin_views.CustomerViews import CustomerView
+        from inventory_app.admin_views.inventoryView import InventoryViewSet
+        from inventory_app.admin_views.ProductViews import ProductView
+        from inventory_app.admin_views.PurchaseViews import PurchaseViewSet
+
+        for viewset in (ProductView, PurchaseViewSet, CustomerView, InventoryViewSet):
+            request = Request(APIRequestFactory().get("/"))
+            request.user = self.user
+            view = viewset(request=request, action="list", format_kwarg=None, args=(), kwargs={})
+            queryset = view.get_queryset()
+            projection = view.list_projection(request)
+
+            projected = projection.convert(projection.values(queryset))
+            serialized = view.get_serializer(queryset, many=True).data
+
+            with self.subTest(viewset.__name__):
+                self.assertTrue(projected)
+                self.assertEqual(json.loads(json.dumps(projected)), json.loads(json.dumps(serialized)))
+
+
+# ---------- Reorder engine ----------
+
+@override_settings(SHOP_TIME_ZONE="UTC")
+class ReorderTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = timezone.now()
+
+    def sell(self, variant, quantity, days_ago):
+        age_order(make_order(None, [(variant, quantity, "10.00")]), days_ago, self.now)
+
+    def stock(self, variant, quantity):
+        Inventory.objects.update_or_create(variant=variant, defaults={"quantity": quantity})
+
+    def test_steady_seller_with_supplier(self):
+        from inventory_app.reorder import compute_reorder_suggestions
+
+        variant = make_variant()
+        for days_ago in range(28):
+            self.sell(variant, 2, days_ago)
+        self.sell(variant, 50, 40)  # outside the 28-day window
+        supplier = Supplier.objects.create(name="Acme", lead_time_days=5)
+        Purchase.objects.create(
+            supplier=supplier, variant=variant, quantity=1, purchase_price=Decimal("5.00"),
+            discount=Decimal("0"), gst=Decimal("0"),
+        )
+        self.stock(variant, 5)
+
+        compute_reorder_suggestions(as_of=self.now)
+
+        suggestion = ReorderSuggestion.objects.get(variant=variant)
+        self.assertEqual(suggestion.avg_daily_sales, Decimal("2.000"))
+        self.assertEqual(suggestion.supplier, supplier)
+        self.assertEqual(suggestion.lead_time_days, 5)
+        # No variance, so no safety stock: 2/day x 5 days
+        self.assertEqual(suggestion.reorder_point, 10)
+        # Up to the reorder point plus a 7-day review period of demand
+        self.assertEqual(suggestion.suggested_quantity, 10 + 14 - 5)
+
+    def test_lumpy_seller_without_supplier_gets_safety_stock(self):
+        from inventory_app.reorder import DEFAULT_LEAD_TIME_DAYS, compute_reorder_suggestions
+
+        variant = make_variant()
+        self.sell(variant, 28, 0)
+        self.stock(variant, 40)
+
+        compute_reorder_suggestions(as_of=self.now)
+
+        suggestion = ReorderSuggestion.objects.get(variant=variant)
+        self.assertIsNone(suggestion.supplier)
+        self.assertEqual(suggestion.lead_time_days, DEFAULT_LEAD_TIME_DAYS)
+        self.assertEqual(suggestion.avg_daily_sales, Decimal("1.000"))
+        # std of 28 then 27 zeros is sqrt(28); 1.65 * sqrt(28) * sqrt(7) = 23.1 units of safety stock
+        self.assertEqual(suggestion.reorder_point, 31)
+        self.assertEqual(suggestion.suggested_quantity, 0)
+
+    def test_variant_without_sales(self):
+        from inventory_app.reorder import compute_reorder_suggestions
+
+        variant = make_variant()
+        self.stock(variant, 0)
+
+        self.assertEqual(compute_reorder_suggestions(as_of=self.now), 1)
+
+        suggestion = ReorderSuggestion.objects.get(variant=variant)
+        self.assertEqual(
+            (suggestion.avg_daily_sales, suggestion.reorder_point, suggestion.suggested_quantity),
+            (Decimal("0.000"), 0, 0),
+        )
+
+    @override_settings(SHOP_TIME_ZONE="Asia/Kolkata")
+    def test_days_are_shop_days(self):
+        from inventory_app.reorder import sales_velocity
+
+        kolkata = ZoneInfo("Asia/Kolkata")
+        variant = make_variant()
+        order = make_order(None, [(variant, 3, "10.00")])
+        # 20:00 UTC on 1 March is 01:30 on 2 March in the shop
+        Order.objects.filter(pk=order.pk).update(order_date=datetime(2026, 3, 1, 20, 0, tzinfo=ZoneInfo("UTC")))
+
+        velocity = sales_velocity(as_of=datetime(2026, 3, 2, 12, 0, tzinfo=kolkata), window_days=1)
+
+        self.assertEqual(velocity.at[variant.pk, "avg_daily"], 3)
+
+
+# ---------- Reference data cache ----------
+
+class ReferenceCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_read_through_loads_once_per_version(self):
+        from inventory_app import caching
+
+        calls = []
+        load = lambda: calls.append(1) or len(calls)
+        self.assertEqual(caching.read_through("categories", "all", load), 1)
+        self.assertEqual(caching.read_through("categories", "all", load), 1)
+        caching.invalidate("categories")
+        self.assertEqual(caching.read_through("categories", "all", load), 2)
+
+    def test_evicted_version_does_not_revive_old_entries(self):
+        from inventory_app import caching
+
+        caching.read_through("categories", "all", lambda: "old")
+        cache.delete(caching._version_key("categories"))
+
+        self.assertEqual(caching.read_through("categories", "all", lambda: "new"), "new")
+
+    def test_category_save_invalidates_cached_list(self):
+        from inventory_app.caching import get_categories
+
+        self.assertEqual(get_categories(), [])
+        Category.objects.create(name="Paints")
+        self.assertEqual([row["name"] for row in get_categories()], ["Paints"])
+
+    def test_role_name_follows_role_changes_only(self):
+        from django.contrib.auth.models import update_last_login
+        from inventory_app import caching
+
+        user = make_user(role="Staff")
+        self.assertEqual(caching.get_role_name(user), "Staff")
+        version = caching.group_version("roles")
+
+        update_last_login(None, user)
+        user.full_name = "Renamed"
+        user.save()
+        self.assertEqual(caching.group_version("roles"), version)
+
+        user.role = Role.objects.create(name="Admin")
+        user.save()
+        self.assertNotEqual(caching.group_version("roles"), version)
+        self.assertEqual(caching.get_role_name(user), "Admin")
+
+    def test_reloaded_user_role_change_invalidates(self):
+        from inventory_app import caching
+
+        user = make_user(role="Staff")
+        caching.get_role_name(user)
+        fresh = UserAccount.objects.get(pk=user.pk)
+        fresh.role = Role.objects.create(name="Manager")
+        fresh.save(update_fields=["role"])
+
+        self.assertEqual(caching.get_role_name(user), "Manager")
+
+
+@override_settings(STORAGES=FILE_STORAGES)
+class TemplateFragmentTests(TestCase):
+    MENU = "layout/partials/menu/vertical/vertical_menu.html"
+    NAVBAR = "layout/partials/navbar/navbar.html"
+
+    def setUp(self):
+        cache.clear()
+        self.user = make_user()
+
+    def render(self, template, path, user=None):
+        from django.template.loader import render_to_string
+        from django.urls import resolve
+
+        request = RequestFactory().get(path)
+        request.resolver_match = resolve(path)
+        request.user = user or self.user
+        return render_to_string(template, {"navbar_full": False}, request=request)
+
+    def menu_key(self, section):
+        from django.core.cache.utils import make_template_fragment_key
+        from inventory_app import caching
+
+        return make_template_fragment_key("vertical_menu", [caching.group_version("templates"), "Admin", section, False])
+
+    def test_menu_is_cached_per_role_and_section_not_per_url(self):
+        self.render(self.MENU, "/product/detail/1/")
+        cache.set(self.menu_key("product"), "cached menu")
+
+        self.assertEqual(self.render(self.MENU, "/product/detail/2/").strip(), "cached menu")
+
+        def active_links(path):
+            return re.findall(r'menu-item active open">\s*<a href="([^"]+)"', self.render(self.MENU, path))
+
+        self.assertEqual(active_links("/"), ["/"])
+        self.assertEqual(active_links("/category/detail/1/"), ["/category-list/"])
+
+    def test_fragment_version_bump_rerenders(self):
+        from inventory_app import caching
+
+        self.render(self.MENU, "/")
+        cache.set(self.menu_key("dashboard"), "stale menu")
+        caching.invalidate("templates")
+
+        self.assertNotIn("stale menu", self.render(self.MENU, "/"))
+
+    def test_navbar_shows_each_users_own_name(self):
+        other = make_user("ravi@example.com", "9000000005")
+        UserAccount.objects.filter(pk=self.user.pk).update(full_name="Asha")
+        UserAccount.objects.filter(pk=other.pk).update(full_name="Ravi")
+        self.user.refresh_from_db()
+        other.refresh_from_db()
+
+        from django.core.cache.utils import make_template_fragment_key
+        from inventory_app import caching
+
+        navbar = self.render(self.NAVBAR, "/")
+        self.assertIn("Asha", navbar)
+        ravi = self.render(self.NAVBAR, "/", other)
+        self.assertNotIn("Asha", ravi)
+        # Both users are served the same cached blocks around their own name
+        self.assertEqual(ravi.replace("Ravi", "Asha"), navbar)
+        version = caching.group_version("templates")
+        for name in ("navbar_user_menu", "navbar_user_menu_end"):
+            self.assertIsNotNone(cache.get(make_template_fragment_key(name, [version])))
+
+
+# ---------- Page layout ----------
+
+class PageLayoutTests(TestCase):
+    def breadcrumbs(self, template, path="/", **kwargs):
+        from inventory_app.views import DashboardsView
+
+        view = DashboardsView(template_name=template)
+        view.setup(RequestFactory().get(path), **kwargs)
+        context = view.get_context_data(**kwargs)
+        return context["breadcrumbs"], context.get("section_title"), context.get("subsection_title")
+
+    def test_breadcrumbs_match_the_route_table(self):
+        from django.urls import reverse
+
+        home = {"label": "Home", "url": reverse("index")}
+        customers = reverse("customer-list")
+        expected = {
+            "customer_list.html": ([home, {"label": "Customer"}], "Customer", None),
+            "customer.html": (
+                [home, {"label": "Customer", "url": customers}, {"label": " Customer-detail"}], "Customer", None,
+            ),
+            "cart.html": ([home, {"label": "POS", "url": reverse("pos")}, {"label": "Cart-detail"}], "POS", None),
+            "order_edit.html": ([home, {"label": "Order Management"}, {"label": "Edit Order"}], "Order Management", None),
+            "customer_order_detail.html": (
+                [
+                    home, {"label": "Customer", "url": customers},
+                    {"label": "Customer-orders", "url": reverse("customer-orders", kwargs={"pk": 7})},
+                    {"label": "Order Detail"},
+                ],
+                "Customer", "Order Detail",
+            ),
+            "unrouted.html": ([home], None, None),
+        }
+        for template, trail in expected.items():
+            with self.subTest(template):
+                self.assertEqual(self.breadcrumbs(template, pk=7), trail)
+                # The memoised routes give the same trail on later requests
+                self.assertEqual(self.breadcrumbs(template, pk=7), trail)
+
+    def test_route_caches_follow_the_urlconf(self):
+        from django.conf import settings
+        from inventory_app.views import _reverse, breadcrumb_routes
+
+        routes = breadcrumb_routes()
+        _reverse("index")
+        with override_settings(ROOT_URLCONF=settings.ROOT_URLCONF):
+            self.assertEqual(_reverse.cache_info().currsize, 0)
+            self.assertIsNot(breadcrumb_routes(), routes)
+        self.assertEqual(breadcrumb_routes.cache_info().currsize, 0)
+
+    def test_layout_registry_follows_the_theme_dir(self):
+        from django.conf import settings
+        from web_project.template_helpers.theme import layout_registry
+
+        registry = layout_registry()
+        self.assertIn("layout_vertical", registry)
+        with override_settings(THEME_LAYOUT_DIR=settings.THEME_LAYOUT_DIR):
+            self.assertEqual(layout_registry.cache_info().currsize, 0)
+            self.assertIsNot(layout_registry(), registry)
+        self.assertEqual(layout_registry.cache_info().currsize, 0)
+
+
+# ---------- Date ranges ----------
+
+@override_settings(SHOP_TIME_ZONE="Asia/Kolkata")
+class DateRangeTests(ApiTestCase):
+    def test_bounds_are_half_open_local_midnights(self):
+        from inventory_app.dateranges import date_bounds
+
+        lower, upper = date_bounds(date(2026, 3, 1), date(2026, 3, 31))
+
+        kolkata = ZoneInfo("Asia/Kolkata")
+        self.assertEqual(lower, datetime(2026, 3, 1, tzinfo=kolkata))
+        self.assertEqual(upper, datetime(2026, 4, 1, tzinfo=kolkata))
+        self.assertEqual(date_bounds(None, None), (None, None))
+
+    @override_settings(SHOP_TIME_ZONE="Europe/London")
+    def test_bounds_cover_whole_days_across_dst(self):
+        from inventory_app.dateranges import date_bounds
+
+        lower, upper = date_bounds(date(2026, 3, 29), date(2026, 3, 29))
+        utc = ZoneInfo("UTC")
+        self.assertEqual(upper.astimezone(utc) - lower.astimezone(utc), timedelta(hours=23))
+
+    def test_parse_ignores_missing_and_invalid_values(self):
+        from inventory_app.dateranges import parse_date_range
+
+        self.assertEqual(parse_date_range("2026-02-01", "2026-02-30"), (date(2026, 2, 1), None))
+        self.assertEqual(parse_date_range(None, "junk"), (None, None))
+
+    def test_filter_uses_shop_days_not_utc_days(self):
+        from inventory_app.dateranges import filter_date_range
+
+        kolkata = ZoneInfo("Asia/Kolkata")
+        late = make_order()
+        early = make_order()
+        # 23:50 on 1 March in the shop is still 1 March although UTC has it at 18:20
+        Order.objects.filter(pk=late.pk).update(order_date=datetime(2026, 3, 1, 23, 50, tzinfo=kolkata))
+        Order.objects.filter(pk=early.pk).update(order_date=datetime(2026, 3, 2, 0, 10, tzinfo=kolkata))
+
+        march_1 = filter_date_range(Order.objects.all(), "order_date", date(2026, 3, 1), date(2026, 3, 1))
+        self.assertEqual(list(march_1), [late])
+
+    def test_customer_orders_filters_by_date_and_rejects_bad_dates(self):
+        customer = Customer.objects.create(name="Dev")
+        inside, outside = make_order(customer), make_order(customer)
+        age_order(outside, 40)
+        today = timezone.localdate(timezone=ZoneInfo("Asia/Kolkata"))
+        start = (today - timedelta(days=7)).isoformat()
+
+        response = self.client.get(f"/admin_api/orders/{customer.pk}/", {"start_date": start, "end_date": today.isoformat()})
+        self.assertEqual([row["id"] for row in response.data["results"]], [inside.pk])
+
+        response = self.client.get(f"/admin_api/orders/{customer.pk}/", {"start_date": start, "end_date": "31-12-2026"})
+        self.assertEqual(response.status_code, 400)
+
+
+# ---------- Statements ----------
+
+@override_settings(SHOP_TIME_ZONE="Asia/Kolkata")
+class StatementTests(TestCase):
+    def test_customer_statement_streams_rows_and_total_in_one_query(self):
+        from inventory_app.statements import customer_orders_statement
+
+        customer = Customer.objects.create(name="Dev", phone="9000000002")
+        hammer, saw = make_variant(), make_variant("Saw", "12in", "250.00")
+        make_order(customer, [(hammer, 2, "100.00"), (saw, 1, "250.00")])
+        make_order(customer, [(saw, 1, "250.00")])
+        make_order(customer)
+
+        statement = customer_orders_statement(customer, Order.objects.filter(customer=customer), None, None)
+        consumed = {}
+
+        def consume():
+            consumed["rows"] = list(statement.rows)
+            consumed["totals"] = list(statement.totals)
+
+        self.assertEqual(count_queries(consume), 1)
+        rows = consumed["rows"]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0][5], "Rs. 450.00")
+        self.assertEqual(rows[0][6].count("\n"), 1)
+        self.assertEqual(rows[2][6], "No items")
+        self.assertEqual(consumed["totals"], ["Grand Total: Rs. 700.00"])
+        self.assertEqual(statement.context["total_sum"](), Decimal("700"))
+
+    def test_supplier_statement_totals_the_purchases(self):
+        from inventory_app.statements import supplier_purchases_statement
+
+        supplier = Supplier.objects.create(name="Acme")
+        variant = make_variant()
+        for quantity in (2, 3):
+            Purchase.objects.create(
+                supplier=supplier, variant=variant, quantity=quantity, purchase_price=Decimal("40.00"),
+                discount=Decimal("0"), gst=Decimal("0"),
+            )
+
+        statement = supplier_purchases_statement(supplier, Purchase.objects.filter(supplier=supplier), None, None)
+        rows = list(statement.rows)
+        self.assertEqual([row[1] for row in rows], ["Hammer - 500g"] * 2)
+        self.assertEqual([row[6] for row in rows], ["Rs. 80.00", "Rs. 120.00"])
+        self.assertEqual(list(statement.totals), ["Grand Total: Rs. 200.00"])
+
+    def test_order_dates_print_as_shop_days(self):
+        from inventory_app.statements import day
+
+        # 20:00 UTC on 1 March is already 2 March in Kolkata
+        self.assertEqual(day(datetime(2026, 3, 1, 20, 0, tzinfo=ZoneInfo("UTC"))), "02/03/2026")
+        self.assertEqual(day(date(2026, 3, 1)), "01/03/2026")
+        self.assertEqual(day(None), "")
+
+    def test_statement_backend_renders_every_page(self):
+        from base64 import a85decode
+        from io import BytesIO
+        import zlib
+        from inventory_app.exports import get_backend
+        from inventory_app.statements import customer_orders_statement
+
+        customer = Customer.objects.create(name="Dev", phone="9000000002")
+        hammer, saw = make_variant(), make_variant("Saw", "12in", "250.00")
+        for n in range(150):
+            make_order(customer, [(hammer, n % 5 + 1, "100.00")] + ([(saw, 1, "250.00")] if n % 3 == 0 else []))
+        today = timezone.localdate().isoformat()
+
+        def statement():
+            return customer_orders_statement(customer, Order.objects.filter(customer=customer), today, today)
+
+        expected = statement()
+        rows, lines, totals = list(expected.rows), list(expected.lines), list(expected.totals)
+        output = BytesIO()
+        get_backend("statement").write_statement(statement(), output)
+
+        pdf = output.getvalue()
+        self.assertTrue(pdf.startswith(b"%PDF-"))
+        pages = len(re.findall(rb"/Type /Page\b", pdf))
+        self.assertGreater(pages, 2)
+        self.assertIn(f"/Count {pages} ".encode(), pdf)
+        # Page content is ASCII85 over Flate
+        text = b"".join(
+            zlib.decompress(a85decode(stream))
+            for stream in re.findall(rb">>\s*stream\r?\n(.*?)~>\s*endstream", pdf, re.S)
+        ).decode("latin-1")
+        self.assertIn(f"(Page {pages}) Tj", text)
+        self.assertNotIn(f"(Page {pages + 1}) Tj", text)
+        self.assertEqual(totals, [f"Grand Total: Rs. {sum(o.total_amount for o in Order.objects.all()):.2f}"])
+        for line in lines + totals + [rows[0][5], rows[-1][5]]:
+            self.assertIn(f"({line}) Tj", text)
+
+
+class StatementBatchTests(ApiTestCase):
+    def test_batch_endpoints_are_admin_only(self):
+        clerk = APIClient()
+        clerk.force_authenticate(make_user("clerk@example.com", "9000000009", role="Staff"))
+
+        self.assertEqual(clerk.post("/admin_api/customer-statements/batch/", {}, format="json").status_code, 403)
+        self.assertEqual(clerk.get("/admin_api/customer-statements/batch/abc/").status_code, 403)
+        self.assertEqual(clerk.get("/admin_api/customer-statements/batch/abc/download/").status_code, 403)
+        self.assertEqual(self.client.get("/admin_api/customer-statements/batch/abc/").status_code, 404)
+
+    def test_customer_ids_must_be_a_list_of_ints(self):
+        for customer_ids in ("12", ["1", "x"], [1, True], {"id": 1}, 7):
+            response = self.client.post(
+                "/admin_api/customer-statements/batch/", {"customer_ids": customer_ids}, format="json",
+            )
+            self.assertEqual(response.status_code, 400, customer_ids)
+            self.assertIn("error", response.data)
+
+    def test_archive_has_one_pdf_per_customer(self):
+        import zipfile
+
+        from inventory_app.statement_batch import build_statement_archive
+
+        variant = make_variant()
+        dev, empty = Customer.objects.create(name="Dev Shah"), Customer.objects.create(name="")
+        make_order(dev, [(variant, 1, "100.00")])
+        batch_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(batch_dir.cleanup)
+        path = os.path.join(batch_dir.name, "statements.zip")
+        progress = []
+
+        # A forked worker inherits the test database connection and its unsaved rows
+        with override_settings(STATEMENT_BATCH_START_METHOD="fork"):
+            written, failures = build_statement_archive(
+                path, [dev.pk, empty.pk, 0], renderer="statement", workers=1,
+                progress=lambda *args: progress.append(args),
+            )
+
+        self.assertEqual(written, 2)
+        self.assertEqual([customer_id for customer_id, _error in failures], [0])
+        self.assertEqual(progress[-1], (3, 3, 1))
+        with zipfile.ZipFile(path) as archive:
+            names = sorted(archive.namelist())
+            self.assertEqual(names, sorted([f"customer_{dev.pk}_dev-shah.pdf", f"customer_{empty.pk}.pdf"]))
+            self.assertTrue(all(archive.read(name).startswith(b"%PDF") for name in names))
+
+
+# ---------- Database profile ----------
+
+class DatabaseProfileTests(TestCase):
+    def test_new_sqlite_connections_get_the_pragmas(self):
+        from django.db.backends.sqlite3.base import DatabaseWrapper
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        wrapper = DatabaseWrapper({**connection.settings_dict, "NAME": os.path.join(directory.name, "profile.db")})
+        self.addCleanup(wrapper.close)
+
+        with override_settings(SQLITE_PRAGMAS={"journal_mode": "WAL", "busy_timeout": 7000, "foreign_keys": "on"}):
+            with wrapper.cursor() as cursor:
+                values = {}
+                for pragma in ("journal_mode", "busy_timeout", "foreign_keys"):
+                    cursor.execute(f"PRAGMA {pragma}")
+                    values[pragma] = cursor.fetchone()[0]
+
+        self.assertEqual(values, {"journal_mode": "wal", "busy_timeout": 7000, "foreign_keys": 1})
+
+    def test_pragma_values_are_checked(self):
+        from django.core.exceptions import ImproperlyConfigured
+        from inventory_app.signals import sqlite_pragma
+
+        self.assertEqual(sqlite_pragma("synchronous", "normal"), "PRAGMA synchronous = NORMAL")
+        self.assertEqual(sqlite_pragma("busy_timeout", "20000"), "PRAGMA busy_timeout = 20000")
+        for pragma, value in (
+            ("journal_mode", "WAL; DROP TABLE inventory_app_order"), ("busy_timeout", "1; VACUUM"),
+            ("busy_timeout", True), ("writable_schema", "ON"),
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                sqlite_pragma(pragma, value)
+
+    def test_db_profile_reports_the_connection(self):
+        from io import StringIO
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command("db_profile", stdout=out)
+
+        report = out.getvalue()
+        self.assertIn("django.db.backends.sqlite3", report)
+        for pragma in ("journal_mode", "synchronous", "busy_timeout", "foreign_keys"):
+            self.assertIn(f"{pragma}:", report)
+
+
+# ---------- Dashboard ----------
+
+# Stale-while-revalidate rebuilds on a thread, outside the test transaction
+@override_settings(DASHBOARD_STALE_WHILE_REVALIDATE=False)
+class DashboardTests(ApiTestCase):
+    def test_data_endpoint_builds_every_section(self):
+        variant = make_variant()
+        make_order(Customer.objects.create(name="Nila"), [(variant, 3, "100.00")])
+
+        response = self.client.get("/admin_api/hardware-dashboard-data/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["monthly_sales_trend"]), 6)
+        self.assertEqual(response.data["monthly_sales_trend"][-1]["sales"], 300.0)
+        self.assertEqual(response.data["top_products"][0]["total_sold"], 3)
+
+    def test_top_products_cover_the_trend_months(self):
+        make_order(None, [(make_variant("Old"), 50, "10.00")])
+        age_order(Order.objects.get(), 400)
+        make_order(None, [(make_variant("New"), 2, "10.00")])
+
+        response = self.client.get("/admin_api/hardware-dashboard-data/")
+
+        self.assertEqual([row["product__name"] for row in response.data["top_products"]], ["New"])
+
+    def test_stats_endpoint_counts_todays_orders(self):
+        make_order(total_amount=Decimal("50"))
+
+        response = self.client.get("/admin_api/hardware-dashboard-stats/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["today_orders"], 1)
+        self.assertEqual(response.data["total_sales_amount"], Decimal("50.00"))
+
+    def test_replica_payload_is_not_cached_right_after_a_change(self):
+        from inventory_app import caching, routers
+
+        builds = []
+        build = lambda: builds.append(1) or len(builds)
+        caching.invalidate("dashboard")
+
+        token = routers._reporting_reads.set(True)
+        try:
+            self.assertEqual(caching.versioned_payload("dashboard", "probe", build), 1)
+            self.assertEqual(caching.versioned_payload("dashboard", "probe", build), 2)
+            cache.delete(caching._changed_key("dashboard"))  # lag window over
+            self.assertEqual(caching.versioned_payload("dashboard", "probe", build), 3)
+            self.assertEqual(caching.versioned_payload("dashboard", "probe", build), 3)
+        finally:
+            routers._reporting_reads.reset(token)
+
+    def test_primary_payload_is_cached_right_after_a_change(self):
+        from inventory_app import caching
+
+        caching.invalidate("dashboard")
+        self.assertEqual(caching.versioned_payload("dashboard", "probe", lambda: "first"), "first")
+        self.assertEqual(caching.versioned_payload("dashboard", "probe", lambda: "second"), "first")
+
+    def test_payload_is_rebuilt_after_a_write(self):
+        self.client.get("/admin_api/hardware-dashboard-stats/")
+        make_order(total_amount=Decimal("20"))
+
+        response = self.client.get("/admin_api/hardware-dashboard-stats/")
+        self.assertEqual(response.data["today_orders"], 1)
+
+
+# ---------- Precompressed static files ----------
+
+class PrecompressedStaticTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        with open(os.path.join(self.root, "app.css"), "wb") as handle:
+            handle.write(b"body{}" * 100)
+        with open(os.path.join(self.root, "app.css.gz"), "wb") as handle:
+            handle.write(gzip.compress(b"body{}" * 100))
+        settings = override_settings(STATIC_SERVE=True, STATIC_ROOT=self.root, STATIC_URL="/static/")
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        from inventory_app.middleware import PrecompressedStaticMiddleware
+        self.middleware = PrecompressedStaticMiddleware(lambda request: HttpResponse("app"))
+        self.factory = RequestFactory()
+
+    def test_serves_the_accepted_variant(self):
+        response = self.middleware(self.factory.get("/static/app.css", HTTP_ACCEPT_ENCODING="gzip, br"))
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        plain = self.middleware(self.factory.get("/static/app.css"))
+        self.assertFalse(plain.has_header("Content-Encoding"))
+
+    def test_missing_files_fall_through_and_the_lookup_cache_is_bounded(self):
+        for index in range(self.middleware.stat_cache_size + 50):
+            response = self.middleware(self.factory.get(f"/static/missing-{index}.js"))
+        self.assertEqual(response.content, b"app")
+        self.assertEqual(self.middleware.stat.cache_info().currsize, self.middleware.stat_cache_size)
+
+    def test_paths_outside_static_root_are_not_served(self):
+        response = self.middleware(self.factory.get("/static/../settings.py"))
+        self.assertEqual(response.content, b"app")
+
+
+# ---------- Media ----------
+
+class MediaTests(TestCase):
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        os.makedirs(os.path.join(root.name, "products"))
+        with open(os.path.join(root.name, "products", "drill.jpg"), "wb") as handle:
+            handle.write(b"0123456789")
+        settings = override_settings(MEDIA_ROOT=root.name, MEDIA_URL="/media/", STORAGES=FILE_STORAGES)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.url = "/media/products/drill.jpg"
+
+    def test_image_urls_carry_the_content_hash(self):
+        from inventory_app.media import content_hash, versioned_media_url
+        from inventory_app.serializers import ProductSerializer
+        from inventory_app.thumbnails import thumbnail_url
+
+        versioned = f"{self.url}?v={content_hash('products/drill.jpg')}"
+        self.assertEqual(versioned_media_url("products/drill.jpg"), versioned)
+        self.assertEqual(thumbnail_url({"source": "products/drill.jpg"}), versioned)
+        product = Product.objects.create(category=Category.objects.create(name="Tools"), name="Drill")
+        Product.objects.filter(pk=product.pk).update(photo="products/drill.jpg")
+        product.refresh_from_db()
+        self.assertEqual(ProductSerializer(product).data["photo"], versioned)
+
+        response = self.client.get(versioned)
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertNotIn("immutable", self.client.get(self.url)["Cache-Control"])
+
+    def test_matching_etag_is_304(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_single_range_is_206_and_unsatisfiable_range_is_416(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=2-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"2345")
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=20-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */10")
+
+        # A stale If-Range gets the whole file
+        response = self.client.get(self.url, HTTP_RANGE="bytes=2-5", HTTP_IF_RANGE='"old"')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(MEDIA_SENDFILE="x-accel-redirect", MEDIA_ACCEL_PREFIX="/protected-media/")
+    def test_offload_leaves_the_body_to_the_front_end(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=2-5")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/products/drill.jpg")
+        self.assertEqual(response.content, b"")
+        self.assertTrue(response.has_header("ETag"))
+
+
+# ---------- Product thumbnails ----------
+
+@override_settings(
+    STORAGES=FILE_STORAGES, MEDIA_URL="/media/", PRODUCT_THUMBNAIL_ASYNC=False, PRODUCT_THUMBNAIL_FORMAT="JPEG",
+    PRODUCT_THUMBNAIL_SIZES={"sm": 96, "md": 320},
+)
+class ThumbnailTests(TestCase):
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        media = override_settings(MEDIA_ROOT=root.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.category = Category.objects.create(name="Tools")
+
+    def photo(self, name="products/drill.png", size=(800, 600)):
+        from io import BytesIO
+        from PIL import Image
+        from django.core.files.base import ContentFile
+        from django.core.files.storage import default_storage
+
+        buffer = BytesIO()
+        Image.new("RGB", size, "orange").save(buffer, "PNG")
+        return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+    def test_saving_a_photo_renders_each_size(self):
+        from PIL import Image
+        from django.core.files.storage import default_storage
+
+        source = self.photo()
+        with self.captureOnCommitCallbacks(execute=True):
+            product = Product.objects.create(category=self.category, name="Drill", photo=source)
+
+        product.refresh_from_db()
+        self.assertEqual(set(product.thumbnails), {"source", "sm", "md"})
+        self.assertEqual(product.thumbnails["source"], source)
+        for size, edge in (("sm", 96), ("md", 320)):
+            name = product.thumbnails[size]
+            self.assertTrue(name.startswith("thumbnails/products/drill_") and name.endswith(".jpg"))
+            with default_storage.open(name, "rb") as handle:
+                image = Image.open(handle)
+                self.assertEqual(image.format, "JPEG")
+                self.assertEqual(image.size, (edge, edge * 3 // 4))
+
+    def test_thumbnail_url_falls_back_to_the_photo(self):
+        from inventory_app.media import versioned_media_url
+        from inventory_app.thumbnails import thumbnail_url
+
+        source = self.photo()
+        self.assertIsNone(thumbnail_url({}))
+        self.assertIsNone(thumbnail_url(None))
+        self.assertEqual(thumbnail_url({"source": source}), versioned_media_url(source))
+
+        rendered = self.photo("thumbnails/products/drill_md.jpg", size=(320, 240))
+        self.assertEqual(thumbnail_url({"source": source, "md": rendered}), versioned_media_url(rendered))
+        self.assertEqual(thumbnail_url({"source": source, "md": rendered}, size="sm"), versioned_media_url(source))
+
+    def test_backfill_skips_rendered_products(self):
+        from io import StringIO
+        from django.core.management import call_command
+
+        done = Product.objects.create(category=self.category, name="Saw")
+        pending = Product.objects.create(category=self.category, name="Drill")
+        rendered = {"source": "products/saw.png", "sm": "thumbnails/saw_sm.jpg", "md": "thumbnails/saw_md.jpg"}
+        # Queryset updates, so nothing is rendered before the command runs
+        Product.objects.filter(pk=done.pk).update(photo="products/saw.png", thumbnails=rendered)
+        Product.objects.filter(pk=pending.pk).update(photo=self.photo(), thumbnails={"source": "products/drill.png"})
+
+        out = StringIO()
+        call_command("backfill_thumbnails", stdout=out)
+
+        self.assertIn("Rendered thumbnails for 1 products", out.getvalue())
+        done.refresh_from_db()
+        pending.refresh_from_db()
+        self.assertEqual(done.thumbnails, rendered)
+        self.assertEqual(set(pending.thumbnails), {"source", "sm", "md"})
+
+
+# ---------- Export backends ----------
+
+class ExportBackendTests(TestCase):
+    def test_urlconf_loads_no_export_libraries(self):
+        script = (
+            "import sys, django; django.setup(); import inventory_app.urls; "
+            "print(','.join(name for name in ('openpyxl', 'xhtml2pdf', 'pdfkit', 'reportlab') if name in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "Radhe.settings"},
+        )
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_unknown_backend_is_an_export_error(self):
+        from inventory_app.exports import ExportError, get_backend
+
+        with self.assertRaises(ExportError):
+            get_backend("docx")
+
+    def test_html_backend_base_is_abstract(self):
+        from inventory_app.exports.html_pdf import HtmlPdfBackend
+
+        with self.assertRaises(TypeError):
+            HtmlPdfBackend()
+
+    @override_settings(EXPORT_PDF_BACKEND="pisa", EXPORT_RENDERERS={"customer_orders": "statement"})
+    def test_renderer_choice_precedence(self):
+        from inventory_app.exports import renderer_for
+
+        factory = RequestFactory()
+        self.assertEqual(renderer_for(factory.get("/", {"renderer": "wkhtmltopdf"}), "customer_orders"), "wkhtmltopdf")
+        self.assertEqual(renderer_for(factory.get("/", {"renderer": "xlsx"}), "customer_orders"), "statement")
+        self.assertEqual(renderer_for(factory.get("/"), "supplier_purchases"), "pisa")
+
+
+# ---------- POS receipts ----------
+
+class ReceiptTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.customer = Customer.objects.create(name="Dev")
+        self.variant = make_variant()
+        self.order = make_order(self.customer, [(self.variant, 2, "100.00")], paid_amount=Decimal("150.00"))
+        self.user = make_user()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_escpos_receipt_fits_the_paper(self):
+        from inventory_app.receipts import ESC_FEED_AND_CUT, ESC_INIT, load_receipt, receipt_lines, render_receipt
+
+        content = render_receipt(self.order.pk, "escpos", 58)
+        self.assertTrue(content.startswith(ESC_INIT))
+        self.assertTrue(content.endswith(ESC_FEED_AND_CUT))
+        self.assertIn(f"Bill No: #{self.order.pk}".encode(), content)
+        self.assertIn(b"Balance due", content)
+
+        lines = receipt_lines(load_receipt(self.order.pk), 32)
+        self.assertTrue(all(len(text) <= 32 for text, _align, _bold in lines))
+
+    def test_pdf_receipt(self):
+        from inventory_app.receipts import render_receipt
+
+        self.assertTrue(render_receipt(self.order.pk, "pdf", 80).startswith(b"%PDF"))
+
+    def test_saving_an_item_replaces_the_cached_receipt(self):
+        from inventory_app.receipts import render_receipt
+
+        render_receipt(self.order.pk)
+        self.assertEqual(count_queries(lambda: render_receipt(self.order.pk)), 0)
+
+        item = self.order.items.get()
+        item.quantity = 3
+        item.save()
+        self.assertIn(b"3 x 100.00", render_receipt(self.order.pk))
+
+    def test_receipt_view(self):
+        url = f"/bill/{self.order.pk}/receipt/"
+        response = self.client.get(url, {"format": "pdf", "paper": "58"})
+        self.assertEqual(response["Content-Type"], "application/pdf")
+
+        self.assertEqual(self.client.get(url, {"paper": "72"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"format": "docx"}).status_code, 400)
+
+    def test_receipt_of_unknown_order_is_404(self):
+        from django.http import Http404
+
+        from inventory_app.admin_views.POSViews import order_receipt
+
+        request = RequestFactory().get("/bill/0/receipt/")
+        request.user = self.user
+        with self.assertRaises(Http404):
+            order_receipt(request, 0)
+
+    def test_receipt_view_requires_login(self):
+        response = Client().get(f"/bill/{self.order.pk}/receipt/")
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response["Location"].startswith("/auth/login/"))
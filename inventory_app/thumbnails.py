@@ -0,0 +1,117 @@
+"""
+Product photo thumbnails.
+
+``Product.thumbnails`` records the photo it was built from (``source``) and
+the stored name of each rendered size from PRODUCT_THUMBNAIL_SIZES. Saving a
+product with a new photo resets it to just the source (see Product.save) and
+queues rendering on a background thread once the transaction commits;
+``backfill_thumbnails`` renders the existing catalogue.
+
+List serializers and projections call ``thumbnail_url`` with that dict, which
+falls back to the original photo while a size is still pending.
+"""
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+
+from inventory_app.media import versioned_media_url
+from inventory_app.models import ModelVersion, Product
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = {"sm": 96, "md": 320}
+LIST_SIZE = "md"
+
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "PRODUCT_THUMBNAIL_WORKERS", 1),
+    thread_name_prefix="thumbnails",
+)
+
+
+def thumbnail_sizes():
+    return getattr(settings, "PRODUCT_THUMBNAIL_SIZES", DEFAULT_SIZES)
+
+
+def thumbnail_url(thumbnails, size=LIST_SIZE, request=None):
+    """URL of the ``size`` thumbnail, or of the original photo until it is rendered."""
+    thumbnails = thumbnails or {}
+    name = thumbnails.get(size) or thumbnails.get("source")
+    if not name:
+        return None
+    url = versioned_media_url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def is_rendered(thumbnails):
+    return all((thumbnails or {}).get(size) for size in thumbnail_sizes())
+
+
+def thumbnail_name(source, size, extension):
+    stem = posixpath.splitext(source)[0]
+    return f"thumbnails/{stem}_{size}.{extension}"
+
+
+def _output_format():
+    from PIL import features
+
+    if getattr(settings, "PRODUCT_THUMBNAIL_FORMAT", "WEBP").upper() == "WEBP" and features.check("webp"):
+        return "WEBP", "webp"
+    return "JPEG", "jpg"
+
+
+def render_thumbnails(product_id):
+    """Render every size for the product's current photo and record them; returns the new mapping."""
+    from PIL import Image, ImageOps
+
+    row = Product.objects.filter(pk=product_id).values("photo").first()
+    source = row and row["photo"]
+    if not source:
+        return {}
+
+    image_format, extension = _output_format()
+    with default_storage.open(source, "rb") as handle:
+        image = ImageOps.exif_transpose(Image.open(handle))
+        image.load()
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    image = image.convert("RGBA" if has_alpha and image_format == "WEBP" else "RGB")
+
+    quality = getattr(settings, "PRODUCT_THUMBNAIL_QUALITY", 80)
+    thumbnails = {"source": source}
+    for size, edge in thumbnail_sizes().items():
+        resized = image.copy()
+        resized.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        resized.save(buffer, image_format, quality=quality, optimize=True)
+        name = thumbnail_name(source, size, extension)
+        if default_storage.exists(name):
+            default_storage.delete(name)
+        thumbnails[size] = default_storage.save(name, ContentFile(buffer.getvalue()))
+
+    # Skip the write if the photo was replaced while rendering; that save queued its own job
+    if Product.objects.filter(pk=product_id, photo=source).update(thumbnails=thumbnails):
+        # A queryset update sends no signal, so list ETags are bumped here
+        ModelVersion.bump(Product.__name__)
+    return thumbnails
+
+
+def _run(product_id):
+    try:
+        render_thumbnails(product_id)
+    except Exception:
+        logger.exception("Thumbnail rendering failed for product %s", product_id)
+    finally:
+        connection.close()
+
+
+def schedule(product_id):
+    """Render the product's thumbnails in the background after the current transaction commits."""
+    if not getattr(settings, "PRODUCT_THUMBNAIL_ASYNC", True):
+        transaction.on_commit(lambda: render_thumbnails(product_id))
+        return
+    transaction.on_commit(lambda: _executor.submit(_run, product_id))
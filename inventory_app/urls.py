@@ -1,5 +1,5 @@
 
-from .views import DashboardsView, ChangePasswordAPIView
+from .views import DashboardsView, ChangePasswordAPIView, CacheStatsAPIView
 from django.urls import path,include
 from inventory_app.admin_views.DashboadView import DashboardStatsAPIView, DashboardDataAPIView
 from inventory_app.admin_views.CategoryViews import CategoryView
@@ -7,15 +7,17 @@ from inventory_app.admin_views.ProductViews import ProductView,ProductVariantVie
 from inventory_app.admin_views.PurchaseViews import PurchaseViewSet, purchase_products
 from inventory_app.admin_views.SuppliersViews import SupplierView, supplier_purchases
 from inventory_app.admin_views.CustomerViews import CustomerView
-from inventory_app.admin_views.inventoryView import InventoryViewSet
-from inventory_app.admin_views.POSViews import CartViewSet, place_order,bill_page
+from inventory_app.admin_views.inventoryView import InventoryViewSet, reorder_suggestions
+from inventory_app.admin_views.POSViews import CartViewSet, place_order,bill_page,order_receipt
 from inventory_app.admin_views.CustomerOrderView import customer_orders,order_detail_api
 from inventory_app.admin_views.Exportviews import export_customer_orders_excel, export_customer_orders_pdf, export_supplier_purchases_pdf, print_customer_orders_pdf, print_supplier_purchases_pdf
-from inventory_app.admin_views.SalesView import SalesListAPI
+from inventory_app.admin_views.SalesView import SalesListAPI, TopProductsAPI
 from inventory_app.admin_views.UserManagementViews import UserManagementViewSet, RoleManagementViewSet
 from inventory_app.admin_views.OrderManagementViews import OrderManagementViewSet
 from inventory_app.admin_views.ReturnsManagementViews import ReturnsManagementViewSet
 from inventory_app.admin_views.OrderItemManagementViews import OrderItemManagementViewSet
+from inventory_app.admin_views.AgingReportViews import receivables_aging, export_receivables_aging_csv
+from inventory_app.admin_views.StatementBatchViews import start_statement_batch, statement_batch_status, download_statement_batch
 
 from rest_framework.routers import DefaultRouter
 
@@ -95,10 +97,12 @@ urlpatterns = [
     
     path('place_order/', place_order, name='place_order'),
     path('bill/<int:order_id>/', bill_page, name='bill_page'),
+    path('bill/<int:order_id>/receipt/', order_receipt, name='order_receipt'),
     
     path('admin_api/', include(router.urls)),
 
     path('admin_api/purchase-products/', purchase_products, name='purchase-products'),
+    path('admin_api/reorder-suggestions/', reorder_suggestions, name='reorder-suggestions'),
     path('admin_api/orders/<int:pk>/', customer_orders, name='orders'),
     path("admin_api/order/<int:id>/", order_detail_api, name="order-detail-api"),
     
@@ -108,5 +112,12 @@ urlpatterns = [
     path("admin_api/hardware-dashboard-data/", DashboardDataAPIView.as_view(), name="hardware-dashboard-data"),
 
     path('admin_api/sales/', SalesListAPI.as_view(), name='sales_list_api'),
+    path('admin_api/top-products/', TopProductsAPI.as_view(), name='top-products'),
+    path('admin_api/receivables-aging/', receivables_aging, name='receivables-aging'),
+    path('admin_api/receivables-aging/export_csv/', export_receivables_aging_csv, name='receivables-aging-csv'),
+    path('admin_api/customer-statements/batch/', start_statement_batch, name='customer-statements-batch'),
+    path('admin_api/customer-statements/batch/<str:job_id>/', statement_batch_status, name='customer-statements-batch-status'),
+    path('admin_api/customer-statements/batch/<str:job_id>/download/', download_statement_batch, name='customer-statements-batch-download'),
     path("change-password/", ChangePasswordAPIView.as_view(), name="change-password"),
+    path("admin_api/cache-stats/", CacheStatsAPIView.as_view(), name="cache-stats"),
 ]
@@ -2,15 +2,19 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import TemplateView
 from web_project import TemplateLayout
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import FileResponse, Http404
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.urls import reverse
-from django.conf import settings
-import os
+from functools import lru_cache
+from types import MappingProxyType
+
+from inventory_app import caching
+from inventory_app.media import serve_media
 
 # REST Framework imports
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework import status
 
 """
@@ -19,6 +23,98 @@ Here you can override the page view layout.
 Refer to dashboards/urls.py file for more pages.
 """
 
+@lru_cache(maxsize=1024)
+def _reverse(name, pk=None):
+    """reverse() memoised per process; the URLconf only changes with a deploy."""
+    return reverse(name, kwargs={"pk": pk} if pk is not None else None)
+
+
+@lru_cache(maxsize=None)
+def breadcrumb_routes():
+    """
+    Breadcrumb trail per template: (section, url, subsection, url, ...).
+    Built once per process on first use; reverse() cannot run at import time.
+    """
+    return MappingProxyType({
+        "customer_list.html": ("Customer", None),
+        "customer.html": ("Customer", _reverse("customer-list"), " Customer-detail"),
+
+        "supplier_list.html": ("Supplier", None),
+        "supplier.html": ("Supplier", _reverse("supplier-list"), " Supplier-detail"),
+        
+        "purchase_list.html": ("Purchase", None),
+        "purchase.html": ("Purchase", _reverse("purchase-list"), " Purchase-detail"),
+        
+        "product_list.html": ("Product", None),
+        "product.html": ("Product", _reverse("product-list"), " Product-detail"),
+        
+        "category_list.html": ("Category", None),
+        "category.html": ("Category", _reverse("category-list"), " Category-detail"),
+        
+        "inventory_list.html": ("Inventory", None),
+        
+        "sales_list.html": ("Sales", None),
+        
+        "pos.html": ("POS", None),
+        
+        "cart.html": ("POS", _reverse("pos"), "Cart-detail"),
+        
+        "customer_orders.html": ("Customer", _reverse("customer-list"), "Customer-orders"),
+        "customer_order_detail.html": ("Customer", _reverse("customer-list"), "Customer-orders", "DYNAMIC", "Order Detail"),
+        
+        "settings.html": ("Settings", None),
+        
+        # Order Management and Returns
+        "order.html": ("Order Management", None),
+        "orders_list.html": ("Orders", None),
+        "order_edit.html": ("Order Management", None, "Edit Order"),
+        "returns_management.html": ("Returns Management", None),
+        
+        # "properties_list.html": ("Properties", None),
+        # "property_detail.html": ("Properties", _reverse("properties"), "Property Detail"),
+        # "property_add.html": ("Properties", _reverse("properties"), "Add Property"),
+        # "property_edit.html": ("Properties", _reverse("properties"), "Edit Property"),
+
+        # "Projects_list.html": ("Projects", None),
+        # "Projects_add.html": ("Projects", _reverse("get-projects"), "Add Project"),
+        # "Projects_edit.html": ("Projects", _reverse("get-projects"), "Edit Project"),
+
+        # "property_types_list.html": ("Property Types", None),
+        # "property_type_add.html": ("Property Types", _reverse("property_type"), "Add Property Type"),
+        # "property_type_edit.html": ("Property Types", _reverse("property_type"), "Edit Property Type"),
+
+        # "Locations_list.html": ("Locations", None),
+        # "Locations_add.html": ("Locations", _reverse("get-locations"), "Add Location"),
+        # "Locations_edit.html": ("Locations", _reverse("get-locations"), "Edit Location"),
+
+        # "leads_list.html": ("Leads", None),
+        # "leads_detail.html": ("Leads", _reverse("leads"), "Lead Detail"),
+        # "lead_add.html": ("Leads", _reverse("leads"), "Add Lead"),
+        # "lead_edit.html": ("Leads", _reverse("leads"), "Leads Detail", "DYNAMIC", "Edit Lead"),
+        # "leadFollowUp_list.html": ("Leads", _reverse("leads"), "Leads Detail", "DYNAMIC", "Lead Follow Up"),
+        # "leadFollowUp_add.html": ("Leads", _reverse("leads"), "Leads Detail", "DYNAMIC", "Lead Follow Up", "FOLLOWUP_URL_ADD", "Add Follow Up"),
+        # "leadFollowUp_edit.html": ("Leads", _reverse("leads"), "Leads Detail", "DYNAMIC", "Lead Follow Up", "FOLLOWUP_URL_EDIT", "Edit Follow Up"),
+        # "lead_all_followup.html": ("Leads", _reverse("leads"), "All Follow Ups"),
+
+        # "FollowupNotification.html": ("Follow Up Notifications", None),
+        # "favourite_lead.html": ("Favourite Leads", None),
+        # "Search.html": ("Search", None),
+        # "Investors_list.html": ("Investors", None),
+        # "dashboard.html": ("Dashboard", None),
+
+        # "appointments_list.html": ("Appointments", _reverse("appointments")),
+        # "user_list.html": ("Users", None),
+    })
+
+
+@receiver(setting_changed)
+def clear_route_caches(*, setting, **kwargs):
+    # Mirrors Django's own clear_url_caches() for a swapped URLconf
+    if setting == "ROOT_URLCONF":
+        _reverse.cache_clear()
+        breadcrumb_routes.cache_clear()
+
+
 class DashboardsView(TemplateView):
     # def dispatch(self, request, *args, **kwargs):
     #     # Always allow access if user is logged in
@@ -28,81 +124,12 @@ class DashboardsView(TemplateView):
         context = TemplateLayout.init(self, super().get_context_data(**kwargs))
 
         template = self.template_name
-        breadcrumbs = [{"label": "Home", "url": reverse("index")}]
+        breadcrumbs = [{"label": "Home", "url": _reverse("index")}]
 
         def section(label, url=None):
             breadcrumbs.append({"label": label, "url": url} if url else {"label": label})
 
-        route_map = {
-            "customer_list.html": ("Customer", None),
-            "customer.html": ("Customer", reverse("customer-list"), " Customer-detail"),
-
-            "supplier_list.html": ("Supplier", None),
-            "supplier.html": ("Supplier", reverse("supplier-list"), " Supplier-detail"),
-            
-            "purchase_list.html": ("Purchase", None),
-            "purchase.html": ("Purchase", reverse("purchase-list"), " Purchase-detail"),
-            
-            "product_list.html": ("Product", None),
-            "product.html": ("Product", reverse("product-list"), " Product-detail"),
-            
-            "category_list.html": ("Category", None),
-            "category.html": ("Category", reverse("category-list"), " Category-detail"),
-            
-            "inventory_list.html": ("Inventory", None),
-            
-            "sales_list.html": ("Sales", None),
-            
-            "pos.html": ("POS", None),
-            
-            "cart.html": ("POS", reverse("pos"), "Cart-detail"),
-            
-            "customer_orders.html": ("Customer", reverse("customer-list"), "Customer-orders"),
-            "customer_order_detail.html": ("Customer", reverse("customer-list"), "Customer-orders", "DYNAMIC", "Order Detail"),
-            
-            "settings.html": ("Settings", None),
-            
-            # Order Management and Returns
-            "order.html": ("Order Management", None),
-            "orders_list.html": ("Orders", None),
-            "order_edit.html": ("Order Management", None, "Edit Order"),
-            "returns_management.html": ("Returns Management", None),
-            
-            # "properties_list.html": ("Properties", None),
-            # "property_detail.html": ("Properties", reverse("properties"), "Property Detail"),
-            # "property_add.html": ("Properties", reverse("properties"), "Add Property"),
-            # "property_edit.html": ("Properties", reverse("properties"), "Edit Property"),
-
-            # "Projects_list.html": ("Projects", None),
-            # "Projects_add.html": ("Projects", reverse("get-projects"), "Add Project"),
-            # "Projects_edit.html": ("Projects", reverse("get-projects"), "Edit Project"),
-
-            # "property_types_list.html": ("Property Types", None),
-            # "property_type_add.html": ("Property Types", reverse("property_type"), "Add Property Type"),
-            # "property_type_edit.html": ("Property Types", reverse("property_type"), "Edit Property Type"),
-
-            # "Locations_list.html": ("Locations", None),
-            # "Locations_add.html": ("Locations", reverse("get-locations"), "Add Location"),
-            # "Locations_edit.html": ("Locations", reverse("get-locations"), "Edit Location"),
-
-            # "leads_list.html": ("Leads", None),
-            # "leads_detail.html": ("Leads", reverse("leads"), "Lead Detail"),
-            # "lead_add.html": ("Leads", reverse("leads"), "Add Lead"),
-            # "lead_edit.html": ("Leads", reverse("leads"), "Leads Detail", "DYNAMIC", "Edit Lead"),
-            # "leadFollowUp_list.html": ("Leads", reverse("leads"), "Leads Detail", "DYNAMIC", "Lead Follow Up"),
-            # "leadFollowUp_add.html": ("Leads", reverse("leads"), "Leads Detail", "DYNAMIC", "Lead Follow Up", "FOLLOWUP_URL_ADD", "Add Follow Up"),
-            # "leadFollowUp_edit.html": ("Leads", reverse("leads"), "Leads Detail", "DYNAMIC", "Lead Follow Up", "FOLLOWUP_URL_EDIT", "Edit Follow Up"),
-            # "lead_all_followup.html": ("Leads", reverse("leads"), "All Follow Ups"),
-
-            # "FollowupNotification.html": ("Follow Up Notifications", None),
-            # "favourite_lead.html": ("Favourite Leads", None),
-            # "Search.html": ("Search", None),
-            # "Investors_list.html": ("Investors", None),
-            # "dashboard.html": ("Dashboard", None),
-
-            # "appointments_list.html": ("Appointments", reverse("appointments")),
-            # "user_list.html": ("Users", None),
-        }
+        route_map = breadcrumb_routes()
 
         slug = self.kwargs.get("slug")
         pk = self.kwargs.get("pk")
@@ -129,7 +156,7 @@ class DashboardsView(TemplateView):
         if route:
             def resolve_url(item):
                 if item == "DYNAMIC" and pk:
-                    return reverse("customer-orders", kwargs={"pk": pk})
+                    return _reverse("customer-orders", pk)
                 # elif item == "FOLLOWUP_URL_ADD" and slug and pk:
                 #     return reverse("leadFollowUp", kwargs={"slug": slug, "pk": pk})
                 # elif item == "FOLLOWUP_URL_EDIT" and slug and pk:
@@ -154,11 +181,7 @@ class DashboardsView(TemplateView):
 
 
 def cors_media_serve(request, path):
-    file_path = os.path.join(settings.MEDIA_ROOT, path)
-    if not os.path.exists(file_path):
-        raise Http404("File not found")
-
-    response = FileResponse(open(file_path, 'rb'))
+    response = serve_media(request, path)
     # response["Access-Control-Allow-Origin"] = "https://radhe.co.in"
     response["Access-Control-Allow-Credentials"] = "true"
     return response
@@ -205,3 +228,15 @@ class ChangePasswordAPIView(APIView):
             {"success": True, "message": "Password changed successfully."},
             status=status.HTTP_200_OK,
         )
+
+
+class CacheStatsAPIView(APIView):
+    """Hit/miss counters of the reference data cache; DELETE resets them."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(caching.stats())
+
+    def delete(self, request):
+        caching.reset_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,7 +1,35 @@
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from pprint import pprint
 import os
-from importlib import import_module, util
+import pkgutil
+from functools import lru_cache
+from importlib import import_module
+from types import MappingProxyType
+
+
+# Bootstrap classes of the theme layouts, keyed by layout name (the module
+# name in templates/<THEME_LAYOUT_DIR>/bootstrap). Resolved once per process
+# instead of running find_spec/import_module on every page render.
+@lru_cache(maxsize=None)
+def layout_registry():
+    package = f"templates.{settings.THEME_LAYOUT_DIR.replace('/', '.')}.bootstrap"
+    registry = {}
+    for module_info in pkgutil.iter_modules(import_module(package).__path__):
+        layout = module_info.name
+        module = import_module(f"{package}.{layout}")
+        class_name = f"TemplateBootstrap{layout.title().replace('_', '')}"
+        if hasattr(module, class_name):
+            registry[layout] = getattr(module, class_name)
+    return MappingProxyType(registry)
+
+
+@receiver(setting_changed)
+def clear_layout_registry(*, setting, **kwargs):
+    # Keep override_settings(THEME_LAYOUT_DIR=...) in tests honest
+    if setting == "THEME_LAYOUT_DIR":
+        layout_registry.cache_clear()
 
 
 # Core TemplateHelper class
@@ -35,23 +63,10 @@ class TemplateHelper:
         # Extract layout from the view path
         layout = os.path.splitext(view)[0].split("/")[0]
 
-        # Get module path
-        module = f"templates.{settings.THEME_LAYOUT_DIR.replace('/', '.')}.bootstrap.{layout}"
-
-        # Check if the bootstrap file is exist
-        if util.find_spec(module) is not None:
-            # Auto import and init the default bootstrap.py file from the theme
-            TemplateBootstrap = TemplateHelper.import_class(
-                module, f"TemplateBootstrap{layout.title().replace('_', '')}"
-            )
-            TemplateBootstrap.init(context)
-        else:
-            module = f"templates.{settings.THEME_LAYOUT_DIR.replace('/', '.')}.bootstrap.default"
-
-            TemplateBootstrap = TemplateHelper.import_class(
-                module, "TemplateBootstrapDefault"
-            )
-            TemplateBootstrap.init(context)
+        # Init the layout's bootstrap class, or the theme default if it has none
+        registry = layout_registry()
+        TemplateBootstrap = registry.get(layout) or registry["default"]
+        TemplateBootstrap.init(context)
 
         return f"{settings.THEME_LAYOUT_DIR}/{view}"
 